@@ -0,0 +1,108 @@
+# cold-start report: import time of main.py, heavy modules loaded at import, and latency of the first tool calls
+#
+# usage: python -m benchmarks.bench_cold_start [--runs N] [--prewarm] [--top N]
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from .fake_upstreams import start_fake_statswr_api
+
+HEAVY_MODULES = ("numpy", "lxml", "bs4", "requests", "sqlite3", "orjson", "h2")
+
+# runs in a fresh interpreter per sample; drives the lifespan the way Mangum does, on the default event loop
+_CHILD = """
+import sys, time, json, asyncio
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+from mcp_src import statsWR_mcp_server as server
+heavy = [name for name in {heavy!r} if name in sys.modules]
+
+async def first_calls():
+    await main.lifespan(main.app).__aenter__()
+    started = time.perf_counter()
+    await server.health_check()
+    health = time.perf_counter()
+    await server.get_most_recent_champ_data_for_all_champs_in_certain_role(2)
+    role = time.perf_counter()
+    return started, health, role
+
+started, health, role = asyncio.get_event_loop().run_until_complete(first_calls())
+print(json.dumps({{
+    "import_ms": (imported - start) * 1000,
+    "lifespan_ms": (started - imported) * 1000,
+    "first_health_check_ms": (health - started) * 1000,
+    "first_role_call_ms": (role - health) * 1000,
+    "heavy_modules_after_import": heavy
+}}))
+sys.stdout.flush()
+import os; os._exit(0)
+"""
+
+def _child_env(api_base_url:str, prewarm:bool) -> dict[str, str]:
+    env = dict(os.environ)
+    env["STATSWR_API_BASE_URL"] = api_base_url
+    env.setdefault("DEFAULT_TIMEOUT", "60")
+    env["LOG_LEVEL"] = "WARNING"
+    env["MATCHUP_WARMUP"] = "false"
+    if prewarm:
+        # take the Lambda code path so the prewarm runs at import, inside the init phase
+        env["PREWARM_ON_INIT"] = "true"
+        env["AWS_LAMBDA_FUNCTION_NAME"] = "bench-cold-start"
+    return env
+
+def _sample(env:dict[str, str]) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", _CHILD.format(heavy=HEAVY_MODULES)],
+        env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+def _import_profile(env:dict[str, str], top:int) -> list[tuple[int, int, str]]:
+    # `python -X importtime` lines: "import time: self [us] | cumulative | imported package"
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"], env=env, capture_output=True, text=True, check=True)
+    children = []
+    for line in output.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # nesting is two extra spaces per level and children are listed before their parent,
+        # so the depth 1 entries right before the depth 0 "main" line are what main imports directly
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            children.append((int(cumulative_us), int(self_us), name.strip()))
+        elif depth == 0:
+            if name.strip() == "main":
+                return sorted(children, reverse=True)[:top]
+            children = []
+    return []
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--prewarm", action="store_true", help="enable PREWARM_ON_INIT on the Lambda code path")
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to list")
+    args = parser.parse_args()
+
+    api = start_fake_statswr_api()
+    try:
+        env = _child_env(f"{api.base_url}/api/v1", args.prewarm)
+        samples = [_sample(env) for _ in range(args.runs)]
+        profile = _import_profile(env, args.top)
+    finally:
+        api.stop()
+
+    print(f"cold start over {args.runs} runs (prewarm={'on' if args.prewarm else 'off'}), median:")
+    for key in ("import_ms", "lifespan_ms", "first_health_check_ms", "first_role_call_ms"):
+        print(f"  {key:<24}{statistics.median(sample[key] for sample in samples):>10.1f}")
+    print(f"  heavy modules loaded by import: {samples[-1]['heavy_modules_after_import'] or 'none'}")
+
+    print("\nslowest direct imports of main (cumulative / self, ms):")
+    for cumulative_us, self_us, name in profile:
+        print(f"  {cumulative_us / 1000:>8.1f} {self_us / 1000:>8.1f}  {name}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+# end-to-end benchmark: every MCP tool driven through the streamable-HTTP app from main.py,
+# against local stand-ins for the statsWR API and wildriftcounter.com
+# client, server and stand-ins share one process, so the RSS figures are process-wide, not the server's alone
+#
+# usage: python -m benchmarks.bench_end_to_end [--concurrency N] [--requests N] [--tools a,b] [--upstream-latency-ms MS]
+
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import tempfile
+import threading
+import statistics
+from pathlib import Path
+from .fake_upstreams import CHAMPION_NAMES, champion_label, champion_slug, start_fake_statswr_api, start_fake_matchup_site
+
+LABELS = [champion_label(name) for name in CHAMPION_NAMES]
+SLUGS = [champion_slug(name) for name in CHAMPION_NAMES]
+
+# tool name -> arguments for the i-th call
+SCENARIOS = {
+    "health_check": lambda i: {},
+    "get_champion_data_from_label": lambda i: {"champion_label": LABELS[i % len(LABELS)]},
+    "get_champion_stat_changes": lambda i: {"champion_label": LABELS[i % len(LABELS)], "last_n": 7},
+    "get_champion_data_for_multiple_champions": lambda i: {"champion_labels": [LABELS[(i + k) % len(LABELS)] for k in range(5)]},
+    "get_most_recent_champ_data_for_all_champs_in_certain_role": lambda i: {"role": i % 6},
+    "get_most_recent_champ_data_from_label": lambda i: {"champion_label": LABELS[i % len(LABELS)]},
+    "get_champion_comments": lambda i: {"champion_label": LABELS[i % len(LABELS)], "limit": 10},
+    "get_champion_abilities": lambda i: {"champion_label": LABELS[i % len(LABELS)]},
+    "get_matchups_for_champion_for_all_viable_roles": lambda i: {"champion_name": SLUGS[i % len(SLUGS)]},
+    "get_who_counters_champion": lambda i: {"champion_name": SLUGS[i % len(SLUGS)], "role": i % 6},
+    "get_champions_that_counter_all": lambda i: {"champion_names": [SLUGS[(i + k) % len(SLUGS)] for k in range(2)], "role": i % 6},
+    "get_best_picks_against_team": lambda i: {"enemy_champions": [SLUGS[(i + k) % len(SLUGS)] for k in range(5)], "role": i % 6},
+    "get_top_champions_in_role": lambda i: {"role": i % 6, "stat": ("win_rate", "pick_rate", "ban_rate")[i % 3], "n": 10},
+    "get_role_stat_summary": lambda i: {"role": i % 6},
+    "get_champion_percentile_in_role": lambda i: {"champion_label": LABELS[i % len(LABELS)], "role": 1 + i % 5},
+    "filter_champions_in_role": lambda i: {"role": i % 6, "min_win_rate": 50, "max_ban_rate": 15}
+}
+
+def _proc_status_kb(field:str) -> int:
+    for line in Path("/proc/self/status").read_text().splitlines():
+        if line.startswith(field + ":"):
+            return int(line.split()[1])
+    return 0
+
+def _percentile(sorted_values:list[float], percent:float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(percent / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+def _start_mcp_app() -> tuple[object, threading.Thread, str]:
+    # import only after the environment points at the fake upstreams, the config is read at import time
+    import uvicorn
+    import main
+
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    server = uvicorn.Server(uvicorn.Config(main.app, log_level="warning", lifespan="on"))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+
+    while not server.started:
+        time.sleep(0.01)
+
+    host, port = sock.getsockname()[:2]
+    return server, thread, f"http://{host}:{port}/mcp/"
+
+def _tool_result(response_text:str) -> dict:
+    # stateless streamable HTTP answers with a single SSE message (or plain JSON)
+    for line in response_text.splitlines():
+        if line.startswith("data:"):
+            return json.loads(line[5:])
+    return json.loads(response_text)
+
+async def _run_tool(client, url:str, tool:str, requests:int, concurrency:int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+    response_bytes = 0
+
+    async def call(i:int) -> None:
+        nonlocal errors, response_bytes
+        body = {"jsonrpc": "2.0", "id": i, "method": "tools/call", "params": {"name": tool, "arguments": SCENARIOS[tool](i)}}
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post(url, json=body)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        response_bytes += len(response.content)
+        result = _tool_result(response.text) if response.status_code == 200 else None
+        if result is None or "error" in result or result["result"].get("isError"):
+            errors += 1
+        elif '"error": true' in result["result"]["content"][0]["text"]:
+            errors += 1
+
+    # the server runs in this process, so RSS covers the client, the server and the fake upstreams together
+    rss_before = _proc_status_kb("VmRSS")
+    start = time.perf_counter()
+    await asyncio.gather(*(call(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "tool": tool,
+        "requests": requests,
+        "errors": errors,
+        "throughput_rps": round(requests / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 50), 2),
+        "p95_ms": round(_percentile(latencies, 95), 2),
+        "p99_ms": round(_percentile(latencies, 99), 2),
+        "mean_ms": round(statistics.mean(latencies), 2),
+        "avg_response_bytes": response_bytes // requests,
+        "process_rss_kb": _proc_status_kb("VmRSS"),
+        "process_rss_growth_kb": _proc_status_kb("VmRSS") - rss_before
+    }
+
+async def _run(url:str, tools:list[str], requests:int, concurrency:int) -> list[dict]:
+    import httpx
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    headers = {"Accept": "application/json, text/event-stream", "Content-Type": "application/json"}
+    async with httpx.AsyncClient(limits=limits, headers=headers, timeout=120) as client:
+        return [await _run_tool(client, url, tool, requests, concurrency) for tool in tools]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200, help="calls per tool")
+    parser.add_argument("--tools", default=",".join(SCENARIOS), help="comma separated tool names")
+    parser.add_argument("--upstream-latency-ms", type=float, default=20, help="added to every fake upstream response")
+    parser.add_argument("--history-days", type=int, default=90, help="snapshots per champion role in the fake API")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    tools = [tool.strip() for tool in args.tools.split(",") if tool.strip()]
+    unknown = [tool for tool in tools if tool not in SCENARIOS]
+    if unknown:
+        raise SystemExit(f"Unknown tools: {unknown}")
+
+    api = start_fake_statswr_api(args.upstream_latency_ms / 1000, args.history_days)
+    site = start_fake_matchup_site(args.upstream_latency_ms / 1000)
+    store_dir = tempfile.TemporaryDirectory()
+
+    os.environ["STATSWR_API_BASE_URL"] = f"{api.base_url}/api/v1"
+    os.environ.setdefault("DEFAULT_TIMEOUT", "60")
+    os.environ["MATCHUPS_BASE_URL"] = site.base_url
+    os.environ["MATCHUP_STORE_PATH"] = os.path.join(store_dir.name, "matchups.sqlite3")
+    os.environ["HISTORY_STORE_PATH"] = os.path.join(store_dir.name, "history.sqlite3")
+    os.environ["MATCHUP_WARMUP"] = "false"
+
+    server, thread, url = _start_mcp_app()
+    try:
+        report = asyncio.run(_run(url, tools, args.requests, args.concurrency))
+    finally:
+        # let the server run its lifespan shutdown before the upstreams and the store directory go away
+        server.should_exit = True
+        thread.join(timeout=30)
+        api.stop()
+        site.stop()
+        store_dir.cleanup()
+
+    columns = ("tool", "requests", "errors", "throughput_rps", "p50_ms", "p95_ms", "p99_ms", "avg_response_bytes", "process_rss_kb", "process_rss_growth_kb")
+    widths = {column: max(len(column), *(len(str(row[column])) for row in report)) for column in columns}
+    print("  ".join(column.ljust(widths[column]) for column in columns))
+    print("  ".join("-" * widths[column] for column in columns))
+    for row in report:
+        print("  ".join(str(row[column]).ljust(widths[column]) for column in columns))
+    print(f"\nconcurrency={args.concurrency} upstream_latency_ms={args.upstream_latency_ms} process_peak_rss_kb={_proc_status_kb('VmHWM')}", file=sys.stderr)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
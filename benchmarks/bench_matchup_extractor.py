@@ -0,0 +1,152 @@
+# compare the single-pass lxml matchup extractor against the original BeautifulSoup parser
+#
+# usage: python -m benchmarks.bench_matchup_extractor [--repeat N]
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+import tracemalloc
+from pathlib import Path
+from bs4 import BeautifulSoup
+
+# the config module requires these at import time, the extractor itself never uses them
+os.environ.setdefault('STATSWR_API_BASE_URL', 'http://127.0.0.1/api/v1')
+os.environ.setdefault('DEFAULT_TIMEOUT', '60')
+
+from mcp_src.web_scraping.matchup_extractor import extract_matchups
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "matchups"
+
+def legacy_parse_matchups(html_text):
+    # parsing loop of scrape_matchups before the single-pass extractor, kept verbatim as the baseline
+    soup = BeautifulSoup(html_text, 'lxml')
+
+    result = []
+    gallery_counter = 1
+
+    valid_roles = {'Top':1, 'Jungler':2, 'Mid':3, 'Bot':4, 'Bottom':4, 'Support':5}
+    necessary_paragraph = soup.find_all('p', class_="has-text-align-center")
+    for paragraph in necessary_paragraph:
+        if paragraph.text in valid_roles:
+
+            while not soup.find('div', id = f'gallery-{gallery_counter}') and gallery_counter < 20:
+                gallery_counter += 1 # APPARENTLY GALLERY DOESN'T ALWAYS START AT 1
+
+            if gallery_counter == 20:
+                result.append('there was an error scraping')
+                break
+
+            counters_container = soup.find('div', id = f'gallery-{gallery_counter}')
+            gallery_counter += 1
+            counters_figcaptions = counters_container.find_all('figcaption')
+            good_matchups_container = soup.find('div', id = f'gallery-{gallery_counter}')
+            gallery_counter += 1
+            good_matchups_figcaptions = good_matchups_container.find_all('figcaption')
+            counters = list(map(lambda x: x.a.text, counters_figcaptions))
+            good_matchups = list(map(lambda x: x.a.text, good_matchups_figcaptions))
+
+            parent = good_matchups_container.find_parent('div').find_parent('div')
+            sibling = parent.find_next_sibling()
+            info = []
+            while sibling and sibling.name == 'p': # returns 'p' 
+                info.append(sibling.text)
+                sibling = sibling.find_next_sibling()
+            if info and info[-1] in valid_roles:
+                info.pop()
+                
+            data = {'_role_id':valid_roles[paragraph.text], 'counters':counters, 'good_matchups':good_matchups, 'counter_strategy':" ".join(info)}
+            result.append(data)
+
+    return result
+
+IMPLEMENTATIONS = {
+    "legacy_bs4": legacy_parse_matchups,
+    "single_pass_lxml": extract_matchups
+}
+
+def _time_ms(parse, html_text:str, repeat:int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(html_text)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+def _python_heap_peak_kb(parse, html_text:str) -> float:
+    tracemalloc.start()
+    parse(html_text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+def _rss_growth_kb(implementation:str, fixture:Path) -> int:
+    # libxml2 allocates outside the Python heap, so also measure peak RSS growth in a fresh process
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_matchup_extractor", "--rss-child", implementation, str(fixture)],
+        capture_output=True, text=True, check=True
+    )
+    return int(output.stdout.strip())
+
+def _proc_status_kb(field:str) -> int:
+    for line in Path("/proc/self/status").read_text().splitlines():
+        if line.startswith(field + ":"):
+            return int(line.split()[1])
+    raise KeyError(field)
+
+def _rss_child(implementation:str, fixture:str) -> None:
+    html_text = Path(fixture).read_text(encoding='utf-8')
+    parse = IMPLEMENTATIONS[implementation]
+    # reset the RSS high-water mark (Linux only) so the peak below belongs to this one parse
+    Path("/proc/self/clear_refs").write_text("5")
+    before = _proc_status_kb("VmRSS")
+    parse(html_text)
+    print(_proc_status_kb("VmHWM") - before)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--rss-child", nargs=2, metavar=("IMPLEMENTATION", "FIXTURE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.rss_child:
+        _rss_child(*args.rss_child)
+        return
+
+    fixtures = sorted(FIXTURES_DIR.glob("*.html"))
+    report = []
+    for fixture in fixtures:
+        html_text = fixture.read_text(encoding='utf-8')
+
+        expected = legacy_parse_matchups(html_text)
+        # the legacy parser has no link slugs, compare everything else
+        actual = [{key: value for key, value in section.items() if not key.endswith('_slugs')} if isinstance(section, dict) else section for section in extract_matchups(html_text)]
+        if actual != expected:
+            raise SystemExit(f"{fixture.name}: extractor output differs from the legacy parser\n{expected}\n{actual}")
+
+        for name, parse in IMPLEMENTATIONS.items():
+            timings = _time_ms(parse, html_text, args.repeat)
+            report.append({
+                "fixture": fixture.name,
+                "size_kb": round(len(html_text) / 1024, 1),
+                "implementation": name,
+                "median_ms": round(statistics.median(timings), 3),
+                "p95_ms": round(sorted(timings)[int(len(timings) * 0.95) - 1], 3),
+                "python_heap_peak_kb": round(_python_heap_peak_kb(parse, html_text), 1),
+                "rss_growth_kb": _rss_growth_kb(name, fixture)
+            })
+
+    header = f"{'fixture':<18}{'size_kb':>9}  {'implementation':<18}{'median_ms':>10}{'p95_ms':>10}{'heap_peak_kb':>14}{'rss_growth_kb':>15}"
+    print(header)
+    print("-" * len(header))
+    for row in report:
+        print(f"{row['fixture']:<18}{row['size_kb']:>9}  {row['implementation']:<18}{row['median_ms']:>10}{row['p95_ms']:>10}{row['python_heap_peak_kb']:>14}{row['rss_growth_kb']:>15}")
+
+    if os.getenv("BENCH_JSON"):
+        Path(os.getenv("BENCH_JSON")).write_text(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
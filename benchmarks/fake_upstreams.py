@@ -0,0 +1,189 @@
+# local stand-ins for the statsWR API and wildriftcounter.com, used by the end-to-end benchmark
+
+import re
+import json
+import time
+import random
+import threading
+from pathlib import Path
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "matchups"
+
+CHAMPION_NAMES = [
+    "Aatrox", "Ahri", "Akali", "Akshan", "Alistar", "Amumu", "Annie", "Ashe", "Aurelion Sol", "Blitzcrank",
+    "Brand", "Braum", "Caitlyn", "Camille", "Corki", "Darius", "Diana", "Dr. Mundo", "Draven", "Ekko",
+    "Evelynn", "Ezreal", "Fiddlesticks", "Fiora", "Fizz", "Galio", "Garen", "Gragas", "Graves", "Gwen",
+    "Hecarim", "Heimerdinger", "Irelia", "Janna", "Jarvan IV", "Jax", "Jayce", "Jhin", "Jinx", "Kai'Sa",
+    "Kalista", "Karma", "Kassadin", "Katarina", "Kayle", "Kayn", "Kennen", "Kha'Zix", "Kindred", "Lee Sin",
+    "Leona", "Lillia", "Lucian", "Lulu", "Lux", "Malphite", "Master Yi", "Miss Fortune", "Morgana", "Nami",
+    "Nasus", "Nautilus", "Nilah", "Nunu & Willump", "Olaf", "Orianna", "Ornn", "Pantheon", "Poppy", "Pyke",
+    "Rakan", "Rammus", "Renekton", "Rengar", "Riven", "Rumble", "Samira", "Senna", "Seraphine", "Sett",
+    "Shen", "Shyvana", "Singed", "Sion", "Sivir", "Sona", "Soraka", "Swain", "Tristana", "Tryndamere",
+    "Twisted Fate", "Twitch", "Teemo", "Thresh", "Varus", "Vayne", "Veigar", "Vex", "Vi", "Viego",
+    "Vladimir", "Volibear", "Warwick", "Wukong", "Xayah", "Xin Zhao", "Yasuo", "Yone", "Yuumi", "Zed",
+    "Zeri", "Ziggs", "Zoe", "Zyra"
+]
+
+def champion_label(name:str) -> str:
+    # "Master Yi" -> "MASTER_YI", "Kai'Sa" -> "KAISA"
+    return re.sub(r'[^A-Z0-9]+', '_', name.upper().replace("'", "").replace(".", "")).strip('_')
+
+def champion_slug(name:str) -> str:
+    # "Dr. Mundo" -> "dr-mundo", "Kai'Sa" -> "kaisa"
+    return re.sub(r'[^a-z0-9]+', '-', name.lower().replace("'", "").replace(".", "")).strip('-')
+
+def build_dataset(history_days:int = 90, seed:int = 7) -> tuple[dict[str, list], list[dict]]:
+    """Per-champion histories and the all-roles latest snapshot, shaped like the statsWR responses"""
+    rnd = random.Random(seed)
+    today = date(2026, 1, 1)
+    histories = {}
+    latest = []
+
+    for name in CHAMPION_NAMES:
+        label = champion_label(name)
+        roles = rnd.sample([1, 2, 3, 4, 5], rnd.choice([1, 1, 2, 2, 3]))
+        histories[label] = []
+        for role in sorted(roles):
+            win, pick, ban = rnd.uniform(46, 54), rnd.uniform(0.5, 20), rnd.uniform(0, 30)
+            history = []
+            for day in range(history_days):
+                win = min(60, max(40, win + rnd.gauss(0, 0.3)))
+                pick = max(0, pick + rnd.gauss(0, 0.2))
+                ban = max(0, ban + rnd.gauss(0, 0.3))
+                history.append({
+                    "date": (today - timedelta(days=history_days - 1 - day)).isoformat(),
+                    "win_rate": win, "pick_rate": pick, "ban_rate": ban,
+                    "tier": rnd.choice(["S+", "S", "A", "B", "C"])
+                })
+            histories[label].append({"label": label, "role": role, "history": history})
+            latest.append({"label": label, "role": role, **history[-1]})
+
+    return histories, latest
+
+def build_comments(per_champion:int = 40, seed:int = 7) -> list[dict]:
+    """Comments on every champion, oldest first, shaped like a bulk comments response"""
+    rnd = random.Random(seed)
+    start = date(2025, 6, 1)
+    comments = []
+    for name in CHAMPION_NAMES:
+        for _ in range(rnd.randint(0, per_champion)):
+            comments.append({
+                "champion_label": champion_label(name),
+                "date": (start + timedelta(days=rnd.randint(0, 213))).isoformat(),
+                "author": f"player{rnd.randint(1, 5000)}",
+                "text": rnd.choice(["Strong early", "Falls off late", "Needs a buff", "Broken with the new item", "Easy to counter"])
+            })
+    comments.sort(key=lambda comment: comment["date"])
+    for i, comment in enumerate(comments):
+        comment["id"] = i
+    return comments
+
+def build_abilities() -> list[dict]:
+    """One row per champion holding its passive and four skills"""
+    return [
+        {"name": name, "abilities": [{"slot": slot, "name": f"{name} {slot}", "description": f"{name}'s {slot} ability."} for slot in ("P", "1", "2", "3", "Ult")]}
+        for name in CHAMPION_NAMES
+    ]
+
+class _Server:
+    def __init__(self, handler_class):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler_class)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "_Server":
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+class _QuietHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # keep-alive, like the real upstreams
+    latency = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status:int, body:bytes, content_type:str, headers:dict[str, str] | None = None) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+def start_fake_statswr_api(latency:float = 0.0, history_days:int = 90) -> _Server:
+    """Serves /api/v1/champions/{label}, /api/v1/champions/lanes/{role}, /api/v1/comments and /api/v1/abilities"""
+    histories, latest = build_dataset(history_days)
+    bulk_bodies = {
+        "/api/v1/comments": json.dumps({"comments": build_comments()}).encode(),
+        "/api/v1/abilities": json.dumps(build_abilities()).encode()
+    }
+    champion_bodies = {label: json.dumps({"champion": rows}).encode() for label, rows in histories.items()}
+    lane_bodies = {0: json.dumps({"champions": latest}).encode()}
+    for role in range(1, 6):
+        lane_bodies[role] = json.dumps({"champions": [row for row in latest if row["role"] == role]}).encode()
+
+    class Handler(_QuietHandler):
+        def do_GET(self):
+            if self.path in bulk_bodies:
+                return self._send(200, bulk_bodies[self.path], "application/json")
+
+            match = re.fullmatch(r'/api/v1/champions/lanes/(\d+)', self.path)
+            if match and int(match.group(1)) in lane_bodies:
+                return self._send(200, lane_bodies[int(match.group(1))], "application/json")
+
+            match = re.fullmatch(r'/api/v1/champions/([A-Z0-9_]+)', self.path)
+            if match and match.group(1) in champion_bodies:
+                return self._send(200, champion_bodies[match.group(1)], "application/json")
+
+            return self._send(404, b'{"error":"not found"}', "application/json")
+
+    Handler.latency = latency
+    return _Server(Handler).start()
+
+def start_fake_matchup_site(latency:float = 0.0) -> _Server:
+    """Serves the saved wildriftcounter.com fixtures for every champion slug, with ETag support"""
+    fixtures = [path.read_bytes() for path in sorted(FIXTURES_DIR.glob("*.html"))]
+    pages = {champion_slug(name): fixtures[i % len(fixtures)] for i, name in enumerate(CHAMPION_NAMES)}
+    index = "".join(f'<a href="/champions/{slug}/">{slug}</a>' for slug in pages).encode()
+
+    class Handler(_QuietHandler):
+        def do_GET(self):
+            if self.path == "/champions/":
+                return self._send(200, index, "text/html; charset=UTF-8")
+
+            match = re.fullmatch(r'/champions/([a-z0-9-]+)/', self.path)
+            if not match or match.group(1) not in pages:
+                return self._send(404, b"<html><body>Not found</body></html>", "text/html; charset=UTF-8")
+
+            etag = f'"{match.group(1)}-v1"'
+            if self.headers.get("If-None-Match") == etag:
+                return self._send(304, b"", "text/html; charset=UTF-8", {"ETag": etag})
+            return self._send(200, pages[match.group(1)], "text/html; charset=UTF-8", {"ETag": etag})
+
+    Handler.latency = latency
+    return _Server(Handler).start()
+
+__all__ = [
+    "CHAMPION_NAMES",
+    "champion_label",
+    "champion_slug",
+    "build_dataset",
+    "build_comments",
+    "build_abilities",
+    "start_fake_statswr_api",
+    "start_fake_matchup_site"
+]
@@ -1,25 +1,59 @@
 # main.py
+import os
+import asyncio
 import contextlib
 from fastapi import FastAPI
 from mcp_src import statsWR_mcp_server
+from mcp_src.mcp_configs import config
+from mcp_src.api_requests.http_client import start_http_client, close_http_client
+from mcp_src.web_scraping import start_matchup_warmup, stop_matchup_warmup
+from mcp_src.prefetch import start_prefetch_scheduler, stop_prefetch_scheduler
+from mcp_src.caching import close_shared_store
 from mangum import Mangum
 
 _session_started = False
 _session_context = None
+_prewarmed = False
+
+# Mangum runs the lifespan around every Lambda invocation, so the pooled client has to outlive it there
+_running_on_lambda = "AWS_LAMBDA_FUNCTION_NAME" in os.environ
 
 @contextlib.asynccontextmanager
 async def lifespan(app: FastAPI):
-    global _session_started, _session_context
+    global _session_started, _session_context, _prewarmed
     
     if not _session_started:
         # Start session manager only once per container
         _session_context = statsWR_mcp_server.mcp.session_manager.run()
         await _session_context.__aenter__()
         _session_started = True
+
+    await start_http_client()
+    if config.API_CONFIG.PREWARM_ON_INIT and not _prewarmed:
+        await statsWR_mcp_server.prewarm()
+        _prewarmed = True
+    start_matchup_warmup()
+    if not _running_on_lambda:
+        # a frozen Lambda only runs the scheduler while it handles a request, its refreshes would add to that request's latency
+        start_prefetch_scheduler()
     
     yield
 
+    if not _running_on_lambda:
+        await stop_prefetch_scheduler()
+        await stop_matchup_warmup()
+        await close_shared_store()
+        await close_http_client()
+        # leave the session manager in the task that entered it, the event loop would otherwise close it from its own task
+        await _session_context.__aexit__(None, None, None)
+
 app = FastAPI(lifespan=lifespan)
 app.mount("/", statsWR_mcp_server.mcp.streamable_http_app())
 
-handler = Mangum(app)
\ No newline at end of file
+handler = Mangum(app)
+
+if _running_on_lambda and config.API_CONFIG.PREWARM_ON_INIT:
+    # prewarm during the Lambda init phase; Mangum runs every invocation on this same event loop
+    asyncio.set_event_loop(asyncio.new_event_loop())
+    asyncio.get_event_loop().run_until_complete(statsWR_mcp_server.prewarm())
+    _prewarmed = True
@@ -0,0 +1,13 @@
+from .role_columns import *
+from .matchup_graph import *
+
+__all__ = [
+    "STAT_FIELDS",
+    "RoleColumns",
+    "role_columns_for",
+    "get_role_columns",
+    "MatchupGraph",
+    "get_matchup_graph",
+    "load_matchup_graph",
+    "matchup_graph_stats"
+]
@@ -0,0 +1,222 @@
+# role-aware directed matchup graph over every stored champion page, for counter queries that need no scraping
+
+import asyncio
+import logging
+from typing import Any, Iterable
+from mcp_src.mcp_configs import config
+from mcp_src.name_resolution import ChampionName
+from mcp_src.web_scraping.matchup_store import get_matchup_store, get_matchups
+
+logger = logging.getLogger(__name__)
+
+ROLES = (0, 1, 2, 3, 4, 5) # 0 holds the edges of every role
+
+Adjacency = dict[str, dict[str, int]] # champion slug -> neighbour slug -> weight
+Edge = tuple[str, str, int] # (winner, loser, role)
+
+def _slug(name:str) -> str:
+    # slug guessed from a display name ('Lee Sin' -> 'lee-sin'), only for a caption whose link isn't a champion page
+    return ChampionName.from_text(name).slug
+
+class MatchupGraph:
+    """
+    Directed "beats" edges between champion slugs, per role.
+
+    Champions are keyed by their wildriftcounter.com page slug, taken from the caption links so an edge always lands
+    on the champion's own stored page. A stored page of champion X in role r says each of its counters beats X and X
+    beats each of its good matchups, so an edge may be backed by both champions' pages; its weight counts the pages
+    backing it, once per page however many of its role sections repeat the matchup. Forward (beats) and reverse
+    (beaten_by) adjacency are both indexed, so either direction is a dict lookup. The edges of each page are kept so a
+    page stored again replaces them.
+    """
+
+    def __init__(self):
+        self._beats: dict[int, Adjacency] = {role: {} for role in ROLES}
+        self._beaten_by: dict[int, Adjacency] = {role: {} for role in ROLES}
+        self._page_edges: dict[str, set[Edge]] = {} # champion slug -> edges its page backs
+        self.names: dict[str, str] = {} # slug -> display name, for champions seen in a caption
+
+    @classmethod
+    def from_pages(cls, pages:Iterable[tuple[str, list[Any]]]) -> "MatchupGraph":
+        graph = cls()
+        for slug, data in pages:
+            graph.add_page(slug, data)
+        return graph
+
+    @property
+    def pages(self) -> set[str]:
+        # champions whose own page is in the graph
+        return set(self._page_edges)
+
+    def add_page(self, slug:str, data:list[Any]) -> None:
+        """Add a champion's page, replacing the edges of the page held for it before"""
+        self.remove_page(slug)
+
+        edges: set[Edge] = set()
+        for section in data:
+            if not isinstance(section, dict) or section.get('_role_id') not in ROLES:
+                continue
+            role = section['_role_id']
+            for other in self._linked(section, 'counters', 'counter_slugs'):
+                edges.add((other, slug, role))
+            for other in self._linked(section, 'good_matchups', 'good_matchup_slugs'):
+                edges.add((slug, other, role))
+        # role 0 holds every role's edges, a matchup listed in several role sections still counts once there
+        edges = {edge for edge in edges if edge[0] != edge[1]}
+        edges |= {(winner, loser, 0) for winner, loser, _ in edges}
+
+        for winner, loser, role in edges:
+            self._change_edge(winner, loser, role, 1)
+        self._page_edges[slug] = edges
+
+    def remove_page(self, slug:str) -> None:
+        for winner, loser, role in self._page_edges.pop(slug, ()):
+            self._change_edge(winner, loser, role, -1)
+
+    def _linked(self, section:dict[str, Any], names_key:str, slugs_key:str) -> list[str]:
+        # the slug of each caption's link, the caption text only names it (and stands in for a link that had none)
+        names = section.get(names_key, [])
+        slugs = section.get(slugs_key) or []
+        linked = []
+        for i, name in enumerate(names):
+            slug = slugs[i] if i < len(slugs) and slugs[i] else _slug(name)
+            self.names.setdefault(slug, name)
+            linked.append(slug)
+        return linked
+
+    def _change_edge(self, winner:str, loser:str, role:int, delta:int) -> None:
+        for adjacency, source, target in ((self._beats[role], winner, loser), (self._beaten_by[role], loser, winner)):
+            neighbours = adjacency.setdefault(source, {})
+            weight = neighbours.get(target, 0) + delta
+            if weight > 0:
+                neighbours[target] = weight
+            else:
+                neighbours.pop(target, None)
+                if not neighbours:
+                    del adjacency[source]
+
+    def name_of(self, slug:str) -> str:
+        return self.names.get(slug) or ChampionName(slug.upper().replace('-', '_')).display_name
+
+    def beats(self, slug:str, role:int = 0) -> dict[str, int]:
+        return self._beats[role].get(slug, {})
+
+    def beaten_by(self, slug:str, role:int = 0) -> dict[str, int]:
+        return self._beaten_by[role].get(slug, {})
+
+    def _ranked(self, weights:dict[str, int]) -> list[dict[str, Any]]:
+        ordered = sorted(weights.items(), key=lambda item: (-item[1], item[0]))
+        return [{"champion_name": slug, "name": self.name_of(slug), "weight": weight} for slug, weight in ordered]
+
+    def matchups_of(self, slug:str, role:int = 0) -> dict[str, Any]:
+        """Who beats the champion (counters) and who it beats (good_matchups), backed by every stored page"""
+        return {
+            "champion_name": slug,
+            "name": self.name_of(slug),
+            "role": role,
+            "counters": self._ranked(self.beaten_by(slug, role)),
+            "good_matchups": self._ranked(self.beats(slug, role))
+        }
+
+    def counters_of_all(self, targets:list[str], role:int = 0) -> list[dict[str, Any]]:
+        """Champions beating any of targets, those beating the most of them (then by total weight) first"""
+        found: dict[str, dict[str, int]] = {}
+        for target in targets:
+            for winner, weight in self.beaten_by(target, role).items():
+                if winner not in targets:
+                    found.setdefault(winner, {})[target] = weight
+
+        ranked = sorted(found.items(), key=lambda item: (-len(item[1]), -sum(item[1].values()), item[0]))
+        return [
+            {
+                "champion_name": slug,
+                "name": self.name_of(slug),
+                "beats": [target for target in targets if target in beaten],
+                "beats_all": len(beaten) == len(targets),
+                "score": sum(beaten.values())
+            }
+            for slug, beaten in ranked
+        ]
+
+    def best_picks(self, enemies:list[str], role:int = 0) -> list[dict[str, Any]]:
+        """
+        Champions scored against an enemy team: the weight of every enemy they beat minus the weight of every enemy
+        beating them. Only champions with at least one edge to an enemy are scored.
+        """
+        scores: dict[str, tuple[list[str], list[str], int]] = {}
+        for enemy in enemies:
+            for candidate, weight in self.beaten_by(enemy, role).items():
+                wins, losses, score = scores.get(candidate, ([], [], 0))
+                scores[candidate] = (wins + [enemy], losses, score + weight)
+            for candidate, weight in self.beats(enemy, role).items():
+                wins, losses, score = scores.get(candidate, ([], [], 0))
+                scores[candidate] = (wins, losses + [enemy], score - weight)
+
+        ranked = sorted(
+            ((slug, entry) for slug, entry in scores.items() if slug not in enemies),
+            key=lambda item: (-item[1][2], -len(item[1][0]), item[0])
+        )
+        return [
+            {"champion_name": slug, "name": self.name_of(slug), "score": score, "beats": wins, "loses_to": losses}
+            for slug, (wins, losses, score) in ranked
+        ]
+
+    def stats(self, roster:Iterable[str] | None = None) -> dict[str, Any]:
+        """
+        Graph size, and with the slugs of the whole roster how many of them have their own page in the graph: answers
+        only cover those champions' pages and the edges other pages hold to them.
+        """
+        stats = {
+            "pages": len(self._page_edges),
+            "champions": len(set(self._beats[0]) | set(self._beaten_by[0])),
+            "edges": sum(len(losers) for losers in self._beats[0].values()),
+            "warmup": config.API_CONFIG.MATCHUP_WARMUP
+        }
+        if roster is not None:
+            roster = set(roster)
+            stats["roster"] = len(roster)
+            stats["roster_pages"] = len(roster & self._page_edges.keys())
+            stats["coverage"] = round(stats["roster_pages"] / len(roster), 2) if roster else 0.0
+        return stats
+
+_graph = MatchupGraph()
+_graph_seq: int | None = None # newest store write already in the graph
+_graph_lock = asyncio.Lock()
+
+async def get_matchup_graph() -> MatchupGraph:
+    """The graph over every stored page, updated with only the pages written to the matchup store since the last call"""
+    global _graph_seq
+
+    async with _graph_lock:
+        pages, newest = await asyncio.to_thread(get_matchup_store().changed_since, _graph_seq)
+        for slug, data in pages:
+            _graph.add_page(slug, data)
+        if pages and _graph_seq is None:
+            logger.info("Built matchup graph", extra=_graph.stats())
+        _graph_seq = newest
+
+    return _graph
+
+async def load_matchup_graph(slugs:list[str]) -> MatchupGraph:
+    """
+    The graph, after making sure the pages of slugs are stored (a scrape only for a champion never stored before).
+
+    Edges between other champions come from whatever the store holds, see MATCHUP_WARMUP to crawl the whole roster.
+    """
+    results = await asyncio.gather(*(get_matchups(slug) for slug in slugs), return_exceptions=True)
+    for slug, result in zip(slugs, results):
+        if isinstance(result, BaseException):
+            # the other champions' pages may still hold edges to it
+            logger.warning(f"Matchups of {slug} unavailable, answering from the stored graph: {result}")
+
+    return await get_matchup_graph()
+
+def matchup_graph_stats() -> dict[str, Any]:
+    return _graph.stats()
+
+__all__ = [
+    "MatchupGraph",
+    "get_matchup_graph",
+    "load_matchup_graph",
+    "matchup_graph_stats"
+]
@@ -0,0 +1,139 @@
+# columnar (NumPy-backed) view of the all-roles snapshot for server-side ranking and aggregation
+
+from typing import Any
+import numpy as np
+from mcp_src.api_requests.champion.snapshot import STAT_FIELDS, RoleSnapshot, champion_label_of, role_of
+from mcp_src.api_requests.champion.gameplay_data import get_role_snapshot
+
+def _stat_value(row:dict[str, Any], keys:tuple[str, ...]) -> float:
+    for key in keys:
+        value = row.get(key)
+        if value is None:
+            continue
+        try:
+            return float(str(value).rstrip('%'))
+        except ValueError:
+            continue
+    return np.nan
+
+class RoleColumns:
+    """
+    One array per column of the snapshot: champion labels, roles and every stat in STAT_FIELDS.
+
+    Missing stats are NaN and are ignored by every aggregate.
+    """
+
+    def __init__(self, snapshot:RoleSnapshot):
+        rows = snapshot.rows
+        self.labels = np.array([champion_label_of(row) or "" for row in rows], dtype=object)
+        self.roles = np.array([role_of(row) or 0 for row in rows], dtype=np.int8)
+        self.stats = {
+            stat: np.fromiter((_stat_value(row, keys) for row in rows), dtype=np.float64, count=len(rows))
+            for stat, keys in STAT_FIELDS.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def _role_mask(self, role:int) -> np.ndarray:
+        if role == 0:
+            return np.ones(len(self.labels), dtype=bool)
+        return self.roles == role
+
+    def _record(self, index:int) -> dict[str, Any]:
+        record = {"champion_label": self.labels[index], "role": int(self.roles[index])}
+        for stat, values in self.stats.items():
+            value = values[index]
+            record[stat] = None if np.isnan(value) else float(value)
+        return record
+
+    def top(self, stat:str, role:int = 0, n:int = 10, ascending:bool = False) -> list[dict[str, Any]]:
+        values = self.stats[stat]
+        candidates = np.flatnonzero(self._role_mask(role) & ~np.isnan(values))
+        order = np.argsort(values[candidates], kind='stable')
+        if not ascending:
+            order = order[::-1]
+        return [self._record(index) for index in candidates[order[:n]]]
+
+    def summary(self, role:int = 0) -> dict[str, Any]:
+        mask = self._role_mask(role)
+        summary = {"role": role, "champion_count": int(mask.sum())}
+        for stat, values in self.stats.items():
+            role_values = values[mask]
+            role_values = role_values[~np.isnan(role_values)]
+            if role_values.size == 0:
+                summary[stat] = None
+                continue
+            summary[stat] = {
+                "mean": float(role_values.mean()),
+                "median": float(np.median(role_values)),
+                "std": float(role_values.std()),
+                "min": float(role_values.min()),
+                "max": float(role_values.max()),
+                "p25": float(np.percentile(role_values, 25)),
+                "p75": float(np.percentile(role_values, 75))
+            }
+        return summary
+
+    def percentile(self, champion_label:str, role:int) -> dict[str, Any] | None:
+        # role 1-5: a champion has one row per role it is played in, so role 0 wouldn't say which one to rank
+        mask = self._role_mask(role)
+        matches = np.flatnonzero(mask & (self.labels == champion_label.upper()))
+        if matches.size == 0:
+            return None
+
+        index = matches[0]
+        result = self._record(index)
+        for stat, values in self.stats.items():
+            value = values[index]
+            role_values = values[mask]
+            role_values = role_values[~np.isnan(role_values)]
+            if np.isnan(value) or role_values.size == 0:
+                result[f"{stat}_percentile"] = None
+                result[f"{stat}_vs_role_mean"] = None
+                continue
+            # mid-rank percentile: ties count half
+            below = np.count_nonzero(role_values < value)
+            equal = np.count_nonzero(role_values == value)
+            result[f"{stat}_percentile"] = float((below + 0.5 * equal) / role_values.size * 100)
+            result[f"{stat}_vs_role_mean"] = float(value - role_values.mean())
+        return result
+
+    def filter(self, role:int = 0, minimums:dict[str, float] | None = None, maximums:dict[str, float] | None = None, sort_by:str = 'win_rate') -> list[dict[str, Any]]:
+        mask = self._role_mask(role)
+        # NaN comparisons are False, so champions missing a filtered stat are dropped
+        for stat, threshold in (minimums or {}).items():
+            mask &= self.stats[stat] >= threshold
+        for stat, threshold in (maximums or {}).items():
+            mask &= self.stats[stat] <= threshold
+
+        matches = np.flatnonzero(mask)
+        order = np.argsort(-np.nan_to_num(self.stats[sort_by][matches], nan=-np.inf), kind='stable')
+        return [self._record(index) for index in matches[order]]
+
+_columns: RoleColumns | None = None
+_columns_snapshot: RoleSnapshot | None = None
+
+def role_columns_for(snapshot:RoleSnapshot) -> RoleColumns:
+    # the arrays are rebuilt only when the cached snapshot is replaced
+    global _columns, _columns_snapshot
+
+    if _columns is None or _columns_snapshot is not snapshot:
+        _columns = RoleColumns(snapshot)
+        _columns_snapshot = snapshot
+
+    return _columns
+
+async def get_role_columns() -> RoleColumns | None:
+    snapshot = await get_role_snapshot()
+    if snapshot is None:
+        return None
+
+    return role_columns_for(snapshot)
+
+__all__ = [
+    "STAT_FIELDS",
+    "RoleColumns",
+    "role_columns_for",
+    "get_role_columns"
+]
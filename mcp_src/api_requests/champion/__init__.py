@@ -1,6 +1,15 @@
 from .gameplay_data import *
+from .comments import get_comments_for_one_champ
+from .abilities import get_ability_descriptions_for_single_champ
 
 __all__ = [
+    "get_champion_history",
+    "history_store_stats",
     "get_all_data_for_single_champ_all_roles",
-    "get_most_recent_data_for_all_champs_by_role"
+    "get_all_data_for_multiple_champs_all_roles",
+    "get_most_recent_data_for_all_champs_by_role",
+    "get_most_recent_data_for_single_champ",
+    "get_role_snapshot",
+    "get_comments_for_one_champ",
+    "get_ability_descriptions_for_single_champ"
 ]
\ No newline at end of file
@@ -1,13 +1,86 @@
-import httpx
+# every champion's ability descriptions, bulk loaded from statsWR into a per-champion table refreshed rarely
+
+import asyncio
 from typing import Any
-from mcp_configs import config
+from mcp_src.mcp_configs import config
+from mcp_src.caching import AsyncTTLCache, record_access
+from mcp_src.response_shaping.shaping import loads
+from mcp_src.api_requests.resilience import UPSTREAM_FAILURES, resilient_get
+from .snapshot import CHAMPION_LABEL_FIELDS, require_fields, rows_of, to_label
+
+class AbilityTable:
+    """
+    Ability descriptions per champion label.
+
+    The bulk response may list champions each holding an 'abilities' list, or one row per ability naming its champion.
+    """
+
+    def __init__(self, rows:list[Any]):
+        self._abilities: dict[str, list[dict[str, Any]]] = {}
+        for row in rows:
+            if not isinstance(row, dict):
+                continue
+            label = next((to_label(row[field]) for field in CHAMPION_LABEL_FIELDS if isinstance(row.get(field), str) and row[field]), None)
+            if label is None:
+                continue
+            if isinstance(row.get('abilities'), list):
+                self._abilities.setdefault(label, []).extend(row['abilities'])
+            else:
+                self._abilities.setdefault(label, []).append(row)
+
+    def for_champion(self, champion_label:str) -> list[dict[str, Any]]:
+        return self._abilities.get(champion_label.upper(), [])
+
+    def __len__(self) -> int:
+        return len(self._abilities)
+
+_ability_cache = AsyncTTLCache(
+    "abilities",
+    max_entries=1, # one bulk load holds every champion
+    ttl=config.API_CONFIG.ABILITIES_TTL,
+    stale_ttl=config.API_CONFIG.ABILITIES_TTL, # descriptions only change with patches
+    negative_ttl=config.API_CONFIG.CACHE_NEGATIVE_TTL,
+    fallback_on=UPSTREAM_FAILURES
+)
+
+async def _fetch_ability_table() -> AbilityTable | None:
+    url = f"{config.API_CONFIG.BASE_URL}{config.API_CONFIG.ABILITIES_PATH}"
+
+    response = await resilient_get(url, timeout=config.API_CONFIG.DEFAULT_TIMEOUT, headers=config.API_CONFIG.DEFAULT_HEADERS)
+    if response.status_code == 404:
+        return None
+
+    response.raise_for_status()
+    rows = rows_of(loads(response.content), 'abilities')
+    require_fields(rows, CHAMPION_LABEL_FIELDS, "abilities")
+
+    return AbilityTable(rows)
+
+# used by the prefetch scheduler, which must not count as demand itself
+
+def abilities_expire_in() -> float | None:
+    if _ability_cache.peek(0) is None:
+        return None
+    return _ability_cache.expires_in(0)
+
+def refresh_abilities() -> asyncio.Task:
+    return _ability_cache.refresh(0, _fetch_ability_table)
+
+async def get_ability_table() -> AbilityTable | None:
+    record_access("abilities", 0)
+    return await _ability_cache.get_or_fetch(0, _fetch_ability_table)
 
 async def get_ability_descriptions_for_single_champ(champion_label:str) -> list[dict[str, Any]] | None:
-    url = ""
-    
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url, timeout=60)
-            response.raise_for_status()
-        except Exception as e:
-            return None
\ No newline at end of file
+    table = await get_ability_table()
+    if table is None:
+        return None
+
+    return table.for_champion(champion_label) or None
+
+__all__ = [
+    "AbilityTable",
+    "abilities_expire_in",
+    "refresh_abilities",
+    "get_ability_table",
+    "get_ability_descriptions_for_single_champ"
+]
@@ -1,23 +1,154 @@
-import httpx
+# every champion's comments, bulk loaded from statsWR into a newest-first index with cursor pagination
+
+import base64
+import bisect
+import hashlib
+import json
+import asyncio
 from typing import Any
-from mcp_configs import config
-
-async def get_comments_for_one_champ(champion_label:str) -> list[dict[str, Any]] | None:
-    url = ""
-    
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url, timeout=60)
-            response.raise_for_status()
-        except Exception as e:
-            return None
-
-async def get_comments_for_all_champs() -> list[dict[str, Any]] | None:
-    url = ""
-    
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url, timeout=60)
-            response.raise_for_status()
-        except Exception as e:
-            return None
\ No newline at end of file
+from mcp_src.mcp_configs import config
+from mcp_src.caching import AsyncTTLCache, record_access
+from mcp_src.response_shaping.shaping import DATE_FIELDS, loads
+from mcp_src.api_requests.resilience import UPSTREAM_FAILURES, resilient_get
+from .snapshot import require_fields, rows_of, to_label
+
+# a comment names its champion under one of these keys ('name' is left out, on a comment it is usually the author)
+COMMENT_CHAMPION_FIELDS = ('champion_label', 'championLabel', 'champion', 'label')
+COMMENT_ID_FIELDS = ('id', '_id', 'comment_id', 'commentId')
+
+def _comment_champion(comment:dict[str, Any]) -> str | None:
+    for field in COMMENT_CHAMPION_FIELDS:
+        value = comment.get(field)
+        if isinstance(value, str) and value:
+            return to_label(value)
+    return None
+
+# (date, id kind, numeric id, other id): numeric ids compare as numbers, other ids as strings after them, and a
+# comment without an id by a hash of its content, so a key (and a cursor holding it) survives a reload of the bulk data
+CommentKey = tuple[str, int, int, str]
+
+def _comment_key(comment:dict[str, Any]) -> CommentKey:
+    posted = next((str(comment[field]) for field in DATE_FIELDS if comment.get(field) is not None), '')
+    comment_id = next((comment[field] for field in COMMENT_ID_FIELDS if comment.get(field) is not None), None)
+    if comment_id is None:
+        content = json.dumps(comment, sort_keys=True, separators=(',', ':'), default=str)
+        return posted, 2, 0, hashlib.sha1(content.encode()).hexdigest()
+    try:
+        return posted, 0, int(str(comment_id)), ''
+    except ValueError:
+        return posted, 1, 0, str(comment_id)
+
+class InvalidCursorError(ValueError):
+    """A cursor that wasn't produced by encode_cursor"""
+
+def encode_cursor(key:CommentKey) -> str:
+    return base64.urlsafe_b64encode(json.dumps(key, separators=(',', ':')).encode()).decode()
+
+def decode_cursor(cursor:str) -> CommentKey:
+    """Raises InvalidCursorError for a cursor that wasn't produced by encode_cursor"""
+    try:
+        posted, kind, number, other = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception as e:
+        raise InvalidCursorError("Invalid cursor") from e
+    if not (isinstance(posted, str) and isinstance(kind, int) and isinstance(number, int) and isinstance(other, str)):
+        raise InvalidCursorError("Invalid cursor")
+    return posted, kind, number, other
+
+class CommentIndex:
+    """
+    Comments grouped by champion label, each group held oldest first with its sort keys.
+
+    Pages are returned newest first; a cursor is the sort key of the last comment returned, so pages stay
+    consistent when newer comments arrive between requests.
+    """
+
+    def __init__(self, comments:list[dict[str, Any]]):
+        grouped: dict[str, list[tuple[CommentKey, dict[str, Any]]]] = {}
+        for comment in comments:
+            if not isinstance(comment, dict):
+                continue
+            label = _comment_champion(comment)
+            if label is not None:
+                grouped.setdefault(label, []).append((_comment_key(comment), comment))
+
+        self._keys: dict[str, list[CommentKey]] = {}
+        self._comments: dict[str, list[dict[str, Any]]] = {}
+        for label, entries in grouped.items():
+            entries.sort(key=lambda entry: entry[0])
+            self._keys[label] = [key for key, _ in entries]
+            self._comments[label] = [comment for _, comment in entries]
+
+    def count(self, champion_label:str) -> int:
+        return len(self._comments.get(champion_label.upper(), ()))
+
+    def page(self, champion_label:str, limit:int, cursor:str | None = None) -> tuple[list[dict[str, Any]], str | None]:
+        """Up to limit comments older than cursor (or the newest ones), newest first, and the cursor of the next page"""
+        label = champion_label.upper()
+        keys = self._keys.get(label, [])
+        comments = self._comments.get(label, [])
+
+        end = bisect.bisect_left(keys, decode_cursor(cursor)) if cursor else len(keys)
+        start = max(0, end - limit)
+
+        next_cursor = encode_cursor(keys[start]) if start > 0 else None
+        return comments[start:end][::-1], next_cursor
+
+    def __len__(self) -> int:
+        return sum(len(comments) for comments in self._comments.values())
+
+_comment_cache = AsyncTTLCache(
+    "comments",
+    max_entries=1, # one bulk load holds every champion
+    ttl=config.API_CONFIG.COMMENTS_TTL,
+    stale_ttl=config.API_CONFIG.CACHE_STALE_TTL,
+    negative_ttl=config.API_CONFIG.CACHE_NEGATIVE_TTL,
+    fallback_on=UPSTREAM_FAILURES
+)
+
+async def _fetch_comment_index() -> CommentIndex | None:
+    url = f"{config.API_CONFIG.BASE_URL}{config.API_CONFIG.COMMENTS_PATH}"
+
+    response = await resilient_get(url, timeout=config.API_CONFIG.DEFAULT_TIMEOUT, headers=config.API_CONFIG.DEFAULT_HEADERS)
+    if response.status_code == 404:
+        return None
+
+    response.raise_for_status()
+    rows = rows_of(loads(response.content), 'comments')
+    require_fields(rows, COMMENT_CHAMPION_FIELDS, "comments")
+
+    return CommentIndex(rows)
+
+# used by the prefetch scheduler, which must not count as demand itself
+
+def comments_expire_in() -> float | None:
+    if _comment_cache.peek(0) is None:
+        return None
+    return _comment_cache.expires_in(0)
+
+def refresh_comments() -> asyncio.Task:
+    return _comment_cache.refresh(0, _fetch_comment_index)
+
+async def get_comments_for_all_champs() -> CommentIndex | None:
+    record_access("comments", 0)
+    return await _comment_cache.get_or_fetch(0, _fetch_comment_index)
+
+async def get_comments_for_one_champ(champion_label:str, limit:int | None = None, cursor:str | None = None) -> tuple[list[dict[str, Any]], str | None, int] | None:
+    """A page of a champion's comments newest first, the cursor of the next page and the champion's comment count"""
+    index = await get_comments_for_all_champs()
+    if index is None:
+        return None
+
+    limit = config.API_CONFIG.COMMENTS_PAGE_SIZE if limit is None else limit
+    comments, next_cursor = index.page(champion_label, limit, cursor)
+    return comments, next_cursor, index.count(champion_label)
+
+__all__ = [
+    "CommentIndex",
+    "InvalidCursorError",
+    "encode_cursor",
+    "decode_cursor",
+    "comments_expire_in",
+    "refresh_comments",
+    "get_comments_for_all_champs",
+    "get_comments_for_one_champ"
+]
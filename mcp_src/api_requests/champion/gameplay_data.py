@@ -1,49 +1,177 @@
 # make request to statsWR champion gameplay data api
 
-import httpx
+import asyncio
+import logging
+import sqlite3
 from typing import Any
 from mcp_src.mcp_configs import config
+from mcp_src.caching import AsyncTTLCache, record_access, shared_fetch
+from mcp_src.response_shaping.shaping import loads
+from mcp_src.api_requests.resilience import UPSTREAM_FAILURES, resilient_get
+from .snapshot import RoleSnapshot
+from .history_store import ChampionHistory, HistoryStore
 
-async def get_all_data_for_single_champ_all_roles(champion_label:str) -> list[dict[str, Any]] | None:
-    url = f"{config.API_CONFIG.BASE_URL}/champions/{champion_label}" # first part of path is from vercel deployment, everything afer /v1 is for statsWR route
+logger = logging.getLogger(__name__)
 
-    print("base url:", config.API_CONFIG.BASE_URL)
-    print("default timeout:", config.API_CONFIG.DEFAULT_TIMEOUT)
-    print("default headers:", config.API_CONFIG.DEFAULT_HEADERS)
+_champion_cache = AsyncTTLCache(
+    "champion",
+    max_entries=config.API_CONFIG.CACHE_MAX_ENTRIES,
+    ttl=config.API_CONFIG.CACHE_TTL,
+    stale_ttl=config.API_CONFIG.CACHE_STALE_TTL,
+    negative_ttl=config.API_CONFIG.CACHE_NEGATIVE_TTL,
+    fallback_on=UPSTREAM_FAILURES
+)
+# full histories are downloaded once per champion (and kept across restarts), afterwards only the newest snapshot is appended
+_history_store = HistoryStore(config.API_CONFIG.CACHE_MAX_ENTRIES, config.API_CONFIG.HISTORY_STORE_PATH)
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url, timeout=int(config.API_CONFIG.DEFAULT_TIMEOUT), headers=config.API_CONFIG.DEFAULT_HEADERS)
-            response.raise_for_status()
-            res = response.json()
+_snapshot_cache = AsyncTTLCache(
+    "role_snapshot",
+    max_entries=1, # role 0 holds every role, the other roles are derived from it
+    ttl=config.API_CONFIG.CACHE_TTL,
+    stale_ttl=config.API_CONFIG.CACHE_STALE_TTL,
+    negative_ttl=config.API_CONFIG.CACHE_NEGATIVE_TTL,
+    fallback_on=UPSTREAM_FAILURES
+)
 
-            if 'champion' in res.keys():
-                return res['champion']
+async def _download(path:str) -> bytes | None:
+    url = f"{config.API_CONFIG.BASE_URL}{path}" # first part of path is from vercel deployment, everything afer /v1 is for statsWR route
 
-            return None
-        except Exception as e:
-            print(e)
-            return None
+    response = await resilient_get(url, timeout=config.API_CONFIG.DEFAULT_TIMEOUT, headers=config.API_CONFIG.DEFAULT_HEADERS)
+    if response.status_code == 404: # unknown champion / role, cached as a negative result
+        return None
 
+    response.raise_for_status()
+    return response.content
+
+# raw bodies go through the shared cache (if one is configured) so only one worker process downloads each of them
+
+async def _fetch_all_data_for_single_champ_all_roles(champion_label:str) -> list[dict[str, Any]] | None:
+    payload = await shared_fetch("champion", champion_label, lambda: _download(f"/champions/{champion_label}"), config.API_CONFIG.CACHE_TTL)
+    if payload is None:
+        return None
+    res = loads(payload)
+
+    if 'champion' in res.keys():
+        return res['champion']
+
+    return None
+
+async def _fetch_role_snapshot() -> RoleSnapshot | None:
+    payload = await shared_fetch("role_snapshot", 0, lambda: _download("/champions/lanes/0"), config.API_CONFIG.CACHE_TTL)
+    if payload is None:
+        return None
+    res = loads(payload)
+
+    if 'champions' in res.keys() and res['champions']:
+        return RoleSnapshot(res['champions'])
+
+    return None
+
+async def _sync_champion_history(champion_label:str) -> ChampionHistory | None:
+    history = _history_store.get(champion_label)
+    if history is None:
+        history = await asyncio.to_thread(_history_store.load, champion_label)
+    if history is not None:
+        # the all-roles snapshot is one request shared by every champion and usually already cached
+        snapshot = await _snapshot_cache.get_or_fetch(0, _fetch_role_snapshot)
+        if snapshot is not None and history.apply_snapshot(snapshot.for_champion(champion_label)):
+            await _keep_history(champion_label, history)
+            return history
+
+    rows = await _fetch_all_data_for_single_champ_all_roles(champion_label)
+    if rows is None:
+        return None
+
+    history = ChampionHistory.from_rows(rows)
+    await _keep_history(champion_label, history)
+    return history
+
+async def _keep_history(champion_label:str, history:ChampionHistory) -> None:
+    _history_store.put(champion_label, history)
+    try:
+        await asyncio.to_thread(_history_store.save, champion_label, history.entries())
+    except sqlite3.Error as e:
+        # the in-memory copy still serves this process
+        logger.warning(f"Could not persist the history of {champion_label}: {e}")
+
+def history_store_stats() -> dict[str, Any]:
+    return _history_store.stats()
+
+# used by the prefetch scheduler, which must not count as demand itself
+
+def role_snapshot_expires_in() -> float | None:
+    return _snapshot_cache.expires_in(0)
+
+def refresh_role_snapshot() -> asyncio.Task:
+    return _snapshot_cache.refresh(0, _fetch_role_snapshot)
+
+def champion_history_expires_in(champion_label:str) -> float | None:
+    # unknown champions (cached None) are never worth refreshing
+    if _champion_cache.peek(champion_label) is None:
+        return None
+    return _champion_cache.expires_in(champion_label)
+
+def refresh_champion_history(champion_label:str) -> asyncio.Task:
+    return _champion_cache.refresh(champion_label, lambda: _sync_champion_history(champion_label))
+
+# None means the upstream has no data, upstream failures are raised (see api_requests.resilience) for the tools to report
+
+async def get_role_snapshot() -> RoleSnapshot | None:
+    record_access("role_snapshot", 0)
+    return await _snapshot_cache.get_or_fetch(0, _fetch_role_snapshot)
+
+async def get_champion_history(champion_label:str) -> ChampionHistory | None:
+    record_access("champion", champion_label)
+    return await _champion_cache.get_or_fetch(
+        champion_label,
+        lambda: _sync_champion_history(champion_label)
+    )
+
+async def get_all_data_for_single_champ_all_roles(champion_label:str, last_n:int | None = None, since:str | None = None) -> list[dict[str, Any]] | None:
+    history = await get_champion_history(champion_label)
+    if history is None:
+        return None
+
+    return history.entries(last_n, since)
 
 async def get_most_recent_data_for_all_champs_by_role(role:int = 0) -> list[dict[str, Any]] | None:
-    url = f"{config.API_CONFIG.BASE_URL}/champions/lanes/{role}"
+    snapshot = await get_role_snapshot()
+    if snapshot is None:
+        return None
+
+    return snapshot.for_role(role) or None
+
+async def get_most_recent_data_for_single_champ(champion_label:str) -> list[dict[str, Any]] | None:
+    snapshot = await get_role_snapshot()
+    if snapshot is None:
+        return None
+
+    return snapshot.for_champion(champion_label) or None
+
+async def get_all_data_for_multiple_champs_all_roles(champion_labels:list[str]) -> dict[str, list[dict[str, Any]] | None | Exception]:
+    # fetch every champion concurrently, at most BATCH_MAX_CONCURRENCY upstream requests at a time,
+    # a failed fetch is returned as its exception so it only affects that champion
+    semaphore = asyncio.Semaphore(config.API_CONFIG.BATCH_MAX_CONCURRENCY)
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url, timeout=config.API_CONFIG.DEFAULT_TIMEOUT, headers=config.API_CONFIG.DEFAULT_HEADERS)
-            response.raise_for_status()
-            res = response.json()
+    async def fetch(champion_label:str) -> list[dict[str, Any]] | None:
+        async with semaphore:
+            return await get_all_data_for_single_champ_all_roles(champion_label)
 
-            if 'champions' in res.keys():
-                return res['champions']
+    unique_labels = list(dict.fromkeys(champion_labels))
+    results = await asyncio.gather(*(fetch(label) for label in unique_labels), return_exceptions=True)
 
-            return None
-        except Exception as e:
-            print(e)
-            return None
+    return dict(zip(unique_labels, results))
 
 __all__ = [
+    "get_champion_history",
+    "history_store_stats",
+    "role_snapshot_expires_in",
+    "refresh_role_snapshot",
+    "champion_history_expires_in",
+    "refresh_champion_history",
     "get_all_data_for_single_champ_all_roles",
-    "get_most_recent_data_for_all_champs_by_role"
+    "get_all_data_for_multiple_champs_all_roles",
+    "get_most_recent_data_for_all_champs_by_role",
+    "get_most_recent_data_for_single_champ",
+    "get_role_snapshot"
 ]
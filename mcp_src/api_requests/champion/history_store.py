@@ -0,0 +1,382 @@
+# compact in-memory time series of every champion's per-role history, appended to from the all-roles snapshot and
+# persisted to SQLite so a restarted process (or a new Lambda container on the same /tmp) syncs incrementally too
+
+import json
+import math
+import logging
+import sqlite3
+import threading
+import statistics
+from array import array
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any
+from mcp_src.response_shaping.shaping import DATE_FIELDS, date_of, window_history
+from .snapshot import UnknownSchemaError, role_of
+
+logger = logging.getLogger(__name__)
+
+def _date_key(value:Any) -> str:
+    # ISO dates and datetimes compare correctly as strings once cut to the date part
+    return str(value)[:10]
+
+def _point_key(value:Any) -> str:
+    # full ISO timestamp, so several snapshots of one day stay distinct and in order
+    return str(value)
+
+def _key_like(value:Any, held:Any) -> str:
+    # compare at the precision of the history held: a timestamped snapshot row falls on its day in a daily history
+    return _date_key(value) if len(_point_key(held)) <= 10 else _point_key(value)
+
+def _seconds(value:Any) -> float | None:
+    try:
+        moment = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return moment.timestamp() if moment.tzinfo else (moment - datetime(1970, 1, 1)).total_seconds()
+
+def _is_number(value:Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+class RoleSeries:
+    """
+    One champion's history in one role, held column-wise: a float array per numeric stat and a list per other field,
+    all aligned with an oldest-first list of dates.
+
+    Remembers how the upstream laid the history out (a list of snapshot dicts under one key, or parallel lists
+    next to a list of dates) and rebuilds entries in that same layout.
+    """
+
+    __slots__ = ('meta', 'layout', 'history_key', 'date_field', 'dates', 'numeric', 'integers', 'other')
+
+    def __init__(self, meta:dict[str, Any], layout:str, history_key:str | None, date_field:str):
+        self.meta = meta
+        self.layout = layout # 'records' or 'columns'
+        self.history_key = history_key
+        self.date_field = date_field
+        self.dates: list[Any] = []
+        self.numeric: dict[str, array] = {}
+        self.integers: set[str] = set() # numeric fields that were ints upstream
+        self.other: dict[str, list[Any]] = {}
+
+    @classmethod
+    def from_entry(cls, entry:dict[str, Any]) -> "RoleSeries | None":
+        """Parse one role entry of a /champions/{label} response, None if its history layout isn't recognised"""
+        for key, value in entry.items():
+            if isinstance(value, list) and value and all(isinstance(item, dict) for item in value):
+                date_field = next((field for field in DATE_FIELDS if field in value[0]), None)
+                if date_field is None:
+                    continue
+                series = cls({k: v for k, v in entry.items() if k != key}, 'records', key, date_field)
+                fields = list(dict.fromkeys(field for item in value for field in item if field != date_field))
+                series._set_columns(fields, [item.get(date_field) for item in value], {field: [item.get(field) for item in value] for field in fields})
+                return series
+
+        date_field = next((field for field in DATE_FIELDS if isinstance(entry.get(field), list)), None)
+        if date_field is None:
+            return None
+        length = len(entry[date_field])
+        columns = {key: value for key, value in entry.items() if isinstance(value, list) and len(value) == length and key != date_field}
+        series = cls({k: v for k, v in entry.items() if k != date_field and k not in columns}, 'columns', None, date_field)
+        series._set_columns(list(columns), entry[date_field], columns)
+        return series
+
+    def _set_columns(self, fields:list[str], dates:list[Any], columns:dict[str, list[Any]]) -> None:
+        order = sorted(range(len(dates)), key=lambda i: _point_key(dates[i]))
+        self.dates = [dates[i] for i in order]
+        for field in fields:
+            values = [columns[field][i] for i in order]
+            if all(value is None or _is_number(value) for value in values) and any(value is not None for value in values):
+                self.numeric[field] = array('d', (math.nan if value is None else value for value in values))
+                if all(value is None or isinstance(value, int) for value in values):
+                    self.integers.add(field)
+            else:
+                self.other[field] = values
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @property
+    def role(self) -> int | None:
+        return role_of(self.meta)
+
+    @property
+    def last_key(self) -> str | None:
+        return _point_key(self.dates[-1]) if self.dates else None
+
+    def interval(self) -> float | None:
+        # typical spacing of recent snapshots in seconds, used to tell a next snapshot from a gap
+        moments = [_seconds(value) for value in self.dates[-8:]]
+        gaps = [b - a for a, b in zip(moments, moments[1:]) if a is not None and b is not None and b > a]
+        return statistics.median(gaps) if gaps else None
+
+    def row_date(self, row:dict[str, Any]) -> Any:
+        # snapshot rows may name their date differently from the history entries
+        if row.get(self.date_field) is not None:
+            return row[self.date_field]
+        return next((row[field] for field in DATE_FIELDS if row.get(field) is not None), None)
+
+    def differs_from_last(self, row:dict[str, Any]) -> bool:
+        """Whether a row holds other values than the newest snapshot, e.g. the upstream recomputed it"""
+        if not self.dates:
+            return True
+        for field in self.numeric:
+            point = row.get(field)
+            if field in row and (point if _is_number(point) else None) != self._value(field, len(self.dates) - 1):
+                return True
+        return any(field in row and row[field] != column[-1] for field, column in self.other.items())
+
+    def _overwrite_last(self, row:dict[str, Any]) -> None:
+        # the held date is kept, fields missing from the row keep their value
+        for field, column in self.numeric.items():
+            if field in row:
+                point = row[field]
+                column[-1] = point if _is_number(point) else math.nan
+                if isinstance(point, float):
+                    self.integers.discard(field)
+        for field, column in self.other.items():
+            if field in row:
+                column[-1] = row[field]
+
+    def append(self, row:dict[str, Any]) -> bool:
+        """
+        Add a snapshot row (one role of /champions/lanes/0) newer than the last timestamp held, or overwrite the newest
+        snapshot with a row of the same timestamp holding other values. Returns whether anything changed.
+        """
+        value = self.row_date(row)
+        if value is None:
+            return False
+
+        if self.dates:
+            key = _key_like(value, self.dates[-1])
+            if key == self.last_key:
+                if not self.differs_from_last(row):
+                    return False
+                self._overwrite_last(row)
+                return True
+            if key < self.last_key:
+                return False
+
+        self.dates.append(value)
+        for field, column in self.numeric.items():
+            point = row.get(field)
+            column.append(point if _is_number(point) else math.nan)
+            if isinstance(point, float):
+                self.integers.discard(field)
+        for field, column in self.other.items():
+            column.append(row.get(field))
+        return True
+
+    def _value(self, field:str, i:int) -> Any:
+        value = self.numeric[field][i]
+        if math.isnan(value):
+            return None
+        return int(value) if field in self.integers else value
+
+    def window(self, last_n:int | None = None, since:str | None = None) -> int:
+        """Index of the first snapshot kept by a last_n / since window"""
+        start = 0
+        if since:
+            since_date = date.fromisoformat(since)
+            start = next((i for i, value in enumerate(self.dates) if (day := date_of(value)) is not None and day >= since_date), len(self.dates))
+        if last_n is not None:
+            start = max(start, len(self.dates) - last_n)
+        return start
+
+    def to_entry(self, start:int = 0) -> dict[str, Any]:
+        indices = range(start, len(self.dates))
+        fields = list(self.numeric) + list(self.other)
+
+        def value(field:str, i:int) -> Any:
+            return self._value(field, i) if field in self.numeric else self.other[field][i]
+
+        if self.layout == 'records':
+            history = [{self.date_field: self.dates[i], **{field: value(field, i) for field in fields}} for i in indices]
+            return {**self.meta, self.history_key: history}
+
+        return {
+            **self.meta,
+            self.date_field: self.dates[start:],
+            **{field: [value(field, i) for i in indices] for field in fields}
+        }
+
+    def change(self, start:int) -> dict[str, Any] | None:
+        """First and last value of every numeric stat from start to the newest snapshot, and the difference"""
+        if start >= len(self.dates):
+            return None
+
+        end = len(self.dates) - 1
+        stats = {}
+        for field in self.numeric:
+            first, last = self._value(field, start), self._value(field, end)
+            stats[field] = {"from": first, "to": last, "change": None if first is None or last is None else last - first}
+        return {
+            **self.meta,
+            "from_date": self.dates[start],
+            "to_date": self.dates[end],
+            "snapshots": end - start + 1,
+            **stats
+        }
+
+    def nbytes(self) -> int:
+        return sum(column.itemsize * len(column) for column in self.numeric.values())
+
+class ChampionHistory:
+    """Every role's history of one champion; entries whose layout isn't recognised are kept as returned"""
+
+    def __init__(self, series:list[RoleSeries], raw:list[dict[str, Any]]):
+        self.series = series
+        self.raw = raw
+
+    @classmethod
+    def from_rows(cls, rows:list[dict[str, Any]]) -> "ChampionHistory":
+        series, raw = [], []
+        for entry in rows:
+            parsed = RoleSeries.from_entry(entry) if isinstance(entry, dict) else None
+            if parsed is None:
+                raw.append(entry)
+            else:
+                series.append(parsed)
+        if raw and not series:
+            # no role entry holds a history under any of DATE_FIELDS, windows and trends would all come back empty
+            sample = sorted(raw[0]) if isinstance(raw[0], dict) else type(raw[0]).__name__
+            logger.error(f"Unrecognised champion history layout, expected one of {DATE_FIELDS}, first entry: {sample}")
+            raise UnknownSchemaError(f"Unrecognised champion history response from statsWR: no entry holds any of {', '.join(DATE_FIELDS)}")
+        return cls(series, raw)
+
+    def apply_snapshot(self, rows:list[dict[str, Any]]) -> bool:
+        """
+        Append this champion's rows of the all-roles snapshot to their role series, or overwrite the newest snapshot
+        when the upstream recomputed it under the same timestamp.
+
+        Returns False when the full history has to be downloaded again instead: a role that isn't held yet,
+        an undated row, a snapshot more than one interval past the last one held (a missed snapshot),
+        or an unparsed entry.
+        """
+        if self.raw:
+            return False
+
+        by_role = {series.role: series for series in self.series}
+        pending = []
+        for row in rows:
+            series = by_role.get(role_of(row))
+            if series is None:
+                return False
+
+            value = series.row_date(row)
+            if value is None: # no way to tell whether the row is new
+                return False
+
+            key = _key_like(value, series.dates[-1]) if series.dates else _point_key(value)
+            if series.last_key is not None and key <= series.last_key:
+                if key == series.last_key and series.differs_from_last(row):
+                    pending.append((series, row))
+                continue
+
+            interval = series.interval()
+            last, new = _seconds(series.last_key or ''), _seconds(key)
+            if interval is None or last is None or new is None or new - last > 1.5 * interval:
+                return False
+            pending.append((series, row))
+
+        for series, row in pending:
+            series.append(row)
+        return True
+
+    def entries(self, last_n:int | None = None, since:str | None = None) -> list[dict[str, Any]]:
+        return [series.to_entry(series.window(last_n, since)) for series in self.series] + window_history(self.raw, last_n, since)
+
+    def changes(self, last_n:int | None = None, since:str | None = None) -> list[dict[str, Any]]:
+        changes = (series.change(series.window(last_n, since)) for series in self.series)
+        return [change for change in changes if change is not None]
+
+    def points(self) -> int:
+        return sum(len(series) for series in self.series)
+
+    def nbytes(self) -> int:
+        return sum(series.nbytes() for series in self.series)
+
+class HistoryStore:
+    """
+    ChampionHistory per champion label, least recently used evicted past max_entries, backed by a SQLite file at path
+    (memory only without one).
+
+    get / put only touch memory; load / save block on SQLite and are run with asyncio.to_thread by async callers.
+    """
+
+    def __init__(self, max_entries:int, path:str | None = None):
+        self.max_entries = max_entries
+        self.path = path
+        self._histories: OrderedDict[str, ChampionHistory] = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    def get(self, champion_label:str) -> ChampionHistory | None:
+        history = self._histories.get(champion_label)
+        if history is not None:
+            self._histories.move_to_end(champion_label)
+        return history
+
+    def put(self, champion_label:str, history:ChampionHistory) -> None:
+        self._histories[champion_label] = history
+        self._histories.move_to_end(champion_label)
+        while len(self._histories) > self.max_entries:
+            self._histories.popitem(last=False)
+
+    def _connect(self) -> sqlite3.Connection:
+        # opened on first use, from the thread running load / save rather than the event loop
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS histories ("
+                "label TEXT PRIMARY KEY, "
+                "data TEXT NOT NULL)"
+            )
+        return self._connection
+
+    def load(self, champion_label:str) -> ChampionHistory | None:
+        """The persisted history of a champion, None if there is none (or no file to read it from)"""
+        if not self.path:
+            return None
+        with self._lock:
+            row = self._connect().execute("SELECT data FROM histories WHERE label = ?", (champion_label,)).fetchone()
+        if row is None:
+            return None
+        try:
+            return ChampionHistory.from_rows(json.loads(row[0]))
+        except ValueError as e:
+            logger.warning(f"Discarding the persisted history of {champion_label}: {e}")
+            return None
+
+    def save(self, champion_label:str, rows:list[dict[str, Any]]) -> None:
+        """Persist a history as returned by ChampionHistory.entries() (taken on the event loop, it is mutated there)"""
+        if not self.path:
+            return
+        data = json.dumps(rows, separators=(',', ':'))
+        with self._lock:
+            self._connect().execute("INSERT OR REPLACE INTO histories (label, data) VALUES (?, ?)", (champion_label, data))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def __len__(self) -> int:
+        return len(self._histories)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "champions": len(self._histories),
+            "snapshots": sum(history.points() for history in self._histories.values()),
+            "stat_bytes": sum(history.nbytes() for history in self._histories.values()),
+            "path": self.path or None
+        }
+
+__all__ = [
+    "RoleSeries",
+    "ChampionHistory",
+    "HistoryStore"
+]
@@ -0,0 +1,111 @@
+# all-roles snapshot of the latest champion data, indexed locally by role and by champion
+
+import re
+import logging
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+ROLES = (1, 2, 3, 4, 5)
+
+# canonical stat name -> keys the statsWR rows may use for it
+STAT_FIELDS = {
+    'win_rate': ('win_rate', 'winRate', 'win'),
+    'pick_rate': ('pick_rate', 'pickRate', 'pick'),
+    'ban_rate': ('ban_rate', 'banRate', 'ban')
+}
+
+# the statsWR rows identify the champion under one of these keys
+CHAMPION_LABEL_FIELDS = ('label', 'champion_label', 'championLabel', 'name')
+
+class UnknownSchemaError(ValueError):
+    """An upstream response holding none of the field names the parsers know"""
+
+def require_fields(rows:list[Any], fields:tuple[str, ...], source:str) -> None:
+    """
+    Raise UnknownSchemaError when rows aren't empty but none of them holds any of fields.
+
+    The statsWR field names aren't documented, so the parsers accept every name seen for a field; a response matching
+    none of them means the schema changed and must fail loudly instead of answering with empty results.
+    """
+    dicts = [row for row in rows if isinstance(row, dict)]
+    if not rows or any(field in row for row in dicts for field in fields):
+        return
+    sample = sorted(dicts[0]) if dicts else type(rows[0]).__name__
+    logger.error(f"Unrecognised {source} response, expected one of {fields} in its rows, first row: {sample}")
+    raise UnknownSchemaError(f"Unrecognised {source} response from statsWR: its rows hold none of {', '.join(fields)}")
+
+def champion_label_of(row:dict[str, Any]) -> str | None:
+    for field in CHAMPION_LABEL_FIELDS:
+        value = row.get(field)
+        if isinstance(value, str) and value:
+            return value.upper()
+    return None
+
+def to_label(name:str) -> str:
+    # "Master Yi" -> "MASTER_YI", "Kai'Sa" -> "KAISA", for payloads that hold display names instead of labels
+    return re.sub(r'[^A-Z0-9]+', '_', name.upper().replace("'", "").replace(".", "")).strip('_')
+
+def rows_of(payload:Any, key:str) -> list[Any]:
+    # accept a bare list or a list under the resource name / 'data'
+    if isinstance(payload, list):
+        return payload
+    if isinstance(payload, dict):
+        for candidate in (key, 'data'):
+            if isinstance(payload.get(candidate), list):
+                return payload[candidate]
+    found = sorted(payload) if isinstance(payload, dict) else type(payload).__name__
+    logger.error(f"Unrecognised {key} response, expected a list or a list under '{key}' / 'data', got: {found}")
+    raise UnknownSchemaError(f"Unrecognised {key} response from statsWR: no list of {key} found")
+
+def role_of(row:dict[str, Any]) -> int | None:
+    try:
+        return int(row.get('role'))
+    except (TypeError, ValueError):
+        return None
+
+class RoleSnapshot:
+    """
+    Latest row of every champion in every role, as returned by /champions/lanes/0.
+
+    Role 1-5 views and per-champion views are built once per snapshot so they never need another upstream call.
+    """
+
+    def __init__(self, rows:list[dict[str, Any]]):
+        require_fields(rows, CHAMPION_LABEL_FIELDS, "role snapshot")
+        require_fields(rows, ('role',), "role snapshot")
+        require_fields(rows, tuple(field for fields in STAT_FIELDS.values() for field in fields), "role snapshot")
+        self.rows = rows
+        self.by_role: dict[int, list[dict[str, Any]]] = {role: [] for role in ROLES}
+        self.by_champion: dict[str, list[dict[str, Any]]] = {}
+
+        for row in rows:
+            role = role_of(row)
+            if role in self.by_role:
+                self.by_role[role].append(row)
+
+            label = champion_label_of(row)
+            if label is not None:
+                self.by_champion.setdefault(label, []).append(row)
+
+    def for_role(self, role:int) -> list[dict[str, Any]]:
+        if role == 0:
+            return self.rows
+        return self.by_role.get(role, [])
+
+    def for_champion(self, champion_label:str) -> list[dict[str, Any]]:
+        return self.by_champion.get(champion_label.upper(), [])
+
+    def champion_labels(self) -> list[str]:
+        return list(self.by_champion)
+
+__all__ = [
+    "STAT_FIELDS",
+    "UnknownSchemaError",
+    "RoleSnapshot",
+    "require_fields",
+    "champion_label_of",
+    "to_label",
+    "rows_of",
+    "role_of"
+]
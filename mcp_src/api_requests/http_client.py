@@ -0,0 +1,91 @@
+# process-wide pooled httpx client shared by all upstream requests
+
+import logging
+import httpx
+from mcp_src.mcp_configs import config
+from mcp_src.observability.instrumentation import InstrumentedTransport
+
+logger = logging.getLogger(__name__)
+
+_client: httpx.AsyncClient | None = None
+_pools: dict[str, httpx.AsyncHTTPTransport] = {} # pool name ("default" or host) -> transport, for stats
+
+def _http2_enabled() -> bool:
+    if not config.API_CONFIG.HTTP2:
+        return False
+    try:
+        import h2  # noqa: F401 -- httpx needs the optional h2 package for HTTP/2
+    except ImportError:
+        logger.warning("HTTP2 is enabled but the 'h2' package is not installed, falling back to HTTP/1.1")
+        return False
+    return True
+
+def _build_transport(max_connections:int, http2:bool) -> httpx.AsyncHTTPTransport:
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=min(max_connections, config.API_CONFIG.MAX_KEEPALIVE_CONNECTIONS),
+        keepalive_expiry=config.API_CONFIG.KEEPALIVE_EXPIRY
+    )
+    return httpx.AsyncHTTPTransport(http2=http2, limits=limits)
+
+def _build_client() -> httpx.AsyncClient:
+    http2 = _http2_enabled()
+
+    _pools.clear()
+    _pools["default"] = _build_transport(config.API_CONFIG.MAX_CONNECTIONS, http2)
+    for host, max_connections in config.API_CONFIG.HOST_POOL_LIMITS.items():
+        _pools[host] = _build_transport(max_connections, http2)
+
+    return httpx.AsyncClient(
+        transport=InstrumentedTransport(_pools["default"]),
+        mounts={f"all://{host}": InstrumentedTransport(_pools[host]) for host in config.API_CONFIG.HOST_POOL_LIMITS},
+        timeout=config.API_CONFIG.DEFAULT_TIMEOUT
+    )
+
+def pool_stats() -> list[dict[str, int | str]]:
+    # reads httpcore's pool state, which httpx doesn't expose publicly
+    stats = []
+    for name, transport in _pools.items():
+        pool = getattr(transport, "_pool", None)
+        connections = list(getattr(pool, "connections", []))
+        stats.append({
+            "pool": name,
+            "connections": len(connections),
+            "idle_connections": sum(1 for connection in connections if connection.is_idle()),
+            "requests": len(getattr(pool, "_requests", []))
+        })
+    return stats
+
+async def start_http_client() -> httpx.AsyncClient:
+    global _client
+
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+        logger.info("Started shared HTTP client")
+
+    return _client
+
+def get_http_client() -> httpx.AsyncClient:
+    # lazily create the client for entry points that never ran start_http_client (e.g. stdio transport)
+    global _client
+
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+
+    return _client
+
+async def close_http_client() -> None:
+    global _client
+
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+        logger.info("Closed shared HTTP client")
+
+    _client = None
+
+__all__ = [
+    "start_http_client",
+    "get_http_client",
+    "close_http_client",
+    "pool_stats"
+]
@@ -0,0 +1,229 @@
+# resilient GETs for both upstreams: adaptive timeouts, retries with jitter, hedged requests and a circuit breaker per host
+
+import time
+import random
+import asyncio
+import logging
+from collections import deque
+from typing import Any
+import httpx
+from mcp_src.mcp_configs import config
+from mcp_src.observability.metrics import counter, gauge
+from mcp_src.observability.instrumentation import endpoint_template
+from .http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+# responses worth another attempt, anything else (including 404 and 304) is returned to the caller as-is
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+UPSTREAM_RETRIES = counter("statswr_upstream_retries_total", "Upstream GETs retried after a failed attempt", ("host", "endpoint"))
+UPSTREAM_HEDGES = counter("statswr_upstream_hedged_total", "Second requests sent after an attempt ran past the hedge delay", ("host", "endpoint"))
+
+class UpstreamUnavailableError(ConnectionError):
+    """An upstream could not be reached after every retry"""
+
+class CircuitOpenError(UpstreamUnavailableError):
+    """An upstream failed too often recently and is not being called until its circuit closes again"""
+
+class UpstreamTimeoutError(httpx.TimeoutException):
+    """An attempt ran past its adaptive deadline"""
+
+# errors callers may answer from an older cached value instead
+UPSTREAM_FAILURES = (httpx.HTTPError, UpstreamUnavailableError)
+
+class LatencyTracker:
+    """Durations of the most recent successful requests to one endpoint"""
+
+    def __init__(self, window:int):
+        self.samples: deque[float] = deque(maxlen=window)
+        self.ceiling = config.API_CONFIG.DEFAULT_TIMEOUT # configured timeout of the last request, for reporting
+
+    def observe(self, seconds:float) -> None:
+        self.samples.append(seconds)
+
+    def quantile(self, q:float) -> float | None:
+        if len(self.samples) < config.API_CONFIG.LATENCY_MIN_SAMPLES:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def timeout(self, ceiling:float | None = None) -> float:
+        # a multiple of p99 so a healthy-but-slow response still fits, never above the configured timeout
+        ceiling = self.ceiling if ceiling is None else ceiling
+        p99 = self.quantile(0.99)
+        if p99 is None:
+            return ceiling
+        return min(ceiling, max(config.API_CONFIG.ADAPTIVE_TIMEOUT_MIN, p99 * config.API_CONFIG.ADAPTIVE_TIMEOUT_MULTIPLIER))
+
+    def hedge_delay(self) -> float | None:
+        p95 = self.quantile(0.95)
+        if p95 is None:
+            return None
+        return max(config.API_CONFIG.HEDGE_MIN_DELAY, p95)
+
+class CircuitBreaker:
+    """
+    Opens after CIRCUIT_FAILURE_THRESHOLD consecutive failures to one host.
+
+    While open every request fails fast with CircuitOpenError; after CIRCUIT_RESET_TIMEOUT a single probe is let
+    through (half-open) and its outcome closes or reopens the circuit.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, host:str):
+        self.host = host
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_started: float | None = None
+
+    def before_request(self) -> None:
+        if self.state == self.CLOSED:
+            return
+
+        now = time.monotonic()
+        if self.state == self.OPEN and now - self.opened_at >= config.API_CONFIG.CIRCUIT_RESET_TIMEOUT:
+            self.state = self.HALF_OPEN
+            self._probe_started = None
+
+        # a probe that never reported back (e.g. its caller was cancelled) is replaced after another reset timeout
+        if self.state == self.HALF_OPEN and (self._probe_started is None or now - self._probe_started >= config.API_CONFIG.CIRCUIT_RESET_TIMEOUT):
+            self._probe_started = now
+            return
+
+        raise CircuitOpenError(f"{self.host} is unavailable, not retrying for up to {config.API_CONFIG.CIRCUIT_RESET_TIMEOUT:g}s")
+
+    def record_success(self) -> None:
+        if self.state != self.CLOSED:
+            logger.info(f"Circuit for {self.host} closed")
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probe_started = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= config.API_CONFIG.CIRCUIT_FAILURE_THRESHOLD:
+            if self.state != self.OPEN:
+                logger.warning(f"Circuit for {self.host} opened after {self.failures} consecutive failures")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self._probe_started = None
+
+    def stats(self) -> dict[str, Any]:
+        return {"host": self.host, "state": self.state, "consecutive_failures": self.failures}
+
+_trackers: dict[tuple[str, str], LatencyTracker] = {}
+_breakers: dict[str, CircuitBreaker] = {}
+
+def _tracker(host:str, endpoint:str) -> LatencyTracker:
+    tracker = _trackers.get((host, endpoint))
+    if tracker is None:
+        tracker = _trackers[(host, endpoint)] = LatencyTracker(config.API_CONFIG.LATENCY_WINDOW)
+    return tracker
+
+def _breaker(host:str) -> CircuitBreaker:
+    breaker = _breakers.get(host)
+    if breaker is None:
+        breaker = _breakers[host] = CircuitBreaker(host)
+    return breaker
+
+def _circuit_samples() -> dict[tuple[str, ...], float]:
+    return {(breaker.host,): float(breaker.state != CircuitBreaker.CLOSED) for breaker in _breakers.values()}
+
+gauge("statswr_upstream_circuit_open", "1 while an upstream's circuit is open or half-open", ("host",), collect=_circuit_samples)
+
+def resilience_stats() -> dict[str, Any]:
+    return {
+        "circuits": [breaker.stats() for breaker in _breakers.values()],
+        "timeouts_s": {
+            f"{host}{endpoint}": round(tracker.timeout(), 3)
+            for (host, endpoint), tracker in _trackers.items()
+        }
+    }
+
+def _backoff(attempt:int) -> float:
+    # full jitter, so clients that failed together don't retry together
+    return random.uniform(0, min(config.API_CONFIG.RETRY_BACKOFF_MAX, config.API_CONFIG.RETRY_BACKOFF_BASE * 2 ** attempt))
+
+async def _attempt(url:str, timeout:float, hedge_delay:float | None, host:str, endpoint:str, kwargs:dict[str, Any]) -> httpx.Response:
+    """One attempt, with a second identical request raced against the first once it runs past hedge_delay"""
+    client = get_http_client()
+    deadline = time.monotonic() + timeout
+    pending = {asyncio.create_task(client.get(url, timeout=timeout, **kwargs))}
+    error: BaseException | None = None
+
+    try:
+        if hedge_delay is not None and hedge_delay < timeout:
+            done, _ = await asyncio.wait(pending, timeout=hedge_delay)
+            if not done:
+                UPSTREAM_HEDGES.inc(host=host, endpoint=endpoint)
+                pending.add(asyncio.create_task(client.get(url, timeout=timeout, **kwargs)))
+
+        while pending:
+            done, pending = await asyncio.wait(pending, timeout=max(0, deadline - time.monotonic()), return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                raise UpstreamTimeoutError(f"{host}{endpoint} took longer than {timeout:.2f}s")
+            winners = [task for task in done if task.exception() is None]
+            if winners:
+                return winners[0].result()
+            error = next(iter(done)).exception()
+
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+async def resilient_get(url:str, timeout:float, **kwargs:Any) -> httpx.Response:
+    """
+    GET through the shared client with an adaptive timeout (capped at timeout), UPSTREAM_RETRIES retries with jittered
+    backoff for transport errors and retryable statuses, an optional hedged request and the host's circuit breaker.
+
+    Raises CircuitOpenError while the host's circuit is open, UpstreamUnavailableError when every attempt failed to connect
+    and httpx.TimeoutException when every attempt timed out. A retryable status on the last attempt is returned for
+    the caller to raise_for_status.
+    """
+    request_url = httpx.URL(url)
+    host, endpoint = request_url.netloc.decode(), endpoint_template(request_url.path)
+    tracker, breaker = _tracker(host, endpoint), _breaker(host)
+    tracker.ceiling = timeout
+    retries = config.API_CONFIG.UPSTREAM_RETRIES
+
+    for attempt in range(retries + 1):
+        breaker.before_request()
+
+        attempt_timeout = tracker.timeout(timeout)
+        hedge_delay = tracker.hedge_delay() if config.API_CONFIG.HEDGE_REQUESTS else None
+        started = time.monotonic()
+        try:
+            response = await _attempt(url, attempt_timeout, hedge_delay, host, endpoint, kwargs)
+        except httpx.TransportError as e:
+            breaker.record_failure()
+            if attempt == retries:
+                if isinstance(e, httpx.TimeoutException):
+                    raise
+                raise UpstreamUnavailableError(f"{host} could not be reached: {e}") from e
+            logger.info(f"Retrying {host}{endpoint} after {type(e).__name__}")
+        else:
+            if response.status_code not in RETRYABLE_STATUSES:
+                breaker.record_success()
+                tracker.observe(time.monotonic() - started)
+                return response
+
+            breaker.record_failure()
+            if attempt == retries:
+                return response
+            logger.info(f"Retrying {host}{endpoint} after HTTP {response.status_code}")
+
+        UPSTREAM_RETRIES.inc(host=host, endpoint=endpoint)
+        await asyncio.sleep(_backoff(attempt))
+
+__all__ = [
+    "UpstreamUnavailableError",
+    "CircuitOpenError",
+    "UpstreamTimeoutError",
+    "UPSTREAM_FAILURES",
+    "resilient_get",
+    "resilience_stats"
+]
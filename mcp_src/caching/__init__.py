@@ -0,0 +1,17 @@
+from .async_cache import *
+from .access_tracker import *
+from .shared_store import *
+
+__all__ = [
+    "AsyncTTLCache",
+    "all_caches",
+    "AccessTracker",
+    "record_access",
+    "access_tracker",
+    "SharedStore",
+    "MmapFileStore",
+    "RedisStore",
+    "shared_fetch",
+    "shared_store_stats",
+    "close_shared_store"
+]
@@ -0,0 +1,60 @@
+# exponentially decayed request counts per data key, used to decide what is worth prefetching
+
+import time
+from typing import Hashable
+from mcp_src.mcp_configs import config
+
+AccessKey = tuple[str, Hashable] # (kind, key), e.g. ("champion", "MASTER_YI") or ("matchups", "dr-mundo")
+
+class AccessTracker:
+    """
+    Request frequency per key, where each access counts 1 and halves in weight every half_life seconds.
+
+    Only the max_keys most frequent keys are kept, so a long tail of one-off names can't grow it without bound.
+    """
+
+    def __init__(self, half_life:float, max_keys:int):
+        self.half_life = half_life
+        self.max_keys = max_keys
+        self._scores: dict[AccessKey, tuple[float, float]] = {} # key -> (score, time it was last decayed to)
+
+    def _decayed(self, score:float, since:float, now:float) -> float:
+        return score * 0.5 ** ((now - since) / self.half_life)
+
+    def record(self, kind:str, key:Hashable) -> None:
+        now = time.monotonic()
+        score, since = self._scores.get((kind, key), (0.0, now))
+        self._scores[(kind, key)] = (self._decayed(score, since, now) + 1, now)
+
+        # prune in batches so recording stays O(1) amortised
+        if len(self._scores) > self.max_keys * 1.25:
+            for key_to_drop, _ in self.hottest()[self.max_keys:]:
+                del self._scores[key_to_drop]
+
+    def score(self, kind:str, key:Hashable) -> float:
+        score, since = self._scores.get((kind, key), (0.0, time.monotonic()))
+        return self._decayed(score, since, time.monotonic())
+
+    def hottest(self, n:int | None = None, min_score:float = 0) -> list[tuple[AccessKey, float]]:
+        """(key, current score) pairs, most requested first"""
+        now = time.monotonic()
+        scored = [(key, self._decayed(score, since, now)) for key, (score, since) in self._scores.items()]
+        scored = sorted((entry for entry in scored if entry[1] >= min_score), key=lambda entry: entry[1], reverse=True)
+        return scored if n is None else scored[:n]
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+_tracker = AccessTracker(config.API_CONFIG.PREFETCH_HALF_LIFE, config.API_CONFIG.PREFETCH_MAX_TRACKED)
+
+def record_access(kind:str, key:Hashable) -> None:
+    _tracker.record(kind, key)
+
+def access_tracker() -> AccessTracker:
+    return _tracker
+
+__all__ = [
+    "AccessTracker",
+    "record_access",
+    "access_tracker"
+]
@@ -0,0 +1,158 @@
+# in-process async cache: size-bounded LRU with TTL, stale-while-revalidate and single-flight fetches
+
+import time
+import asyncio
+import logging
+import weakref
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+_caches: "weakref.WeakSet[AsyncTTLCache]" = weakref.WeakSet()
+
+def all_caches() -> list["AsyncTTLCache"]:
+    # every live cache, for metrics and health reporting
+    return sorted(_caches, key=lambda cache: cache.name)
+
+class _CacheEntry:
+    __slots__ = ("value", "fresh_until", "stale_until")
+
+    def __init__(self, value:Any, fresh_until:float, stale_until:float):
+        self.value = value
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+
+class AsyncTTLCache:
+    """
+    LRU cache for coroutine results.
+
+    - fresh entries (younger than ttl) are returned directly
+    - stale entries (younger than ttl + stale_ttl) are returned immediately while one background refresh runs
+    - None results are cached for negative_ttl only and are never served stale
+    - concurrent misses for the same key share one in-flight fetch; fetch errors are propagated and never cached
+    - if the fetch raises one of fallback_on, an expired value still held for the key is returned instead
+    """
+
+    def __init__(self, name:str, max_entries:int, ttl:float, stale_ttl:float = 0, negative_ttl:float = 0, fallback_on:tuple[type[BaseException], ...] = ()):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self.fallback_on = fallback_on
+
+        self._entries: OrderedDict[Hashable, _CacheEntry] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.fallback_hits = 0
+
+        _caches.add(self)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get_or_fetch(self, key:Hashable, fetch:Callable[[], Awaitable[Any]]) -> Any:
+        now = time.monotonic()
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            if now < entry.fresh_until:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry.value
+
+            if now < entry.stale_until:
+                self.stale_hits += 1
+                self._entries.move_to_end(key)
+                self._start_fetch(key, fetch, background=True)
+                return entry.value
+
+        self.misses += 1
+        try:
+            # shield so a cancelled caller doesn't cancel the fetch other callers are waiting on
+            return await asyncio.shield(self._start_fetch(key, fetch))
+        except self.fallback_on as e:
+            if entry is None or entry.value is None:
+                raise
+            self.fallback_hits += 1
+            logger.warning(f"Serving expired {self.name}[{key!r}] after a failed fetch: {e}")
+            return entry.value
+
+    def peek(self, key:Hashable) -> Any:
+        # value currently held for key (fresh or stale) without fetching, None if absent or expired
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() >= max(entry.fresh_until, entry.stale_until):
+            return None
+        return entry.value
+
+    def expires_in(self, key:Hashable) -> float | None:
+        # seconds until the value held for key stops being fresh (negative once stale), None if nothing is held
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return entry.fresh_until - time.monotonic()
+
+    def refresh(self, key:Hashable, fetch:Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        # fetch and store a new value now, sharing the fetch with any caller already waiting on this key
+        return self._start_fetch(key, fetch)
+
+    def set(self, key:Hashable, value:Any) -> None:
+        now = time.monotonic()
+        if value is None:
+            entry = _CacheEntry(None, now + self.negative_ttl, now + self.negative_ttl)
+        else:
+            entry = _CacheEntry(value, now + self.ttl, now + self.ttl + self.stale_ttl)
+
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key:Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "fallback_hits": self.fallback_hits,
+            "inflight": len(self._inflight)
+        }
+
+    def _start_fetch(self, key:Hashable, fetch:Callable[[], Awaitable[Any]], background:bool = False) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._run_fetch(key, fetch))
+            self._inflight[key] = task
+            if background:
+                task.add_done_callback(lambda t: self._log_background_failure(key, t))
+        return task
+
+    async def _run_fetch(self, key:Hashable, fetch:Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await fetch()
+            self.set(key, value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def _log_background_failure(self, key:Hashable, task:asyncio.Task) -> None:
+        # the stale value stays in place, the next stale hit retries the refresh
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Background refresh of {self.name}[{key!r}] failed: {task.exception()}")
+
+__all__ = [
+    "AsyncTTLCache",
+    "all_caches"
+]
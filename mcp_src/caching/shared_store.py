@@ -0,0 +1,330 @@
+# optional cache shared by every worker process on a host (memory-mapped files) or a deployment (Redis-compatible server)
+
+import os
+import re
+import mmap
+import time
+import uuid
+import struct
+import asyncio
+import logging
+import tempfile
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Hashable
+from mcp_src.mcp_configs import config
+from mcp_src.observability.metrics import counter
+
+try:
+    import fcntl
+except ImportError: # no advisory file locks, every process refreshes on its own
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+SHARED_READS = counter("statswr_shared_cache_reads_total", "Shared cache lookups by result", ("kind", "result"))
+SHARED_ERRORS = counter("statswr_shared_cache_errors_total", "Shared cache operations that failed and fell back to the upstream", ("kind", "operation"))
+
+Payload = bytes | memoryview
+
+class SharedEntry:
+    __slots__ = ("payload", "written_at")
+
+    def __init__(self, payload:Payload, written_at:float):
+        self.payload = payload # raw upstream response body
+        self.written_at = written_at # wall clock, comparable across processes
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.written_at
+
+class SharedStore(ABC):
+    """
+    Raw upstream payloads by name, readable by every worker process.
+
+    acquire / release guard the refresh of a name so only one process at a time downloads it; a lock left by a
+    crashed process must expire on its own.
+    """
+
+    backend = ""
+
+    @abstractmethod
+    async def read(self, name:str) -> SharedEntry | None:
+        ...
+
+    @abstractmethod
+    async def write(self, name:str, payload:bytes) -> None:
+        ...
+
+    @abstractmethod
+    async def acquire(self, name:str) -> bool:
+        ...
+
+    @abstractmethod
+    async def release(self, name:str) -> None:
+        ...
+
+    async def close(self) -> None:
+        pass
+
+    def stats(self) -> dict[str, Any]:
+        return {"backend": self.backend}
+
+class MmapFileStore(SharedStore):
+    """
+    One file per name: a 16 byte header (magic, write time) followed by the payload.
+
+    Files are written to a temporary file and renamed over the old one, so readers see either the old or the new
+    snapshot, never a partial one. Readers map the file read-only and hand out views of the mapping, so every worker
+    shares the same page cache copy; a file is mapped again only once it has been replaced.
+    """
+
+    backend = "mmap"
+    MAGIC = b"SWRSNAP1"
+    HEADER = struct.Struct("<8sd")
+
+    def __init__(self, directory:str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._maps: dict[str, tuple[tuple[int, int], SharedEntry]] = {} # name -> ((inode, mtime), entry)
+        self._locks: dict[str, int] = {} # name -> fd holding the flock
+
+    def _path(self, name:str, suffix:str = ".snap") -> str:
+        return os.path.join(self.directory, re.sub(r'[^A-Za-z0-9_.-]+', '_', name) + suffix)
+
+    def _map(self, path:str) -> SharedEntry | None:
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size < self.HEADER.size:
+                return None
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, written_at = self.HEADER.unpack_from(mapping)
+        if magic != self.MAGIC:
+            return None
+        return SharedEntry(memoryview(mapping)[self.HEADER.size:], written_at)
+
+    async def read(self, name:str) -> SharedEntry | None:
+        path = self._path(name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+
+        version = (stat.st_ino, stat.st_mtime_ns)
+        held = self._maps.get(name)
+        if held is not None and held[0] == version:
+            return held[1]
+
+        # replaced since it was last mapped, the old mapping is released once no view of it is left
+        entry = self._map(path)
+        if entry is None:
+            self._maps.pop(name, None)
+            return None
+        self._maps[name] = (version, entry)
+        return entry
+
+    async def write(self, name:str, payload:bytes) -> None:
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(self.HEADER.pack(self.MAGIC, time.time()))
+                file.write(payload) # no fsync, a cache doesn't need to survive a crash of the host
+            os.replace(temp_path, self._path(name))
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+    async def acquire(self, name:str) -> bool:
+        if fcntl is None:
+            return True
+        if name in self._locks:
+            return False
+
+        fd = os.open(self._path(name, ".lock"), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            # the kernel drops the lock if this process dies, so it never outlives its holder
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._locks[name] = fd
+        return True
+
+    async def release(self, name:str) -> None:
+        fd = self._locks.pop(name, None)
+        if fd is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def stats(self) -> dict[str, Any]:
+        return {"backend": self.backend, "directory": self.directory, "mapped": len(self._maps)}
+
+class RedisStore(SharedStore):
+    """Payloads in Redis (or any server speaking its protocol), one hash per name and a SET NX lock with a timeout"""
+
+    backend = "redis"
+
+    # delete the lock only if this process still holds it, it may have expired and been taken over
+    _RELEASE_SCRIPT = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+
+    def __init__(self, client:Any, lock_timeout:float, prefix:str = "statswr:"):
+        self._client = client
+        self.lock_timeout = lock_timeout
+        self.prefix = prefix
+        self._tokens: dict[str, str] = {}
+
+    async def read(self, name:str) -> SharedEntry | None:
+        payload, written_at = await self._client.hmget(self.prefix + name, "payload", "written_at")
+        if payload is None or written_at is None:
+            return None
+        return SharedEntry(payload, float(written_at))
+
+    async def write(self, name:str, payload:bytes) -> None:
+        await self._client.hset(self.prefix + name, mapping={"payload": payload, "written_at": repr(time.time())})
+
+    async def acquire(self, name:str) -> bool:
+        token = uuid.uuid4().hex
+        if not await self._client.set(f"{self.prefix}{name}:lock", token, nx=True, px=int(self.lock_timeout * 1000)):
+            return False
+        self._tokens[name] = token
+        return True
+
+    async def release(self, name:str) -> None:
+        token = self._tokens.pop(name, None)
+        if token is not None:
+            await self._client.eval(self._RELEASE_SCRIPT, 1, f"{self.prefix}{name}:lock", token)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+    def stats(self) -> dict[str, Any]:
+        return {"backend": self.backend, "locks_held": len(self._tokens)}
+
+_store: SharedStore | None = None
+_store_built = False
+
+def _build_store() -> SharedStore | None:
+    backend = config.API_CONFIG.SHARED_CACHE.lower()
+    if backend in ("", "none", "false"):
+        return None
+
+    if backend == "mmap":
+        return MmapFileStore(config.API_CONFIG.SHARED_CACHE_DIR)
+
+    if backend == "redis":
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            logger.warning("SHARED_CACHE is 'redis' but the 'redis' package is not installed, each process keeps its own cache")
+            return None
+        return RedisStore(redis.from_url(config.API_CONFIG.SHARED_CACHE_URL), config.API_CONFIG.SHARED_CACHE_LOCK_TIMEOUT)
+
+    logger.warning(f"Unknown SHARED_CACHE backend '{backend}', each process keeps its own cache")
+    return None
+
+def shared_store() -> SharedStore | None:
+    global _store, _store_built
+
+    if not _store_built:
+        _store_built = True
+        try:
+            _store = _build_store()
+        except Exception as e:
+            logger.warning(f"Shared cache unavailable, each process keeps its own cache: {e}")
+            _store = None
+        if _store is not None:
+            logger.info(f"Using the {_store.backend} shared cache")
+
+    return _store
+
+async def close_shared_store() -> None:
+    global _store, _store_built
+
+    if _store is not None:
+        await _store.close()
+    _store = None
+    _store_built = False
+
+async def _read(store:SharedStore, kind:str, name:str) -> SharedEntry | None:
+    try:
+        return await store.read(name)
+    except Exception as e:
+        SHARED_ERRORS.inc(kind=kind, operation="read")
+        logger.warning(f"Shared cache read of {name} failed: {e}")
+        return None
+
+async def shared_fetch(kind:str, key:Hashable, fetch:Callable[[], Awaitable[bytes | None]], max_age:float) -> Payload | None:
+    """
+    Payload for kind / key from the shared cache if another process stored it less than max_age seconds ago,
+    otherwise from fetch, stored for the other processes.
+
+    Only the process holding the refresh lock calls fetch; the others serve the payload held until it is replaced,
+    or wait up to SHARED_CACHE_WAIT seconds for the first one. None results are not shared. Without a shared cache,
+    or when it fails, fetch is called directly.
+    """
+    store = shared_store()
+    if store is None:
+        return await fetch()
+
+    name = f"{kind}:{key}"
+    entry = await _read(store, kind, name)
+    if entry is not None and entry.age < max_age:
+        SHARED_READS.inc(kind=kind, result="hit")
+        return entry.payload
+
+    try:
+        locked = await store.acquire(name)
+    except Exception as e:
+        SHARED_ERRORS.inc(kind=kind, operation="lock")
+        logger.warning(f"Shared cache lock of {name} failed: {e}")
+        return await fetch()
+
+    if locked:
+        SHARED_READS.inc(kind=kind, result="miss")
+        try:
+            payload = await fetch()
+            if payload is not None:
+                try:
+                    await store.write(name, payload)
+                except Exception as e:
+                    SHARED_ERRORS.inc(kind=kind, operation="write")
+                    logger.warning(f"Shared cache write of {name} failed: {e}")
+            return payload
+        finally:
+            try:
+                await store.release(name)
+            except Exception as e:
+                logger.warning(f"Shared cache unlock of {name} failed: {e}")
+
+    # another process is refreshing it
+    if entry is not None:
+        SHARED_READS.inc(kind=kind, result="stale")
+        return entry.payload
+
+    deadline = time.monotonic() + config.API_CONFIG.SHARED_CACHE_WAIT
+    while time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+        entry = await _read(store, kind, name)
+        if entry is not None:
+            SHARED_READS.inc(kind=kind, result="waited")
+            return entry.payload
+
+    SHARED_READS.inc(kind=kind, result="timeout")
+    return await fetch()
+
+def shared_store_stats() -> dict[str, Any]:
+    store = shared_store()
+    return store.stats() if store is not None else {"backend": "none"}
+
+__all__ = [
+    "SharedEntry",
+    "SharedStore",
+    "MmapFileStore",
+    "RedisStore",
+    "shared_store",
+    "close_shared_store",
+    "shared_fetch",
+    "shared_store_stats"
+]
@@ -1,11 +1,28 @@
 import os
+import tempfile
 from dotenv import load_dotenv, find_dotenv
 
 load_dotenv(find_dotenv())
 
+def _parse_host_limits(raw:str) -> dict[str, int]:
+    # "api.example.com=20,other.example.com=5" -> {"api.example.com": 20, "other.example.com": 5}
+    limits = {}
+    for entry in raw.split(','):
+        if '=' not in entry:
+            continue
+        host, size = entry.split('=', 1)
+        limits[host.strip()] = int(size)
+    return limits
+
+def _positive_float(name:str, default:float) -> float:
+    value = float(os.getenv(name, default))
+    if value <= 0:
+        raise ValueError(f"{name} must be greater than 0, got {value}")
+    return value
+
 class Api_Config:
     BASE_URL = os.getenv('STATSWR_API_BASE_URL')
-    DEFAULT_TIMEOUT = int(os.getenv('DEFAULT_TIMEOUT'))
+    DEFAULT_TIMEOUT = float(os.getenv('DEFAULT_TIMEOUT', 10)) # upper bound, the timeout actually used adapts to observed latency
 
     DEFAULT_HEADERS = {
         "User-Agent": "StatsWR-MCP-Server/1.0",
@@ -13,4 +30,88 @@ class Api_Config:
         "Content-Type": "application/json"
     }
 
+    # shared connection pool used by every upstream request
+    HTTP2 = os.getenv('HTTP2', 'true').lower() == 'true'
+    MAX_CONNECTIONS = int(os.getenv('MAX_CONNECTIONS', 100))
+    MAX_KEEPALIVE_CONNECTIONS = int(os.getenv('MAX_KEEPALIVE_CONNECTIONS', 20))
+    KEEPALIVE_EXPIRY = float(os.getenv('KEEPALIVE_EXPIRY', 30))
+    HOST_POOL_LIMITS = _parse_host_limits(os.getenv('HOST_POOL_LIMITS', '')) # per-host max connections, each host gets its own pool
+
+    # in-process cache for champion / role data (seconds)
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', 512))
+    CACHE_TTL = float(os.getenv('CACHE_TTL', 300))
+    CACHE_STALE_TTL = float(os.getenv('CACHE_STALE_TTL', 3600)) # how long past CACHE_TTL a value may be served while it refreshes
+    CACHE_NEGATIVE_TTL = float(os.getenv('CACHE_NEGATIVE_TTL', 30)) # unknown champions / empty roles
+    HISTORY_STORE_PATH = os.getenv('HISTORY_STORE_PATH', os.path.join(tempfile.gettempdir(), 'statswr_history.sqlite3')) # champion histories kept across restarts, empty keeps them in memory only
+
+    # optional cache of raw upstream responses shared by every worker process: 'none', 'mmap' (files in SHARED_CACHE_DIR,
+    # shared by the processes of one host) or 'redis' (SHARED_CACHE_URL, any Redis-compatible server, needs the redis package)
+    SHARED_CACHE = os.getenv('SHARED_CACHE', 'none')
+    SHARED_CACHE_DIR = os.getenv('SHARED_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'statswr_shared_cache'))
+    SHARED_CACHE_URL = os.getenv('SHARED_CACHE_URL', 'redis://localhost:6379/0')
+    SHARED_CACHE_LOCK_TIMEOUT = float(os.getenv('SHARED_CACHE_LOCK_TIMEOUT', 30)) # a refresher that died releases its Redis lock after this long
+    SHARED_CACHE_WAIT = float(os.getenv('SHARED_CACHE_WAIT', 2)) # how long to wait for another process's first download before fetching anyway
+
+    # bulk comment / ability endpoints, loaded whole and indexed locally
+    COMMENTS_PATH = os.getenv('COMMENTS_PATH', '/comments')
+    ABILITIES_PATH = os.getenv('ABILITIES_PATH', '/abilities')
+    COMMENTS_TTL = float(os.getenv('COMMENTS_TTL', 600))
+    ABILITIES_TTL = float(os.getenv('ABILITIES_TTL', 86400)) # descriptions only change with patches
+    COMMENTS_PAGE_SIZE = int(os.getenv('COMMENTS_PAGE_SIZE', 20))
+    COMMENTS_PAGE_MAX = int(os.getenv('COMMENTS_PAGE_MAX', 100))
+
+    # resilience for both upstreams (seconds)
+    UPSTREAM_RETRIES = int(os.getenv('UPSTREAM_RETRIES', 2)) # extra attempts for idempotent GETs
+    RETRY_BACKOFF_BASE = float(os.getenv('RETRY_BACKOFF_BASE', 0.2))
+    RETRY_BACKOFF_MAX = float(os.getenv('RETRY_BACKOFF_MAX', 2))
+    LATENCY_WINDOW = int(os.getenv('LATENCY_WINDOW', 200)) # recent successful requests kept per endpoint
+    LATENCY_MIN_SAMPLES = int(os.getenv('LATENCY_MIN_SAMPLES', 20)) # the configured timeouts are used until then
+    ADAPTIVE_TIMEOUT_MULTIPLIER = float(os.getenv('ADAPTIVE_TIMEOUT_MULTIPLIER', 4)) # timeout = p99 * multiplier
+    ADAPTIVE_TIMEOUT_MIN = float(os.getenv('ADAPTIVE_TIMEOUT_MIN', 1))
+    HEDGE_REQUESTS = os.getenv('HEDGE_REQUESTS', 'false').lower() == 'true' # send a second request once one runs past the endpoint's p95
+    HEDGE_MIN_DELAY = float(os.getenv('HEDGE_MIN_DELAY', 0.05))
+    CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', 5)) # consecutive failures before failing fast
+    CIRCUIT_RESET_TIMEOUT = float(os.getenv('CIRCUIT_RESET_TIMEOUT', 30)) # how long to fail fast before probing again
+
+    # background refresh of the most requested champions, matchups and the role snapshot before they expire
+    PREFETCH = os.getenv('PREFETCH', 'true').lower() == 'true' # never started on Lambda
+    PREFETCH_INTERVAL = float(os.getenv('PREFETCH_INTERVAL', 15)) # seconds between scheduler passes
+    PREFETCH_LEAD_TIME = float(os.getenv('PREFETCH_LEAD_TIME', 60)) # refresh keys expiring within this many seconds
+    PREFETCH_BUDGET = float(os.getenv('PREFETCH_BUDGET', 30)) # upstream requests per minute the scheduler may spend
+    PREFETCH_TOP_KEYS = int(os.getenv('PREFETCH_TOP_KEYS', 64)) # hottest keys considered each pass
+    PREFETCH_MIN_SCORE = float(os.getenv('PREFETCH_MIN_SCORE', 2)) # decayed request count a key needs to be prefetched
+    PREFETCH_HALF_LIFE = float(os.getenv('PREFETCH_HALF_LIFE', 1800)) # seconds for a request to lose half its weight
+    PREFETCH_MAX_TRACKED = int(os.getenv('PREFETCH_MAX_TRACKED', 2048))
+
+    # fetch the role snapshot and open upstream connections during startup (the Lambda init phase) instead of on the first call
+    PREWARM_ON_INIT = os.getenv('PREWARM_ON_INIT', 'false').lower() == 'true'
+
+    # logging
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+    LOG_FORMAT = os.getenv('LOG_FORMAT', 'text').lower() # 'text' or 'json'
+
+    # tool responses
+    RESPONSE_FLOAT_DIGITS = int(os.getenv('RESPONSE_FLOAT_DIGITS', 2)) # -1 keeps full precision
+
+    # batch tools
+    BATCH_MAX_CHAMPIONS = int(os.getenv('BATCH_MAX_CHAMPIONS', 10))
+    BATCH_MAX_CONCURRENCY = int(os.getenv('BATCH_MAX_CONCURRENCY', 5)) # concurrent upstream requests per batch call
+
+    # wildriftcounter.com matchup scraper
+    MATCHUPS_BASE_URL = os.getenv('MATCHUPS_BASE_URL', 'https://wildriftcounter.com')
+    SCRAPER_TIMEOUT = float(os.getenv('SCRAPER_TIMEOUT', 15))
+    SCRAPER_CACHE_MAX_ENTRIES = int(os.getenv('SCRAPER_CACHE_MAX_ENTRIES', 256)) # pages kept with their ETag / Last-Modified for conditional requests
+
+    # persistent matchup store and optional background crawl of the whole roster
+    MATCHUP_STORE_PATH = os.getenv('MATCHUP_STORE_PATH', os.path.join(tempfile.gettempdir(), 'statswr_matchups.sqlite3')) # /tmp is the only writable path on Lambda
+    MATCHUP_STORE_MAX_AGE = float(os.getenv('MATCHUP_STORE_MAX_AGE', 86400)) # older entries are still served but refreshed in the background
+    MATCHUP_WARMUP = os.getenv('MATCHUP_WARMUP', 'false').lower() == 'true'
+    MATCHUP_WARMUP_RATE = _positive_float('MATCHUP_WARMUP_RATE', 0.5) # pages per second, set MATCHUP_WARMUP = false to stop the crawl
+    MATCHUP_WARMUP_INTERVAL = float(os.getenv('MATCHUP_WARMUP_INTERVAL', 3600)) # seconds between roster passes
+
+    SCRAPER_HEADERS = {
+        "User-Agent": "StatsWR-MCP-Server/1.0",
+        "Accept": "text/html,application/xhtml+xml"
+    }
+
 _api_config = Api_Config()
@@ -0,0 +1,11 @@
+from .roster_index import *
+
+__all__ = [
+    "ChampionName",
+    "RosterIndex",
+    "normalize_name",
+    "edit_distance",
+    "link_site_slugs",
+    "roster_index_for",
+    "get_roster_index"
+]
@@ -0,0 +1,247 @@
+# local index of every champion name, resolving free-form names to statsWR labels and wildriftcounter.com slugs
+
+import re
+import asyncio
+import logging
+import unicodedata
+from mcp_src.api_requests.champion import get_role_snapshot
+from mcp_src.api_requests.champion.snapshot import RoleSnapshot
+from mcp_src.api_requests.resilience import UPSTREAM_FAILURES
+from mcp_src.web_scraping.matchup_warmup import get_champion_roster
+
+logger = logging.getLogger(__name__)
+
+# queries shorter than this are only matched exactly, anything fuzzier is too ambiguous
+MIN_FUZZY_LENGTH = 4
+MIN_PREFIX_LENGTH = 3
+# candidates kept from the n-gram pass before edit distances are computed
+MAX_CANDIDATES = 16
+
+def normalize_name(name:str) -> str:
+    """'Kai'Sa' -> 'kaisa', 'Dr. Mundo' -> 'dr mundo', 'MASTER_YI' -> 'master yi', 'nunu-&-willump' -> 'nunu willump'"""
+    name = unicodedata.normalize('NFKD', name)
+    name = ''.join(char for char in name if not unicodedata.combining(char))
+    name = re.sub(r"['’.]", '', name.lower())
+    return ' '.join(re.split(r'[^a-z0-9]+', name)).strip()
+
+def _trigrams(key:str) -> set[str]:
+    padded = f'^{key}$'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def edit_distance(a:str, b:str) -> int:
+    """Levenshtein distance counting an adjacent transposition ('ezrael' -> 'ezreal') as one edit"""
+    previous2: list[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        previous2, previous = previous, current
+    return previous[-1]
+
+class ChampionName:
+    """A champion under both encodings the upstreams use: 'MASTER_YI' for statsWR and 'master-yi' for wildriftcounter.com"""
+
+    __slots__ = ('label', 'slug', 'display_name')
+
+    def __init__(self, label:str, display_name:str | None = None, slug:str | None = None):
+        self.label = label
+        self.slug = slug or label.lower().replace('_', '-') # guessed from the label when the site's roster isn't known
+        self.display_name = display_name or label.replace('_', ' ').title()
+
+    @classmethod
+    def from_text(cls, name:str) -> "ChampionName":
+        # used as-is when no roster is available to check the name against
+        return cls(normalize_name(name).upper().replace(' ', '_'))
+
+    @classmethod
+    def from_slug(cls, slug:str) -> "ChampionName":
+        # a wildriftcounter.com champion the statsWR snapshot doesn't hold
+        return cls(slug.upper().replace('-', '_'), slug=slug)
+
+    def to_dict(self) -> dict[str, str]:
+        return {"name": self.display_name, "champion_label": self.label, "champion_name": self.slug}
+
+    def __repr__(self) -> str:
+        return f"ChampionName({self.label!r})"
+
+class RosterIndex:
+    """
+    Every champion in a RoleSnapshot, keyed by normalized name, by unambiguous name parts and initials ('yi', 'mundo', 'mf'),
+    with a trigram index for misspellings.
+
+    Built once per snapshot, so resolving a name never needs an upstream call.
+    """
+
+    def __init__(self, champions:list[ChampionName]):
+        self.champions = champions
+        self._exact: dict[str, ChampionName] = {}
+        self._aliases: dict[str, ChampionName | None] = {}
+        # (key without spaces, champion) for every name and name part the fuzzy pass can land on
+        self._keys: list[tuple[str, ChampionName]] = []
+        self._grams: dict[str, list[int]] = {}
+
+        for champion in champions:
+            words = set()
+            for name in (champion.label, champion.display_name):
+                words.update(normalize_name(name).split())
+                key = normalize_name(name).replace(' ', '')
+                if key not in self._exact:
+                    self._exact[key] = champion
+                    self._add_key(key, champion)
+
+            aliases = {word for word in words if len(word) >= 2}
+            if len(words) > 1:
+                aliases.add(''.join(word[0] for word in normalize_name(champion.display_name).split()))
+            for alias in aliases - set(self._exact):
+                # a part shared by two champions resolves to neither
+                self._aliases[alias] = champion if self._aliases.get(alias, champion) is champion else None
+                if len(alias) >= MIN_FUZZY_LENGTH:
+                    self._add_key(alias, champion)
+
+    @classmethod
+    def from_snapshot(cls, snapshot:RoleSnapshot | None, site_slugs:list[str] | None = None) -> "RosterIndex":
+        champions = []
+        for label, rows in (snapshot.by_champion.items() if snapshot is not None else ()):
+            display_name = next((row['name'] for row in rows if isinstance(row.get('name'), str) and row['name'].upper() != label), None)
+            champions.append(ChampionName(label, display_name))
+        if site_slugs:
+            champions = link_site_slugs(champions, site_slugs)
+        return cls(champions)
+
+    def _add_key(self, key:str, champion:ChampionName) -> None:
+        position = len(self._keys)
+        self._keys.append((key, champion))
+        for gram in _trigrams(key):
+            self._grams.setdefault(gram, []).append(position)
+
+    def _ranked(self, key:str) -> list[tuple[int, float, ChampionName]]:
+        """(edit distance, -trigram similarity, champion) for the closest keys, best first and one entry per champion"""
+        grams = _trigrams(key)
+        shared: dict[int, int] = {}
+        for gram in grams:
+            for position in self._grams.get(gram, ()):
+                shared[position] = shared.get(position, 0) + 1
+
+        positions = sorted(shared, key=shared.get, reverse=True)[:MAX_CANDIDATES] if shared else range(len(self._keys))
+
+        ranked = {}
+        for position in positions:
+            candidate, champion = self._keys[position]
+            similarity = 2 * shared.get(position, 0) / (len(grams) + len(candidate) + 2)
+            score = (edit_distance(key, candidate), -similarity)
+            if champion.label not in ranked or score < ranked[champion.label][:2]:
+                ranked[champion.label] = (*score, champion)
+
+        return sorted(ranked.values(), key=lambda entry: entry[:2])
+
+    def resolve(self, name:str) -> ChampionName | None:
+        """The champion a free-form name unambiguously refers to, or None"""
+        key = normalize_name(name).replace(' ', '')
+        if not key:
+            return None
+
+        if key in self._exact:
+            return self._exact[key]
+        if self._aliases.get(key) is not None:
+            return self._aliases[key]
+
+        if len(key) >= MIN_PREFIX_LENGTH:
+            prefixed = {champion.label: champion for candidate, champion in self._keys if candidate.startswith(key)}
+            if len(prefixed) == 1:
+                return next(iter(prefixed.values()))
+
+        if len(key) < MIN_FUZZY_LENGTH:
+            return None
+
+        ranked = self._ranked(key)
+        if not ranked:
+            return None
+
+        distance, _, champion = ranked[0]
+        tied = len(ranked) > 1 and ranked[1][0] == distance
+        if distance <= max(1, len(key) // 4) and not tied:
+            return champion
+        return None
+
+    def suggest(self, name:str, n:int = 5) -> list[ChampionName]:
+        """The n champions whose names are closest to a name, best first"""
+        key = normalize_name(name).replace(' ', '')
+        if not key:
+            return []
+        return [champion for _, _, champion in self._ranked(key)[:n]]
+
+    def __len__(self) -> int:
+        return len(self.champions)
+
+def link_site_slugs(champions:list[ChampionName], site_slugs:list[str]) -> list[ChampionName]:
+    """
+    The champions with the wildriftcounter.com slug of the site's roster entry naming them, plus a champion of its own
+    for every slug naming none of them.
+
+    A slug is matched by exact name first, then as the only champion named by its leading words ('nunu-willump' for NUNU),
+    then through the fuzzy resolution of the statsWR names. Champions no slug matches keep the guessed slug.
+    """
+    index = RosterIndex(champions)
+    linked: dict[str, str] = {} # statsWR label -> site slug
+    unmatched = []
+    for slug in site_slugs:
+        champion = index._exact.get(normalize_name(slug).replace(' ', ''))
+        if champion is not None and champion.label not in linked:
+            linked[champion.label] = slug
+        else:
+            unmatched.append(slug)
+
+    own = []
+    for slug in unmatched:
+        words = normalize_name(slug).split()
+        leading = {''.join(words[:count]) for count in range(1, len(words))}
+        starting = {champion.label: champion for name, champion in index._exact.items() if name in leading and champion.label not in linked}
+        champion = next(iter(starting.values())) if len(starting) == 1 else index.resolve(''.join(words))
+        if champion is not None and champion.label not in linked:
+            linked[champion.label] = slug
+        else:
+            own.append(ChampionName.from_slug(slug))
+
+    return [ChampionName(champion.label, champion.display_name, linked.get(champion.label)) for champion in champions] + own
+
+_index: RosterIndex | None = None
+_index_sources: tuple[RoleSnapshot | None, list[str] | None] | None = None
+
+def roster_index_for(snapshot:RoleSnapshot | None, site_slugs:list[str] | None = None) -> RosterIndex:
+    # the index is rebuilt only when the cached snapshot or site roster is replaced
+    global _index, _index_sources
+
+    if _index is None or _index_sources is None or _index_sources[0] is not snapshot or _index_sources[1] is not site_slugs:
+        _index = RosterIndex.from_snapshot(snapshot, site_slugs)
+        _index_sources = (snapshot, site_slugs)
+
+    return _index
+
+async def _site_roster() -> list[str] | None:
+    # slugs are only needed by the matchup tools, a failing wildriftcounter.com falls back to guessed slugs
+    try:
+        return await get_champion_roster()
+    except UPSTREAM_FAILURES as e:
+        logger.warning(f"wildriftcounter.com roster unavailable, guessing champion slugs from labels: {e}")
+        return None
+
+async def get_roster_index() -> RosterIndex | None:
+    snapshot, site_slugs = await asyncio.gather(get_role_snapshot(), _site_roster())
+    if (snapshot is None or not snapshot.by_champion) and not site_slugs:
+        return None
+
+    return roster_index_for(snapshot, site_slugs)
+
+__all__ = [
+    "ChampionName",
+    "RosterIndex",
+    "normalize_name",
+    "edit_distance",
+    "link_site_slugs",
+    "roster_index_for",
+    "get_roster_index"
+]
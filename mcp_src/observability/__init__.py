@@ -0,0 +1,12 @@
+from .metrics import *
+from .instrumentation import *
+from .logging_setup import *
+
+__all__ = [
+    "render_metrics",
+    "instrument_tool",
+    "record_tool_error",
+    "InstrumentedTransport",
+    "health_summary",
+    "configure_logging"
+]
@@ -0,0 +1,158 @@
+# hot-path instrumentation: tool and upstream latency, errors, in-flight requests, cache and pool stats
+
+import re
+import sys
+import time
+import logging
+import functools
+import contextvars
+from typing import Any, Awaitable, Callable
+import httpx
+from mcp_src.caching import all_caches
+from .metrics import REGISTRY, counter, gauge, histogram
+
+logger = logging.getLogger(__name__)
+
+TOOL_LATENCY = histogram("statswr_tool_latency_seconds", "MCP tool call latency", ("tool",))
+TOOL_CALLS = counter("statswr_tool_calls_total", "MCP tool calls by result", ("tool", "status"))
+TOOL_ERRORS = counter("statswr_tool_errors_total", "MCP tool error responses by exception class", ("tool", "error_type"))
+TOOL_IN_FLIGHT = gauge("statswr_tool_in_flight", "MCP tool calls currently running", ("tool",))
+
+UPSTREAM_LATENCY = histogram("statswr_upstream_latency_seconds", "Upstream request latency until response headers", ("host", "endpoint", "status"))
+UPSTREAM_ERRORS = counter("statswr_upstream_errors_total", "Upstream requests that raised, by exception class", ("host", "endpoint", "error_type"))
+UPSTREAM_IN_FLIGHT = gauge("statswr_upstream_in_flight", "Upstream requests currently waiting for a response", ("host",))
+
+def _cache_samples(field:str) -> dict[tuple[str, ...], float]:
+    return {(cache.name,): cache.stats()[field] for cache in all_caches()}
+
+for _field, _documentation in (("size", "Entries held"), ("hits", "Fresh hits"), ("stale_hits", "Stale hits served while refreshing"), ("misses", "Misses that waited on a fetch"), ("fallback_hits", "Expired values served after a failed fetch"), ("inflight", "Fetches in flight")):
+    gauge(f"statswr_cache_{_field}", f"{_documentation} per in-process cache", ("cache",), collect=functools.partial(_cache_samples, _field))
+
+def _pool_samples(field:str) -> dict[tuple[str, ...], float]:
+    from mcp_src.api_requests.http_client import pool_stats # the client module imports this one
+    return {(pool["pool"],): pool[field] for pool in pool_stats()}
+
+for _field, _documentation in (("connections", "Open connections"), ("idle_connections", "Idle keep-alive connections"), ("requests", "Requests queued or running")):
+    gauge(f"statswr_http_pool_{_field}", f"{_documentation} per HTTP connection pool", ("pool",), collect=functools.partial(_pool_samples, _field))
+
+_current_tool: contextvars.ContextVar[str | None] = contextvars.ContextVar("current_tool", default=None)
+_tool_failed: contextvars.ContextVar[bool] = contextvars.ContextVar("tool_failed", default=False)
+
+def record_tool_error(context:str = "") -> None:
+    """Count an error response for the running tool, classified by the exception being handled (if any)"""
+    tool = _current_tool.get() or context or "unknown"
+    exception = sys.exc_info()[1]
+    error_type = type(exception).__name__ if exception is not None else "InvalidArgument"
+    TOOL_ERRORS.inc(tool=tool, error_type=error_type)
+    _tool_failed.set(True)
+
+def instrument_tool(fn:Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """Record latency, in-flight count and outcome of an MCP tool, keeping its signature for FastMCP"""
+    tool = fn.__name__
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        tool_token = _current_tool.set(tool)
+        failed_token = _tool_failed.set(False)
+        TOOL_IN_FLIGHT.inc(tool=tool)
+        start = time.perf_counter()
+        status = "error"
+        try:
+            result = await fn(*args, **kwargs)
+            status = "error" if _tool_failed.get() else "ok"
+            return result
+        finally:
+            duration = time.perf_counter() - start
+            TOOL_IN_FLIGHT.dec(tool=tool)
+            TOOL_LATENCY.observe(duration, tool=tool)
+            TOOL_CALLS.inc(tool=tool, status=status)
+            logger.info("tool call", extra={"tool": tool, "status": status, "duration_ms": round(duration * 1000, 3)})
+            _tool_failed.reset(failed_token)
+            _current_tool.reset(tool_token)
+
+    return wrapper
+
+_ENDPOINT_TEMPLATES = (
+    (re.compile(r'/champions/lanes/[^/]+/?$'), '/champions/lanes/{role}'),
+    (re.compile(r'/champions/?$'), '/champions/'),
+    (re.compile(r'/champions/[^/]+/?$'), '/champions/{champion}')
+)
+
+def endpoint_template(path:str) -> str:
+    # collapse ids in the path so metric label cardinality stays bounded
+    for pattern, template in _ENDPOINT_TEMPLATES:
+        if pattern.search(path):
+            return template
+    return "other"
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """Wraps a transport to time every upstream request and count the ones that raise"""
+
+    def __init__(self, transport:httpx.AsyncBaseTransport):
+        self.transport = transport
+
+    async def handle_async_request(self, request:httpx.Request) -> httpx.Response:
+        host = request.url.host
+        endpoint = endpoint_template(request.url.path)
+        UPSTREAM_IN_FLIGHT.inc(host=host)
+        start = time.perf_counter()
+        try:
+            response = await self.transport.handle_async_request(request)
+        except Exception as e:
+            UPSTREAM_ERRORS.inc(host=host, endpoint=endpoint, error_type=type(e).__name__)
+            raise
+        finally:
+            UPSTREAM_IN_FLIGHT.dec(host=host)
+
+        UPSTREAM_LATENCY.observe(time.perf_counter() - start, host=host, endpoint=endpoint, status=str(response.status_code))
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+def _latency_summary(histogram_metric, **labels:str) -> dict[str, float | None]:
+    def ms(seconds:float | None) -> float | None:
+        return None if seconds is None else round(seconds * 1000, 2)
+    return {
+        "p50_ms": ms(histogram_metric.quantile(0.5, **labels)),
+        "p95_ms": ms(histogram_metric.quantile(0.95, **labels)),
+        "p99_ms": ms(histogram_metric.quantile(0.99, **labels))
+    }
+
+def health_summary() -> dict[str, Any]:
+    from mcp_src.api_requests.http_client import pool_stats
+
+    tools = {}
+    for (tool,), series in TOOL_LATENCY.series.items():
+        errors = sum(value for (name, _), value in TOOL_ERRORS.values.items() if name == tool)
+        tools[tool] = {
+            "calls": series.count,
+            "errors": int(errors),
+            "in_flight": int(TOOL_IN_FLIGHT.values.get((tool,), 0)),
+            **_latency_summary(TOOL_LATENCY, tool=tool)
+        }
+
+    upstreams = {}
+    for (host, endpoint, status), series in UPSTREAM_LATENCY.series.items():
+        upstreams.setdefault(f"{host}{endpoint}", {})[status] = {
+            "requests": series.count,
+            **_latency_summary(UPSTREAM_LATENCY, host=host, endpoint=endpoint, status=status)
+        }
+    upstream_errors = {f"{host}{endpoint} {error_type}": int(value) for (host, endpoint, error_type), value in UPSTREAM_ERRORS.values.items()}
+
+    return {
+        "uptime_seconds": round(time.time() - REGISTRY.started_at, 1),
+        "tools": tools,
+        "upstreams": upstreams,
+        "upstream_errors": upstream_errors,
+        "caches": [cache.stats() for cache in all_caches()],
+        "http_pools": pool_stats()
+    }
+
+__all__ = [
+    "instrument_tool",
+    "record_tool_error",
+    "endpoint_template",
+    "InstrumentedTransport",
+    "health_summary"
+]
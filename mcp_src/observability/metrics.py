@@ -0,0 +1,172 @@
+# minimal in-process metrics registry rendered in the Prometheus text exposition format
+
+import math
+import time
+import bisect
+from abc import ABC, abstractmethod
+from typing import Callable, Iterable
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = tuple[str, ...]
+
+def _escape(value:str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(names:tuple[str, ...], values:LabelValues, extra:dict[str, str] | None = None) -> str:
+    pairs = list(zip(names, values)) + list((extra or {}).items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+def _format_value(value:float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name:str, documentation:str, label_names:Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+
+    def _key(self, labels:dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    @abstractmethod
+    def samples(self) -> list[str]:
+        ...
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name:str, documentation:str, label_names:Iterable[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self.values: dict[LabelValues, float] = {}
+
+    def inc(self, amount:float = 1, **labels:str) -> None:
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def samples(self) -> list[str]:
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}" for key, value in self.values.items()]
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name:str, documentation:str, label_names:Iterable[str] = (), collect:Callable[[], dict[LabelValues, float]] | None = None):
+        super().__init__(name, documentation, label_names)
+        self.values: dict[LabelValues, float] = {}
+        self.collect = collect # computed at scrape time instead of set by the hot path
+
+    def inc(self, amount:float = 1, **labels:str) -> None:
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount:float = 1, **labels:str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value:float, **labels:str) -> None:
+        self.values[self._key(labels)] = value
+
+    def samples(self) -> list[str]:
+        values = self.collect() if self.collect is not None else self.values
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}" for key, value in values.items()]
+
+class _HistogramSeries:
+    __slots__ = ("bucket_counts", "count", "sum")
+
+    def __init__(self, bucket_count:int):
+        self.bucket_counts = [0] * bucket_count # non-cumulative, the last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name:str, documentation:str, label_names:Iterable[str] = (), buckets:tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(buckets) + (math.inf,)
+        self.series: dict[LabelValues, _HistogramSeries] = {}
+
+    def observe(self, value:float, **labels:str) -> None:
+        key = self._key(labels)
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = _HistogramSeries(len(self.buckets))
+        series.bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+        series.count += 1
+        series.sum += value
+
+    def quantile(self, q:float, **labels:str) -> float | None:
+        # linear interpolation inside the bucket holding the q-th observation, like PromQL histogram_quantile
+        series = self.series.get(self._key(labels))
+        if series is None or series.count == 0:
+            return None
+
+        rank = q * series.count
+        cumulative = 0
+        for index, count in enumerate(series.bucket_counts):
+            if cumulative + count >= rank and count:
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                if upper == math.inf:
+                    return lower
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-2]
+
+    def samples(self) -> list[str]:
+        lines = []
+        for key, series in self.series.items():
+            cumulative = 0
+            for upper, count in zip(self.buckets, series.bucket_counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, {'le': _format_value(upper)})} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {_format_value(series.sum)}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {series.count}")
+        return lines
+
+class Registry:
+    def __init__(self):
+        self.metrics: dict[str, _Metric] = {}
+        self.started_at = time.time()
+
+    def register(self, metric:_Metric) -> _Metric:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self.metrics.values()) + "\n"
+
+REGISTRY = Registry()
+
+def counter(name:str, documentation:str, label_names:Iterable[str] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, documentation, label_names))
+
+def gauge(name:str, documentation:str, label_names:Iterable[str] = (), collect:Callable[[], dict[LabelValues, float]] | None = None) -> Gauge:
+    return REGISTRY.register(Gauge(name, documentation, label_names, collect))
+
+def histogram(name:str, documentation:str, label_names:Iterable[str] = (), buckets:tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+    return REGISTRY.register(Histogram(name, documentation, label_names, buckets))
+
+def render_metrics() -> str:
+    return REGISTRY.render()
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "REGISTRY",
+    "counter",
+    "gauge",
+    "histogram",
+    "render_metrics"
+]
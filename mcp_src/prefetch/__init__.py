@@ -0,0 +1,9 @@
+from .scheduler import *
+
+__all__ = [
+    "RequestBudget",
+    "prefetch_once",
+    "prefetch_stats",
+    "start_prefetch_scheduler",
+    "stop_prefetch_scheduler"
+]
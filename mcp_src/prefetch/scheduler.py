@@ -0,0 +1,149 @@
+# background refresh of the most requested champions, matchups, bulk comment / ability data and role snapshot before they expire
+
+import time
+import asyncio
+import inspect
+import logging
+from typing import Any, Awaitable, Callable, Hashable
+from mcp_src.mcp_configs import config
+from mcp_src.caching import access_tracker
+from mcp_src.observability.metrics import counter
+from mcp_src.api_requests.resilience import CircuitOpenError
+from mcp_src.api_requests.champion.gameplay_data import (
+    role_snapshot_expires_in,
+    refresh_role_snapshot,
+    champion_history_expires_in,
+    refresh_champion_history
+)
+from mcp_src.api_requests.champion.comments import comments_expire_in, refresh_comments
+from mcp_src.api_requests.champion.abilities import abilities_expire_in, refresh_abilities
+from mcp_src.web_scraping.matchup_store import matchups_expire_in, refresh_matchups
+
+logger = logging.getLogger(__name__)
+
+PREFETCH_REFRESHES = counter("statswr_prefetch_refreshes_total", "Keys refreshed ahead of expiry by the prefetch scheduler", ("kind", "status"))
+PREFETCH_DEFERRED = counter("statswr_prefetch_deferred_total", "Due keys left for a later pass because the request budget was spent", ("kind",))
+
+class _PrefetchSource:
+    __slots__ = ("expires_in", "refresh")
+
+    def __init__(self, expires_in:Callable[[Hashable], float | None | Awaitable[float | None]], refresh:Callable[[Hashable], Awaitable[Any]]):
+        self.expires_in = expires_in # seconds until the held value expires, None if nothing worth refreshing is held; may be a coroutine when it reads a store
+        self.refresh = refresh
+
+# access kind (see caching.record_access) -> how to check and refresh one of its keys
+_SOURCES = {
+    "role_snapshot": _PrefetchSource(lambda _: role_snapshot_expires_in(), lambda _: refresh_role_snapshot()),
+    "champion": _PrefetchSource(champion_history_expires_in, refresh_champion_history),
+    "matchups": _PrefetchSource(matchups_expire_in, refresh_matchups),
+    "comments": _PrefetchSource(lambda _: comments_expire_in(), lambda _: refresh_comments()),
+    "abilities": _PrefetchSource(lambda _: abilities_expire_in(), lambda _: refresh_abilities())
+}
+
+class RequestBudget:
+    """Token bucket of upstream requests, refilled at per_minute / 60 per second and holding at most one pass's worth"""
+
+    def __init__(self, per_minute:float, interval:float):
+        self.rate = per_minute / 60
+        self.capacity = max(1.0, self.rate * interval)
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+_budget = RequestBudget(config.API_CONFIG.PREFETCH_BUDGET, config.API_CONFIG.PREFETCH_INTERVAL)
+_scheduler_task: asyncio.Task | None = None
+
+async def prefetch_once() -> int:
+    """Refresh the hottest keys expiring within PREFETCH_LEAD_TIME, hottest first, until the budget runs out; returns the number refreshed"""
+    refreshed = 0
+    hottest = access_tracker().hottest(config.API_CONFIG.PREFETCH_TOP_KEYS, config.API_CONFIG.PREFETCH_MIN_SCORE)
+
+    for (kind, key), _ in hottest:
+        source = _SOURCES.get(kind)
+        if source is None:
+            continue
+
+        expires_in = source.expires_in(key)
+        if inspect.isawaitable(expires_in):
+            expires_in = await expires_in
+        if expires_in is None or expires_in > config.API_CONFIG.PREFETCH_LEAD_TIME:
+            continue
+
+        if not _budget.take():
+            PREFETCH_DEFERRED.inc(kind=kind)
+            break
+
+        try:
+            await source.refresh(key)
+            PREFETCH_REFRESHES.inc(kind=kind, status="ok")
+            refreshed += 1
+        except CircuitOpenError as e:
+            # the upstream is down, the rest of the pass would only fail fast too
+            logger.warning(f"Prefetch pass stopped: {e}")
+            break
+        except Exception as e:
+            PREFETCH_REFRESHES.inc(kind=kind, status="error")
+            logger.warning(f"Prefetch of {kind} {key!r} failed: {e}")
+
+    return refreshed
+
+async def _scheduler_loop() -> None:
+    while True:
+        try:
+            refreshed = await prefetch_once()
+            if refreshed:
+                logger.info(f"Prefetch pass refreshed {refreshed} keys")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Prefetch pass failed: {e}")
+        await asyncio.sleep(config.API_CONFIG.PREFETCH_INTERVAL)
+
+def prefetch_stats() -> dict[str, Any]:
+    tracker = access_tracker()
+    return {
+        "tracked_keys": len(tracker),
+        "budget_tokens": round(_budget.tokens, 2),
+        "hottest": [{"kind": kind, "key": key, "score": round(score, 2)} for (kind, key), score in tracker.hottest(10)]
+    }
+
+def start_prefetch_scheduler() -> asyncio.Task | None:
+    global _scheduler_task
+
+    if not config.API_CONFIG.PREFETCH:
+        return None
+
+    if _scheduler_task is None or _scheduler_task.done():
+        _scheduler_task = asyncio.create_task(_scheduler_loop())
+        logger.info("Started prefetch scheduler")
+
+    return _scheduler_task
+
+async def stop_prefetch_scheduler() -> None:
+    global _scheduler_task
+
+    if _scheduler_task is not None and not _scheduler_task.done():
+        _scheduler_task.cancel()
+        try:
+            await _scheduler_task
+        except asyncio.CancelledError:
+            pass
+        logger.info("Stopped prefetch scheduler")
+
+    _scheduler_task = None
+
+__all__ = [
+    "RequestBudget",
+    "prefetch_once",
+    "prefetch_stats",
+    "start_prefetch_scheduler",
+    "stop_prefetch_scheduler"
+]
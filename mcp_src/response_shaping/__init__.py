@@ -0,0 +1,10 @@
+from .shaping import *
+
+__all__ = [
+    "dumps",
+    "loads",
+    "round_floats",
+    "project",
+    "date_of",
+    "window_history"
+]
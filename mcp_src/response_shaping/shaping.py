@@ -0,0 +1,126 @@
+# compact JSON serialization and projection / windowing / rounding of tool payloads
+
+import json
+from datetime import date, datetime
+from typing import Any
+from mcp_src.mcp_configs import config
+
+try:
+    import orjson
+except ImportError: # fall back to the stdlib encoder with compact separators
+    orjson = None
+
+# keys that identify a row and are kept by every projection
+IDENTITY_FIELDS = ('role', 'label', 'champion_label', 'championLabel', 'name')
+
+# keys holding the snapshot date of a history entry, or a list of dates parallel to the stat lists
+DATE_FIELDS = ('date', 'dates', 'created_at', 'createdAt', 'updated_at', 'updatedAt', 'timestamp')
+
+def dumps(data:Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False, default=str)
+
+def loads(payload:bytes | memoryview) -> Any:
+    # orjson parses straight from a memoryview (e.g. of a memory-mapped shared cache file) without copying it
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(bytes(payload))
+
+def round_floats(data:Any, digits:int | None = None) -> Any:
+    digits = config.API_CONFIG.RESPONSE_FLOAT_DIGITS if digits is None else digits
+    if digits < 0:
+        return data
+
+    if isinstance(data, float):
+        return round(data, digits)
+    if isinstance(data, dict):
+        return {key: round_floats(value, digits) for key, value in data.items()}
+    if isinstance(data, list):
+        return [round_floats(value, digits) for value in data]
+    return data
+
+def project(rows:list[dict[str, Any]], fields:list[str] | None) -> list[dict[str, Any]]:
+    # keep only the requested fields (plus the identity and date fields) of every row and of nested history snapshots
+    if not fields:
+        return rows
+
+    keep = set(fields) | set(IDENTITY_FIELDS) | set(DATE_FIELDS)
+
+    def project_row(row:dict[str, Any]) -> dict[str, Any]:
+        projected = {}
+        for key, value in row.items():
+            if key in keep:
+                projected[key] = value
+            elif isinstance(value, list) and value and isinstance(value[0], dict):
+                projected[key] = [project_row(item) if isinstance(item, dict) else item for item in value]
+        return projected
+
+    return [project_row(row) for row in rows]
+
+def date_of(value:Any) -> date | None:
+    """Calendar day of an ISO date or datetime (a trailing 'Z' included), None for anything else"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).date()
+    except ValueError:
+        return None
+
+def _history_dates(entry:dict[str, Any]) -> list[Any] | None:
+    for key, value in entry.items():
+        if not isinstance(value, list) or not value:
+            continue
+        if key in DATE_FIELDS:
+            return value
+        if isinstance(value[0], dict):
+            for date_field in DATE_FIELDS:
+                if date_field in value[0]:
+                    return [item.get(date_field) for item in value]
+    return None
+
+def window_history(rows:list[dict[str, Any]], last_n:int | None = None, since:str | None = None) -> list[dict[str, Any]]:
+    """
+    Cut every per-role history down to its newest snapshots.
+
+    A role entry may hold its history either as a list of snapshot dicts or as parallel lists (one per stat);
+    every list field is sliced the same way so parallel lists stay aligned. History is assumed oldest first.
+    since is a YYYY-MM-DD date (ValueError otherwise), history is kept from the first snapshot dated on or after it.
+    """
+    if last_n is None and not since:
+        return rows
+
+    windowed = []
+    for entry in rows:
+        lengths = {len(value) for value in entry.values() if isinstance(value, list)}
+        if not lengths:
+            windowed.append(entry)
+            continue
+
+        length = max(lengths)
+        start = 0
+        if since:
+            dates = _history_dates(entry)
+            if dates is not None:
+                since_date = date.fromisoformat(since)
+                start = next((i for i, value in enumerate(dates) if (day := date_of(value)) is not None and day >= since_date), len(dates))
+        if last_n is not None:
+            start = max(start, length - last_n)
+
+        windowed.append({
+            key: value[start:] if isinstance(value, list) and len(value) == length else value
+            for key, value in entry.items()
+        })
+
+    return windowed
+
+__all__ = [
+    "dumps",
+    "loads",
+    "round_floats",
+    "project",
+    "date_of",
+    "window_history"
+]
@@ -1,26 +1,31 @@
-import os
 import json
+import anyio
 import httpx
 import logging
 import traceback
-from datetime import datetime
-from pathlib import Path
+from datetime import date, datetime
 from typing import Any
 from mcp.server.fastmcp import FastMCP
-from dotenv import load_dotenv, find_dotenv
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
 
 from .api_requests.champion import *
+from .api_requests.http_client import start_http_client, close_http_client
 from .web_scraping import *
+from .api_requests.champion.snapshot import STAT_FIELDS
+from .api_requests.champion.comments import InvalidCursorError, decode_cursor
+from .api_requests.resilience import UPSTREAM_FAILURES, resilience_stats
+from .caching import shared_store_stats, close_shared_store
+from .name_resolution import ChampionName, get_roster_index
+from .prefetch import start_prefetch_scheduler, stop_prefetch_scheduler, prefetch_stats
 from .prompt_library import plib
+from .response_shaping import dumps, round_floats, project, window_history
+from .observability import configure_logging, instrument_tool, record_tool_error, render_metrics, health_summary
+from .mcp_configs import config
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+configure_logging()
 logger = logging.getLogger(__name__)
 
-load_dotenv(find_dotenv())
-
 try:
     mcp = FastMCP(
             "statsWR",
@@ -34,6 +39,7 @@ def create_error_response(error_msg: str, context: str = "") -> str:
     """Create a standardized error response"""
     full_msg = f"Error in {context}: {error_msg}" if context else f"Error: {error_msg}"
     logger.error(full_msg)
+    record_tool_error(context)
     return json.dumps({
         "error": True,
         "message": error_msg,
@@ -41,23 +47,123 @@ def create_error_response(error_msg: str, context: str = "") -> str:
         "data": None
     })
 
+ROLE_NAMES = {0: 'All roles', 1: 'Baron', 2: 'Jungle', 3: 'Mid', 4: 'Dragon', 5: 'Support'}
+
+def validate_role(role: Any, context: str) -> tuple[int | None, str | None]:
+    """Coerce a role argument to an int between 0 and 5, returning (role, None) or (None, error response)"""
+    if not isinstance(role, int):
+        try:
+            role = int(role)
+        except (ValueError, TypeError):
+            return None, create_error_response("Role must be an integer between 0 and 5", context)
+
+    if role < 0 or role > 5:
+        return None, create_error_response("Role must be between 0 and 5 inclusive. 0=All roles, 1=Baron, 2=Jungle, 3=Mid, 4=Dragon, 5=Support", context)
+
+    return role, None
+
+def validate_stat(stat: Any, context: str) -> tuple[str | None, str | None]:
+    if stat not in STAT_FIELDS:
+        return None, create_error_response(f"Stat must be one of {list(STAT_FIELDS)}", context)
+    return stat, None
+
+async def get_role_columns():
+    # NumPy is only imported once an analytics tool is actually called, keeping it out of cold starts
+    from .analytics import get_role_columns as load_role_columns
+    return await load_role_columns()
+
+async def load_matchup_graph(slugs: list[str]):
+    # lives in the analytics package too, imported lazily for the same reason as get_role_columns
+    from .analytics import load_matchup_graph as load_graph
+    return await load_graph(slugs)
+
+async def matchup_graph_summary(graph) -> dict[str, Any]:
+    # how much of the roster the graph covers, it only holds the pages stored so far unless MATCHUP_WARMUP is on
+    index = await load_roster_index()
+    return graph.stats(None if index is None else [champion.slug for champion in index.champions])
+
+def no_role_data_response(role: int) -> str:
+    logger.warning(f"No data found for role: {role}")
+    return json.dumps({
+        "error": False,
+        "message": f"No recent data available for role '{ROLE_NAMES.get(role, role)}'",
+        "data": None
+    })
+
+async def load_roster_index():
+    # names are resolved on a best-effort basis, a failing statsWR upstream shouldn't fail the matchup tools too
+    try:
+        return await get_roster_index()
+    except UPSTREAM_FAILURES as e:
+        logger.warning(f"Champion roster unavailable, using names as given: {e}")
+        return None
+
+async def resolve_champion(name: str, context: str) -> tuple[ChampionName | None, str | None]:
+    """Resolve a free-form champion name against the local roster, returning (champion, None) or (None, response with suggestions)"""
+    index = await load_roster_index()
+    if index is None:
+        # no roster to check against, take the name as given and let the upstream decide
+        return ChampionName.from_text(name), None
+
+    champion = index.resolve(name)
+    if champion is not None:
+        return champion, None
+
+    suggestions = index.suggest(name)
+    logger.warning(f"Unknown champion name in {context}: {name}")
+    return None, json.dumps({
+        "error": False,
+        "message": f"No champion named '{name}'. Ask the user which of the suggested champions they meant.",
+        "suggestions": [suggestion.to_dict() for suggestion in suggestions],
+        "data": None
+    })
+
+async def resolve_champion_list(names: Any, context: str) -> tuple[list[ChampionName] | None, str | None]:
+    """Resolve a non-empty list of champion names, returning (champions, None) or (None, response for the first bad name)"""
+    if not isinstance(names, list) or not names or not all(isinstance(name, str) and name.strip() for name in names):
+        return None, create_error_response("Champion names must be a non-empty list of non-empty strings", context)
+
+    if len(names) > config.API_CONFIG.BATCH_MAX_CHAMPIONS:
+        return None, create_error_response(f"At most {config.API_CONFIG.BATCH_MAX_CHAMPIONS} champions can be requested at once", context)
+
+    champions = []
+    for name in names:
+        champion, error = await resolve_champion(name, context)
+        if error:
+            return None, error
+        if champion.slug not in (known.slug for known in champions):
+            champions.append(champion)
+    return champions, None
+
+def validate_history_window(last_n: Any, since: Any, context: str) -> str | None:
+    if last_n is not None and (not isinstance(last_n, int) or last_n < 1):
+        return create_error_response("last_n must be a positive integer", context)
+    if since is not None:
+        try:
+            date.fromisoformat(since)
+        except (TypeError, ValueError):
+            return create_error_response("since must be a date string in YYYY-MM-DD format", context)
+    return None
+
 # ---------- start of endpoints ----------
 
 @mcp.tool()
-async def get_champion_data_from_label(champion_label: str) -> str:
+@instrument_tool
+async def get_champion_data_from_label(champion_label: str, fields: list[str] | None = None, last_n: int | None = None, since: str | None = None) -> str:
     """
     Get gameplay data for a specific WildRift champion
 
     Args:
-        champion_label: Capitalized champion full name. 
-                        If a champion's name consists of multiple words, connect them using "_".
-                        For example: "Aatrox" -> "AATROX", "Master Yi" -> "MASTER_YI".
-                        If the user provides a champion name that doesn't exist or is misspelled, 
-                        suggest the closest matching champion names and ask for clarification. 
-                        Common misspellings include: 'Yi' for 'Master Yi', 'Kai Sa' for 'Kai'Sa', etc.
+        champion_label: The champion's name as the user wrote it, e.g. "Master Yi", "MASTER_YI", "yi" or "kai sa".
+                        Short forms and small misspellings are resolved to the right champion.
+                        If the name can't be resolved, a list of suggestions is returned instead;
+                        ask the user which of them they meant.
+        fields: Optional list of fields to keep in each role's data (e.g. ["win_rate", "ban_rate"]). Leave empty for all fields.
+        last_n: Optional number of most recent snapshots to keep per role. Use a small value unless the user asks about trends.
+        since: Optional date in YYYY-MM-DD format, only snapshots from that date onwards are kept.
     
     Return:
-        A stringified list of dictionaries will be returned. Each dictionary represent a champion's
+        A JSON list of dictionaries will be returned. Each dictionary represent a champion's
         gameplay data history for a specific role (indicated by the "role" field). Each number corresponds
         to a different lane assignment for the champion as specified by the dictionary below. Keep in mind 'Baron'
         can also be 'Top' and 'Dragon can be 'ADC' or 'AD Carry'.
@@ -69,13 +175,21 @@ async def get_champion_data_from_label(champion_label: str) -> str:
         if not champion_label or not isinstance(champion_label, str):
             return create_error_response("Champion label must be a non-empty string", "get_champion_data_from_label")
         
-        champion_label = champion_label.strip().upper()
-        if not champion_label:
+        if not champion_label.strip():
             return create_error_response("Champion label cannot be empty or whitespace only", "get_champion_data_from_label")
+
+        error = validate_history_window(last_n, since, "get_champion_data_from_label")
+        if error:
+            return error
+
+        champion, error = await resolve_champion(champion_label, "get_champion_data_from_label")
+        if error:
+            return error
+        champion_label = champion.label
         
         logger.info(f"Fetching champion data for: {champion_label}")
         
-        data = await get_all_data_for_single_champ_all_roles(champion_label)
+        data = await get_all_data_for_single_champ_all_roles(champion_label, last_n, since)
         
         if not data:
             logger.warning(f"No data found for champion: {champion_label}")
@@ -90,7 +204,7 @@ async def get_champion_data_from_label(champion_label: str) -> str:
         res += plib.PROACTIVE_CHAMPION_SUGGESTIONS
         res += plib.COMPARATIVE_CHAMPION_ANALYSIS
         res += plib.CHAMPION_TREND_IDENTIFICATION
-        res += str(data)
+        res += dumps(round_floats(project(data, fields)))
         
         logger.info(f"Successfully retrieved data for champion: {champion_label}")
         return res
@@ -99,8 +213,8 @@ async def get_champion_data_from_label(champion_label: str) -> str:
         return create_error_response("Request timed out while fetching champion data", "get_champion_data_from_label")
     except httpx.HTTPStatusError as e:
         return create_error_response(f"HTTP error occurred: {e.response.status_code}", "get_champion_data_from_label")
-    except ConnectionError:
-        return create_error_response("Connection error - unable to reach data source", "get_champion_data_from_label")
+    except ConnectionError as e:
+        return create_error_response(f"Connection error - unable to reach data source: {e}", "get_champion_data_from_label")
     except json.JSONDecodeError:
         return create_error_response("Invalid JSON response from data source", "get_champion_data_from_label")
     except Exception as e:
@@ -108,7 +222,166 @@ async def get_champion_data_from_label(champion_label: str) -> str:
         return create_error_response(f"Unexpected error occurred: {str(e)}", "get_champion_data_from_label")
 
 @mcp.tool()
-async def get_most_recent_champ_data_for_all_champs_in_certain_role(role: int) -> str:
+@instrument_tool
+async def get_champion_stat_changes(champion_label: str, last_n: int | None = None, since: str | None = None) -> str:
+    """
+    Get how a WildRift champion's win rate, pick rate and ban rate changed over a period, per role.
+    Prefer this over get_champion_data_from_label when the user asks whether a champion got stronger or weaker,
+    e.g. since the last patch.
+
+    Args:
+        champion_label: The champion's name, in the same format as get_champion_data_from_label.
+        last_n: Optional number of most recent snapshots to compare across, e.g. 2 for the change since the previous snapshot.
+        since: Optional date in YYYY-MM-DD format (e.g. a patch release date), compares the first snapshot from that date with the latest.
+               Leave both empty to compare the oldest snapshot available with the latest.
+
+    Return:
+        A JSON list with one dictionary per role (indicated by the "role" field) holding "from_date", "to_date",
+        the number of "snapshots" in between and, for every stat, its "from" and "to" values and the "change".
+        {1: 'Baron', 2: 'Jungle', 3: 'Mid', 4: 'Dragon', 5: 'Support'}
+
+        Otherwise return an error logger string. Please output the exact logger object if you recieve it.
+    """
+    try:
+        if not champion_label or not isinstance(champion_label, str) or not champion_label.strip():
+            return create_error_response("Champion label must be a non-empty string", "get_champion_stat_changes")
+
+        error = validate_history_window(last_n, since, "get_champion_stat_changes")
+        if error:
+            return error
+
+        champion, error = await resolve_champion(champion_label, "get_champion_stat_changes")
+        if error:
+            return error
+        champion_label = champion.label
+
+        logger.info(f"Computing stat changes for: {champion_label}")
+
+        history = await get_champion_history(champion_label)
+        changes = history.changes(last_n, since) if history is not None else []
+
+        if not changes:
+            return json.dumps({
+                "error": False,
+                "message": f"No history available for champion '{champion_label}'" + (f" since {since}" if since else ""),
+                "data": None
+            })
+
+        res = ""
+        res += plib.CHAMPION_TREND_IDENTIFICATION
+        res += dumps(round_floats(changes))
+        return res
+
+    except httpx.TimeoutException:
+        return create_error_response("Request timed out while fetching champion data", "get_champion_stat_changes")
+    except httpx.HTTPStatusError as e:
+        return create_error_response(f"HTTP error occurred: {e.response.status_code}", "get_champion_stat_changes")
+    except ConnectionError as e:
+        return create_error_response(f"Connection error - unable to reach data source: {e}", "get_champion_stat_changes")
+    except Exception as e:
+        logger.error(f"Unexpected error in get_champion_stat_changes: {traceback.format_exc()}")
+        return create_error_response(f"Unexpected error occurred: {str(e)}", "get_champion_stat_changes")
+
+@mcp.tool()
+@instrument_tool
+async def get_champion_data_for_multiple_champions(champion_labels: list[str], roles: list[int] | None = None, fields: list[str] | None = None, last_n: int | None = None) -> str:
+    """
+    Get gameplay data for several WildRift champions at once. Use this instead of calling
+    get_champion_data_from_label repeatedly when the user wants to compare champions.
+
+    Args:
+        champion_labels: A list of champion names, in the same format as get_champion_data_from_label.
+                         For example: ["Aatrox", "Master Yi", "DARIUS"].
+                         If a champion name can't be resolved, only that champion's entry will report it along with
+                         a list of suggestions; ask the user which of them they meant.
+        roles: Optional list of roles to keep for every champion, using the dictionary below. Leave empty for all roles.
+               {'Baron': 1, 'Jungle':2, 'Mid':3, 'Dragon':4, 'Support':5}
+        fields: Optional list of fields to keep in each role's data (e.g. ["win_rate", "ban_rate"]). Leave empty for all fields.
+        last_n: Optional number of most recent snapshots to keep per role. Use a small value unless the user asks about trends.
+
+    Return:
+        A JSON list of dictionaries will be returned, one per requested champion, in the requested order.
+        Each has a "champion_label" key and either a "data" key holding that champion's gameplay data history per role
+        (same format as get_champion_data_from_label) or an "error" key explaining why no data was found for it.
+        {1: 'Baron', 2: 'Jungle', 3: 'Mid', 4: 'Dragon', 5: 'Support'}
+
+        Otherwise return an error logger string. Please output the exact logger object if you recieve it.
+    """
+    try:
+        if not champion_labels or not isinstance(champion_labels, list):
+            return create_error_response("Champion labels must be a non-empty list of strings", "get_champion_data_for_multiple_champions")
+
+        if len(champion_labels) > config.API_CONFIG.BATCH_MAX_CHAMPIONS:
+            return create_error_response(f"At most {config.API_CONFIG.BATCH_MAX_CHAMPIONS} champions can be requested at once", "get_champion_data_for_multiple_champions")
+
+        labels = []
+        for champion_label in champion_labels:
+            if not isinstance(champion_label, str) or not champion_label.strip():
+                return create_error_response("Every champion label must be a non-empty string", "get_champion_data_for_multiple_champions")
+            labels.append(champion_label.strip())
+
+        if roles and any(not isinstance(role, int) or role < 1 or role > 5 for role in roles):
+            return create_error_response("Roles must be integers between 1 and 5. 1=Baron, 2=Jungle, 3=Mid, 4=Dragon, 5=Support", "get_champion_data_for_multiple_champions")
+
+        error = validate_history_window(last_n, None, "get_champion_data_for_multiple_champions")
+        if error:
+            return error
+
+        # misspelled names are answered with suggestions from the local roster instead of an upstream request
+        index = await load_roster_index()
+        champions: dict[str, ChampionName | list[ChampionName]] = {}
+        for name in dict.fromkeys(labels):
+            champion = index.resolve(name) if index is not None else ChampionName.from_text(name)
+            champions[name] = champion if champion is not None else index.suggest(name)
+
+        resolved = [champion.label for champion in champions.values() if isinstance(champion, ChampionName)]
+        logger.info(f"Fetching champion data for: {resolved}")
+
+        data_by_label = await get_all_data_for_multiple_champs_all_roles(resolved)
+
+        result = []
+        for name, champion in champions.items():
+            if not isinstance(champion, ChampionName):
+                result.append({
+                    "champion_label": name,
+                    "error": f"No champion named '{name}'. Ask the user which of the suggested champions they meant.",
+                    "suggestions": [suggestion.to_dict() for suggestion in champion]
+                })
+                continue
+
+            champion_label = champion.label
+            data = data_by_label.get(champion_label)
+            if isinstance(data, Exception):
+                result.append({"champion_label": champion_label, "error": f"Could not fetch data for champion '{champion_label}': {type(data).__name__}: {data}"})
+                continue
+
+            if data and roles:
+                data = [entry for entry in data if entry.get('role') in roles]
+
+            if not data:
+                result.append({
+                    "champion_label": champion_label,
+                    "error": f"No data available for champion '{champion_label}'" + (f" in roles {roles}" if roles else "") + ". Please check the spelling or try a different champion name."
+                })
+            else:
+                result.append({"champion_label": champion_label, "data": project(window_history(data, last_n), fields)})
+
+        res = ""
+        res += plib.PROACTIVE_CHAMPION_SUGGESTIONS
+        res += plib.COMPARATIVE_CHAMPION_ANALYSIS
+        res += plib.CHAMPION_TREND_IDENTIFICATION
+        res += dumps(round_floats(result))
+
+        logger.info(f"Successfully retrieved data for {len(result)} champions")
+        return res
+
+    except Exception as e:
+        logger.error(f"Unexpected error in get_champion_data_for_multiple_champions: {traceback.format_exc()}")
+        return create_error_response(f"Unexpected error occurred: {str(e)}", "get_champion_data_for_multiple_champions")
+
+@mcp.tool()
+@instrument_tool
+async def get_most_recent_champ_data_for_all_champs_in_certain_role(role: int, fields: list[str] | None = None) -> str:
     """
     Get gameplay data for a specific WildRift champion
 
@@ -119,9 +392,10 @@ async def get_most_recent_champ_data_for_all_champs_in_certain_role(role: int) -
         If the user is asking for all roles or does not specify a role, the role parameter should be set to 0.
         You will need to convert the role parameter into an integer according to the following dictionary.
         {'Baron': 1, 'Jungle':2, 'Mid':3, 'Dragon':4, 'Support':5}
+        fields: Optional list of fields to keep for each champion (e.g. ["win_rate", "pick_rate"]). Leave empty for all fields.
 
     Return:
-        A stringified list of dictionaries will be returned. Each dictionary represent a champion's
+        A JSON list of dictionaries will be returned. Each dictionary represent a champion's
         gameplay data history for a specific role (indicated by the "role" field). Each number corresponds
         to a different lane assignment for the champion as specified by the dictionary below. Keep in mind 'Baron'
         can also be 'Top' and 'Dragon can be 'ADC' or 'AD Carry'.
@@ -132,58 +406,225 @@ async def get_most_recent_champ_data_for_all_champs_in_certain_role(role: int) -
         Otherwise return an error logger string. Please output the exact logger object if you recieve it.
     """
     try:
-        if not isinstance(role, int):
-            try:
-                role = int(role)
-            except (ValueError, TypeError):
-                return create_error_response("Role must be an integer between 0 and 5", "get_most_recent_champ_data_for_all_champs_in_certain_role")
-        
-        if role < 0 or role > 5:
-            return create_error_response("Role must be between 0 and 5 inclusive. 0=All roles, 1=Baron, 2=Jungle, 3=Mid, 4=Dragon, 5=Support", "get_most_recent_champ_data_for_all_champs_in_certain_role")
+        role, error = validate_role(role, "get_most_recent_champ_data_for_all_champs_in_certain_role")
+        if error:
+            return error
         
         logger.info(f"Fetching champion data for role: {role}")
         
         data = await get_most_recent_data_for_all_champs_by_role(role)
         
         if not data:
-            role_names = {0: 'All roles', 1: 'Baron', 2: 'Jungle', 3: 'Mid', 4: 'Dragon', 5: 'Support'}
-            logger.warning(f"No data found for role: {role}")
-            return json.dumps({
-                "error": False,
-                "message": f"No recent data available for role '{role_names.get(role, role)}'",
-                "data": None
-            })
+            return no_role_data_response(role)
         
         logger.info(f"Successfully retrieved data for role: {role}")
-        return str(data)
+        return dumps(round_floats(project(data, fields)))
         
     except httpx.TimeoutException:
         return create_error_response("Request timed out while fetching role data", "get_most_recent_champ_data_for_all_champs_in_certain_role")
     except httpx.HTTPStatusError as e:
         return create_error_response(f"HTTP error occurred: {e.response.status_code}", "get_most_recent_champ_data_for_all_champs_in_certain_role")
-    except ConnectionError:
-        return create_error_response("Connection error - unable to reach data source", "get_most_recent_champ_data_for_all_champs_in_certain_role")
+    except ConnectionError as e:
+        return create_error_response(f"Connection error - unable to reach data source: {e}", "get_most_recent_champ_data_for_all_champs_in_certain_role")
     except Exception as e:
         logger.error(f"Unexpected error in get_most_recent_champ_data_for_all_champs_in_certain_role: {traceback.format_exc()}")
         return create_error_response(f"Unexpected error occurred: {str(e)}", "get_most_recent_champ_data_for_all_champs_in_certain_role")
 
 @mcp.tool()
+@instrument_tool
+async def get_most_recent_champ_data_from_label(champion_label: str, fields: list[str] | None = None) -> str:
+    """
+    Get only the latest gameplay data for a specific WildRift champion in each role they are played in.
+    Prefer this over get_champion_data_from_label when the user asks about a champion's current stats
+    and not about how they changed over time.
+
+    Args:
+        champion_label: The champion's name, in the same format as get_champion_data_from_label.
+                        If the name can't be resolved, a list of suggestions is returned instead;
+                        ask the user which of them they meant.
+        fields: Optional list of fields to keep in each role's data (e.g. ["win_rate", "ban_rate"]). Leave empty for all fields.
+
+    Return:
+        A JSON list of dictionaries will be returned, one per role the champion has data for
+        (indicated by the "role" field).
+        {1: 'Baron', 2: 'Jungle', 3: 'Mid', 4: 'Dragon', 5: 'Support'}
+
+        Otherwise return an error logger string. Please output the exact logger object if you recieve it.
+    """
+    try:
+        if not champion_label or not isinstance(champion_label, str):
+            return create_error_response("Champion label must be a non-empty string", "get_most_recent_champ_data_from_label")
+
+        if not champion_label.strip():
+            return create_error_response("Champion label cannot be empty or whitespace only", "get_most_recent_champ_data_from_label")
+
+        champion, error = await resolve_champion(champion_label, "get_most_recent_champ_data_from_label")
+        if error:
+            return error
+        champion_label = champion.label
+
+        logger.info(f"Fetching latest champion data for: {champion_label}")
+
+        data = await get_most_recent_data_for_single_champ(champion_label)
+
+        if not data:
+            logger.warning(f"No latest data found for champion: {champion_label}")
+            return json.dumps({
+                "error": False,
+                "message": f"No recent data available for champion '{champion_label}'. Please check the spelling or try a different champion name.",
+                "suggested_action": "Verify champion name spelling and try again",
+                "data": None
+            })
+
+        res = ""
+        res += plib.COMPARATIVE_CHAMPION_ANALYSIS
+        res += dumps(round_floats(project(data, fields)))
+
+        logger.info(f"Successfully retrieved latest data for champion: {champion_label}")
+        return res
+
+    except httpx.TimeoutException:
+        return create_error_response("Request timed out while fetching champion data", "get_most_recent_champ_data_from_label")
+    except httpx.HTTPStatusError as e:
+        return create_error_response(f"HTTP error occurred: {e.response.status_code}", "get_most_recent_champ_data_from_label")
+    except ConnectionError as e:
+        return create_error_response(f"Connection error - unable to reach data source: {e}", "get_most_recent_champ_data_from_label")
+    except Exception as e:
+        logger.error(f"Unexpected error in get_most_recent_champ_data_from_label: {traceback.format_exc()}")
+        return create_error_response(f"Unexpected error occurred: {str(e)}", "get_most_recent_champ_data_from_label")
+
+@mcp.tool()
+@instrument_tool
+async def get_champion_comments(champion_label: str, cursor: str | None = None, limit: int = 20) -> str:
+    """
+    Get player comments about a specific WildRift champion, newest first, one page at a time.
+
+    Args:
+        champion_label: The champion's name, in the same format as get_champion_data_from_label.
+        cursor: Optional "next_cursor" value from a previous call, to get the next (older) page of comments.
+                Leave empty for the newest comments.
+        limit: Number of comments per page, at most 100. Keep it small unless the user asks for more.
+
+    Return:
+        A JSON dictionary with the "champion_label", the page of "comments", the "next_cursor" to pass in
+        for the following page (null on the last page) and the "total" number of comments for the champion.
+
+        Otherwise return an error logger string. Please output the exact logger object if you recieve it.
+    """
+    try:
+        if not champion_label or not isinstance(champion_label, str) or not champion_label.strip():
+            return create_error_response("Champion label must be a non-empty string", "get_champion_comments")
+
+        if not isinstance(limit, int) or limit < 1:
+            return create_error_response("limit must be a positive integer", "get_champion_comments")
+        limit = min(limit, config.API_CONFIG.COMMENTS_PAGE_MAX)
+
+        if cursor:
+            decode_cursor(cursor) # reject a bad cursor before loading anything
+
+        champion, error = await resolve_champion(champion_label, "get_champion_comments")
+        if error:
+            return error
+        champion_label = champion.label
+
+        logger.info(f"Fetching comments for: {champion_label}")
+
+        page = await get_comments_for_one_champ(champion_label, limit, cursor or None)
+
+        if page is None:
+            return json.dumps({
+                "error": False,
+                "message": "No comments are available from the data source",
+                "data": None
+            })
+
+        comments, next_cursor, total = page
+        res = dumps({
+            "champion_label": champion_label,
+            "comments": comments,
+            "next_cursor": next_cursor,
+            "total": total
+        })
+
+        logger.info(f"Returned {len(comments)} of {total} comments for champion: {champion_label}")
+        return res
+
+    except InvalidCursorError as e:
+        return create_error_response(f"{e} - pass the next_cursor of a previous call or leave it empty", "get_champion_comments")
+    except httpx.TimeoutException:
+        return create_error_response("Request timed out while fetching comments", "get_champion_comments")
+    except httpx.HTTPStatusError as e:
+        return create_error_response(f"HTTP error occurred: {e.response.status_code}", "get_champion_comments")
+    except ConnectionError as e:
+        return create_error_response(f"Connection error - unable to reach data source: {e}", "get_champion_comments")
+    except json.JSONDecodeError:
+        return create_error_response("Invalid JSON response from data source", "get_champion_comments")
+    except Exception as e:
+        logger.error(f"Unexpected error in get_champion_comments: {traceback.format_exc()}")
+        return create_error_response(f"Unexpected error occurred: {str(e)}", "get_champion_comments")
+
+@mcp.tool()
+@instrument_tool
+async def get_champion_abilities(champion_label: str) -> str:
+    """
+    Get the ability descriptions (passive and skills) of a specific WildRift champion.
+
+    Args:
+        champion_label: The champion's name, in the same format as get_champion_data_from_label.
+
+    Return:
+        A JSON list of dictionaries will be returned, one per ability.
+
+        Otherwise return an error logger string. Please output the exact logger object if you recieve it.
+    """
+    try:
+        if not champion_label or not isinstance(champion_label, str) or not champion_label.strip():
+            return create_error_response("Champion label must be a non-empty string", "get_champion_abilities")
+
+        champion, error = await resolve_champion(champion_label, "get_champion_abilities")
+        if error:
+            return error
+        champion_label = champion.label
+
+        logger.info(f"Fetching abilities for: {champion_label}")
+
+        abilities = await get_ability_descriptions_for_single_champ(champion_label)
+
+        if not abilities:
+            return json.dumps({
+                "error": False,
+                "message": f"No ability descriptions available for champion '{champion_label}'",
+                "data": None
+            })
+
+        return dumps(abilities)
+
+    except httpx.TimeoutException:
+        return create_error_response("Request timed out while fetching abilities", "get_champion_abilities")
+    except httpx.HTTPStatusError as e:
+        return create_error_response(f"HTTP error occurred: {e.response.status_code}", "get_champion_abilities")
+    except ConnectionError as e:
+        return create_error_response(f"Connection error - unable to reach data source: {e}", "get_champion_abilities")
+    except json.JSONDecodeError:
+        return create_error_response("Invalid JSON response from data source", "get_champion_abilities")
+    except Exception as e:
+        logger.error(f"Unexpected error in get_champion_abilities: {traceback.format_exc()}")
+        return create_error_response(f"Unexpected error occurred: {str(e)}", "get_champion_abilities")
+
+@mcp.tool()
+@instrument_tool
 async def get_matchups_for_champion_for_all_viable_roles(champion_name: str) -> str:
     """
     Get matchup data for a specific WildRift champion to see who they are weak/strong against for all their viable roles
 
     Args:
-        champion_name: A champion's name in the game. This parameter should be set to the champions name in all lowercase. 
-        if the champion has a space in their name, replace it with a '-' character. Also remove all ' characters.
-        Example: Dr. Mundo -> dr-mundo
-        Example: Ms Fortune -> ms-fortune
-        Example: Kai'Sa -> kaisa
-        If the user provides a champion name that doesn't exist or is misspelled, 
-        suggest the closest matching champion names and ask for clarification. 
-        Common misspellings include: 'Yi' for 'Master Yi', 'Kai Sa' for 'Kai'Sa', etc.
+        champion_name: The champion's name as the user wrote it, e.g. "Dr. Mundo", "dr-mundo", "mundo" or "Kai'Sa".
+        Short forms and small misspellings are resolved to the right champion.
+        If the name can't be resolved, a list of suggestions is returned instead;
+        ask the user which of them they meant.
 
     Return:
-        A list of dictionaries will be returned. Each dictionary has a _role_id key where each value corresponds
+        A JSON list of dictionaries will be returned. Each dictionary has a _role_id key where each value corresponds
         to a different lane assignment for the champion as specified by the dictionary below. Keep in mind 'Baron'
         can also be 'Top' and 'Dragon can be 'ADC' or 'AD Carry'.
         {1: 'Baron', 2: 'Jungle', 3: 'Mid', 4: 'Dragon', 5: 'Support'}
@@ -193,7 +634,8 @@ async def get_matchups_for_champion_for_all_viable_roles(champion_name: str) ->
                         '_role_id': an integer from 1-5,
                         'counters': [champions who counter {champion_name}],
                         'good_matchups': [champions who are countered by {champion_name}],
-                        'counter_strategy': a string with info on how to counter the champion
+                        'counter_strategy': a string with info on how to counter the champion,
+                        'counter_slugs' / 'good_matchup_slugs': the wildriftcounter.com slugs of the champions above, in the same order
                     },
                     ...
                  ]
@@ -206,13 +648,17 @@ async def get_matchups_for_champion_for_all_viable_roles(champion_name: str) ->
         if not champion_name or not isinstance(champion_name, str):
             return create_error_response("Champion name must be a non-empty string", "get_matchups_for_champion_for_all_viable_roles")
         
-        champion_name = champion_name.strip().lower()
-        if not champion_name:
+        if not champion_name.strip():
             return create_error_response("Champion name cannot be empty or whitespace only", "get_matchups_for_champion_for_all_viable_roles")
+
+        champion, error = await resolve_champion(champion_name, "get_matchups_for_champion_for_all_viable_roles")
+        if error:
+            return error
+        champion_name = champion.slug
         
         logger.info(f"Fetching matchup data for champion: {champion_name}")
         
-        data = await scrape_matchups(champion_name)
+        data = await get_matchups(champion_name)
         
         if not data:
             logger.warning(f"No matchup data found for champion: {champion_name}")
@@ -224,41 +670,433 @@ async def get_matchups_for_champion_for_all_viable_roles(champion_name: str) ->
             })
         
         logger.info(f"Successfully retrieved matchup data for champion: {champion_name}")
-        return str(data)
+        return dumps(data)
         
     except httpx.TimeoutException:
         return create_error_response("Request timed out while fetching matchup data", "get_matchups_for_champion_for_all_viable_roles")
     except httpx.HTTPStatusError as e:
         return create_error_response(f"HTTP error occurred: {e.response.status_code}", "get_matchups_for_champion_for_all_viable_roles")
-    except ConnectionError:
-        return create_error_response("Connection error - unable to reach data source", "get_matchups_for_champion_for_all_viable_roles")
+    except ConnectionError as e:
+        return create_error_response(f"Connection error - unable to reach data source: {e}", "get_matchups_for_champion_for_all_viable_roles")
     except Exception as e:
         logger.error(f"Unexpected error in get_matchups_for_champion_for_all_viable_roles: {traceback.format_exc()}")
         return create_error_response(f"Unexpected error occurred: {str(e)}", "get_matchups_for_champion_for_all_viable_roles")
 
 @mcp.tool()
+@instrument_tool
+async def get_who_counters_champion(champion_name: str, role: int = 0) -> str:
+    """
+    Get every champion known to counter a specific WildRift champion, and every champion it counters, in one role or all roles.
+    Unlike get_matchups_for_champion_for_all_viable_roles this also uses the matchup pages of all other champions
+    (e.g. a champion listing the given one as a good matchup), answered from a precomputed matchup graph.
+
+    Args:
+        champion_name: The champion's name, in the same format as get_matchups_for_champion_for_all_viable_roles.
+        role: Role of the matchups to use, {'All roles': 0, 'Baron': 1, 'Jungle':2, 'Mid':3, 'Dragon':4, 'Support':5}
+
+    Return:
+        A JSON dictionary with "counters" (champions who beat the given champion) and "good_matchups" (champions it beats),
+        each a list of {"champion_name", "name", "weight"} ordered by weight, the number of matchup pages backing the matchup.
+        "graph" tells how many champion pages the graph was built from and, in "coverage", which share of the roster
+        they are; answers cover only those champions. Without MATCHUP_WARMUP ("warmup": false) the graph only holds the
+        pages of champions asked about before, so tell the user when coverage is low.
+
+        Otherwise return an error logger string. Please output the exact logger object if you recieve it.
+    """
+    try:
+        if not champion_name or not isinstance(champion_name, str) or not champion_name.strip():
+            return create_error_response("Champion name must be a non-empty string", "get_who_counters_champion")
+
+        role, error = validate_role(role, "get_who_counters_champion")
+        if error:
+            return error
+
+        champion, error = await resolve_champion(champion_name, "get_who_counters_champion")
+        if error:
+            return error
+
+        logger.info(f"Looking up counters of {champion.slug} in role {role}")
+
+        graph = await load_matchup_graph([champion.slug])
+        return dumps({**graph.matchups_of(champion.slug, role), "graph": await matchup_graph_summary(graph)})
+
+    except httpx.TimeoutException:
+        return create_error_response("Request timed out while fetching matchup data", "get_who_counters_champion")
+    except httpx.HTTPStatusError as e:
+        return create_error_response(f"HTTP error occurred: {e.response.status_code}", "get_who_counters_champion")
+    except ConnectionError as e:
+        return create_error_response(f"Connection error - unable to reach data source: {e}", "get_who_counters_champion")
+    except Exception as e:
+        logger.error(f"Unexpected error in get_who_counters_champion: {traceback.format_exc()}")
+        return create_error_response(f"Unexpected error occurred: {str(e)}", "get_who_counters_champion")
+
+@mcp.tool()
+@instrument_tool
+async def get_champions_that_counter_all(champion_names: list[str], role: int = 0, n: int = 10) -> str:
+    """
+    Find WildRift champions that counter several champions at once, e.g. "which junglers beat both Lee Sin and Kha'Zix".
+    Answered from a precomputed matchup graph, use this instead of comparing matchup lists yourself.
+
+    Args:
+        champion_names: The champions to counter, in the same format as get_matchups_for_champion_for_all_viable_roles.
+        role: Role of the matchups to use, {'All roles': 0, 'Baron': 1, 'Jungle':2, 'Mid':3, 'Dragon':4, 'Support':5}
+        n: Number of champions to return (1-50).
+
+    Return:
+        A JSON dictionary with "champions": at most n entries of {"champion_name", "name", "beats", "beats_all", "score"},
+        those beating all of the given champions first, then those beating the most of them. "beats" lists which of the
+        given champions it counters and "score" sums the weight of those matchups. "graph" tells how many champion pages
+        the graph was built from and, in "coverage", which share of the roster they are; answers cover only those
+        champions. Without MATCHUP_WARMUP ("warmup": false) the graph only holds the pages of champions asked about
+        before, so tell the user when coverage is low.
+
+        Otherwise return an error logger string. Please output the exact logger object if you recieve it.
+    """
+    try:
+        role, error = validate_role(role, "get_champions_that_counter_all")
+        if error:
+            return error
+
+        if not isinstance(n, int) or n < 1 or n > 50:
+            return create_error_response("n must be an integer between 1 and 50", "get_champions_that_counter_all")
+
+        champions, error = await resolve_champion_list(champion_names, "get_champions_that_counter_all")
+        if error:
+            return error
+        targets = [champion.slug for champion in champions]
+
+        logger.info(f"Looking up champions countering {targets} in role {role}")
+
+        graph = await load_matchup_graph(targets)
+        return dumps({"targets": targets, "role": role, "champions": graph.counters_of_all(targets, role)[:n], "graph": await matchup_graph_summary(graph)})
+
+    except httpx.TimeoutException:
+        return create_error_response("Request timed out while fetching matchup data", "get_champions_that_counter_all")
+    except httpx.HTTPStatusError as e:
+        return create_error_response(f"HTTP error occurred: {e.response.status_code}", "get_champions_that_counter_all")
+    except ConnectionError as e:
+        return create_error_response(f"Connection error - unable to reach data source: {e}", "get_champions_that_counter_all")
+    except Exception as e:
+        logger.error(f"Unexpected error in get_champions_that_counter_all: {traceback.format_exc()}")
+        return create_error_response(f"Unexpected error occurred: {str(e)}", "get_champions_that_counter_all")
+
+@mcp.tool()
+@instrument_tool
+async def get_best_picks_against_team(enemy_champions: list[str], role: int = 0, n: int = 5) -> str:
+    """
+    Recommend WildRift champions to pick against an enemy team composition, from a precomputed matchup graph.
+
+    Args:
+        enemy_champions: The enemy team's champions, in the same format as get_matchups_for_champion_for_all_viable_roles.
+        role: Role the user is going to play, only matchups in that role are used.
+              {'All roles': 0, 'Baron': 1, 'Jungle':2, 'Mid':3, 'Dragon':4, 'Support':5}
+        n: Number of picks to return (1-50).
+
+    Return:
+        A JSON dictionary with "picks": at most n entries of {"champion_name", "name", "score", "beats", "loses_to"},
+        best first. "beats" and "loses_to" list the enemy champions it counters / is countered by, and "score" is the
+        weight of the matchups it wins minus the weight of those it loses. "graph" tells how many champion pages the graph
+        was built from and, in "coverage", which share of the roster they are; answers cover only those champions.
+        Without MATCHUP_WARMUP ("warmup": false) the graph only holds the pages of champions asked about before, so
+        tell the user when coverage is low.
+
+        Otherwise return an error logger string. Please output the exact logger object if you recieve it.
+    """
+    try:
+        role, error = validate_role(role, "get_best_picks_against_team")
+        if error:
+            return error
+
+        if not isinstance(n, int) or n < 1 or n > 50:
+            return create_error_response("n must be an integer between 1 and 50", "get_best_picks_against_team")
+
+        champions, error = await resolve_champion_list(enemy_champions, "get_best_picks_against_team")
+        if error:
+            return error
+        enemies = [champion.slug for champion in champions]
+
+        logger.info(f"Ranking picks against {enemies} in role {role}")
+
+        graph = await load_matchup_graph(enemies)
+        return dumps({"enemies": enemies, "role": role, "picks": graph.best_picks(enemies, role)[:n], "graph": await matchup_graph_summary(graph)})
+
+    except httpx.TimeoutException:
+        return create_error_response("Request timed out while fetching matchup data", "get_best_picks_against_team")
+    except httpx.HTTPStatusError as e:
+        return create_error_response(f"HTTP error occurred: {e.response.status_code}", "get_best_picks_against_team")
+    except ConnectionError as e:
+        return create_error_response(f"Connection error - unable to reach data source: {e}", "get_best_picks_against_team")
+    except Exception as e:
+        logger.error(f"Unexpected error in get_best_picks_against_team: {traceback.format_exc()}")
+        return create_error_response(f"Unexpected error occurred: {str(e)}", "get_best_picks_against_team")
+
+@mcp.tool()
+@instrument_tool
+async def get_top_champions_in_role(role: int, stat: str = "win_rate", n: int = 10, ascending: bool = False) -> str:
+    """
+    Rank WildRift champions in a role by their latest win rate, pick rate or ban rate, computed on the server.
+    Use this instead of get_most_recent_champ_data_for_all_champs_in_certain_role for "best/worst/most picked/most banned" questions.
+
+    Args:
+        role: Role to rank within, converted the same way as get_most_recent_champ_data_for_all_champs_in_certain_role.
+              {'All roles': 0, 'Baron': 1, 'Jungle':2, 'Mid':3, 'Dragon':4, 'Support':5}
+        stat: One of "win_rate", "pick_rate", "ban_rate".
+        n: Number of champions to return (1-50).
+        ascending: Set to true to get the lowest values first (e.g. "worst win rate").
+
+    Return:
+        A JSON list of at most n dictionaries ordered by the stat, each with "champion_label", "role",
+        "win_rate", "pick_rate" and "ban_rate".
+        {1: 'Baron', 2: 'Jungle', 3: 'Mid', 4: 'Dragon', 5: 'Support'}
+
+        Otherwise return an error logger string. Please output the exact logger object if you recieve it.
+    """
+    try:
+        role, error = validate_role(role, "get_top_champions_in_role")
+        if error:
+            return error
+
+        stat, error = validate_stat(stat, "get_top_champions_in_role")
+        if error:
+            return error
+
+        if not isinstance(n, int) or n < 1 or n > 50:
+            return create_error_response("n must be an integer between 1 and 50", "get_top_champions_in_role")
+
+        logger.info(f"Ranking role {role} by {stat}")
+
+        columns = await get_role_columns()
+        if columns is None:
+            return no_role_data_response(role)
+
+        return dumps(round_floats(columns.top(stat, role, n, ascending)))
+
+    except httpx.TimeoutException:
+        return create_error_response("Request timed out while fetching role data", "get_top_champions_in_role")
+    except httpx.HTTPStatusError as e:
+        return create_error_response(f"HTTP error occurred: {e.response.status_code}", "get_top_champions_in_role")
+    except ConnectionError as e:
+        return create_error_response(f"Connection error - unable to reach data source: {e}", "get_top_champions_in_role")
+    except Exception as e:
+        logger.error(f"Unexpected error in get_top_champions_in_role: {traceback.format_exc()}")
+        return create_error_response(f"Unexpected error occurred: {str(e)}", "get_top_champions_in_role")
+
+@mcp.tool()
+@instrument_tool
+async def get_role_stat_summary(role: int) -> str:
+    """
+    Get the average, median, standard deviation, min, max and quartiles of win rate, pick rate and ban rate
+    across all champions in a role. Use this when comparing a champion against its role average or median.
+
+    Args:
+        role: Role to summarize, converted the same way as get_most_recent_champ_data_for_all_champs_in_certain_role.
+              {'All roles': 0, 'Baron': 1, 'Jungle':2, 'Mid':3, 'Dragon':4, 'Support':5}
+
+    Return:
+        A JSON dictionary with "role", "champion_count" and one entry per stat holding
+        "mean", "median", "std", "min", "max", "p25" and "p75".
+
+        Otherwise return an error logger string. Please output the exact logger object if you recieve it.
+    """
+    try:
+        role, error = validate_role(role, "get_role_stat_summary")
+        if error:
+            return error
+
+        logger.info(f"Summarizing role {role}")
+
+        columns = await get_role_columns()
+        if columns is None:
+            return no_role_data_response(role)
+
+        return dumps(round_floats(columns.summary(role)))
+
+    except httpx.TimeoutException:
+        return create_error_response("Request timed out while fetching role data", "get_role_stat_summary")
+    except httpx.HTTPStatusError as e:
+        return create_error_response(f"HTTP error occurred: {e.response.status_code}", "get_role_stat_summary")
+    except ConnectionError as e:
+        return create_error_response(f"Connection error - unable to reach data source: {e}", "get_role_stat_summary")
+    except Exception as e:
+        logger.error(f"Unexpected error in get_role_stat_summary: {traceback.format_exc()}")
+        return create_error_response(f"Unexpected error occurred: {str(e)}", "get_role_stat_summary")
+
+@mcp.tool()
+@instrument_tool
+async def get_champion_percentile_in_role(champion_label: str, role: int) -> str:
+    """
+    Get where a champion's latest win rate, pick rate and ban rate rank among all champions in a role.
+
+    Args:
+        champion_label: The champion's name, in the same format as get_champion_data_from_label.
+        role: The role to compare within, 'All roles' (0) isn't accepted. {'Baron': 1, 'Jungle':2, 'Mid':3, 'Dragon':4, 'Support':5}
+
+    Return:
+        A JSON dictionary with the champion's stats, a "<stat>_percentile" (0-100) for every stat and
+        a "<stat>_vs_role_mean" difference from the role average, both null when the stat is missing.
+
+        Otherwise return an error logger string. Please output the exact logger object if you recieve it.
+    """
+    try:
+        if not champion_label or not isinstance(champion_label, str) or not champion_label.strip():
+            return create_error_response("Champion label must be a non-empty string", "get_champion_percentile_in_role")
+
+        role, error = validate_role(role, "get_champion_percentile_in_role")
+        if error:
+            return error
+        if role == 0:
+            return create_error_response("Role must be one of 1-5, a champion is ranked within a single role", "get_champion_percentile_in_role")
+
+        champion, error = await resolve_champion(champion_label, "get_champion_percentile_in_role")
+        if error:
+            return error
+        champion_label = champion.label
+
+        logger.info(f"Computing percentile of {champion_label} in role {role}")
+
+        columns = await get_role_columns()
+        if columns is None:
+            return no_role_data_response(role)
+
+        result = columns.percentile(champion_label, role)
+        if result is None:
+            return json.dumps({
+                "error": False,
+                "message": f"No recent data available for champion '{champion_label}' in role '{ROLE_NAMES[role]}'",
+                "data": None
+            })
+
+        return dumps(round_floats(result))
+
+    except httpx.TimeoutException:
+        return create_error_response("Request timed out while fetching role data", "get_champion_percentile_in_role")
+    except httpx.HTTPStatusError as e:
+        return create_error_response(f"HTTP error occurred: {e.response.status_code}", "get_champion_percentile_in_role")
+    except ConnectionError as e:
+        return create_error_response(f"Connection error - unable to reach data source: {e}", "get_champion_percentile_in_role")
+    except Exception as e:
+        logger.error(f"Unexpected error in get_champion_percentile_in_role: {traceback.format_exc()}")
+        return create_error_response(f"Unexpected error occurred: {str(e)}", "get_champion_percentile_in_role")
+
+@mcp.tool()
+@instrument_tool
+async def filter_champions_in_role(
+    role: int,
+    min_win_rate: float | None = None,
+    max_win_rate: float | None = None,
+    min_pick_rate: float | None = None,
+    max_pick_rate: float | None = None,
+    min_ban_rate: float | None = None,
+    max_ban_rate: float | None = None,
+    sort_by: str = "win_rate"
+) -> str:
+    """
+    Get the champions in a role whose latest stats fall within the given thresholds,
+    e.g. "junglers above 52% win rate with less than 5% ban rate".
+
+    Args:
+        role: Role to filter within. {'All roles': 0, 'Baron': 1, 'Jungle':2, 'Mid':3, 'Dragon':4, 'Support':5}
+        min_win_rate, max_win_rate, min_pick_rate, max_pick_rate, min_ban_rate, max_ban_rate:
+            Optional inclusive thresholds, in the same units as the data (percentages).
+        sort_by: Stat to sort the matches by, highest first. One of "win_rate", "pick_rate", "ban_rate".
+
+    Return:
+        A JSON list of dictionaries, each with "champion_label", "role", "win_rate", "pick_rate" and "ban_rate".
+
+        Otherwise return an error logger string. Please output the exact logger object if you recieve it.
+    """
+    try:
+        role, error = validate_role(role, "filter_champions_in_role")
+        if error:
+            return error
+
+        sort_by, error = validate_stat(sort_by, "filter_champions_in_role")
+        if error:
+            return error
+
+        minimums = {stat: value for stat, value in (("win_rate", min_win_rate), ("pick_rate", min_pick_rate), ("ban_rate", min_ban_rate)) if value is not None}
+        maximums = {stat: value for stat, value in (("win_rate", max_win_rate), ("pick_rate", max_pick_rate), ("ban_rate", max_ban_rate)) if value is not None}
+
+        logger.info(f"Filtering role {role} with minimums {minimums} and maximums {maximums}")
+
+        columns = await get_role_columns()
+        if columns is None:
+            return no_role_data_response(role)
+
+        return dumps(round_floats(columns.filter(role, minimums, maximums, sort_by)))
+
+    except httpx.TimeoutException:
+        return create_error_response("Request timed out while fetching role data", "filter_champions_in_role")
+    except httpx.HTTPStatusError as e:
+        return create_error_response(f"HTTP error occurred: {e.response.status_code}", "filter_champions_in_role")
+    except ConnectionError as e:
+        return create_error_response(f"Connection error - unable to reach data source: {e}", "filter_champions_in_role")
+    except Exception as e:
+        logger.error(f"Unexpected error in filter_champions_in_role: {traceback.format_exc()}")
+        return create_error_response(f"Unexpected error occurred: {str(e)}", "filter_champions_in_role")
+
+@mcp.tool()
+@instrument_tool
 async def health_check() -> str:
     """
     Health check endpoint to verify server status
     
     Return:
-        Status information about the server
+        Status information about the server, including per-tool and upstream latency percentiles,
+        error counts, cache hit rates, HTTP connection pool usage, upstream circuit states, current adaptive timeouts
+        and the most requested keys the prefetch scheduler keeps warm
     """
     try:
         return json.dumps({
             "status": "healthy",
             "message": "MCP server is running normally",
             "server_name": "statsWR",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now().isoformat(),
+            **health_summary(),
+            **resilience_stats(),
+            "history_store": history_store_stats(),
+            "shared_cache": shared_store_stats(),
+            "prefetch": prefetch_stats()
         })
     except Exception as e:
         logger.error(f"Health check failed: {e}")
         return create_error_response(f"Health check failed: {str(e)}", "health_check")
 
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics(request: Request) -> PlainTextResponse:
+    """Prometheus scrape endpoint, served next to the MCP app"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+async def prewarm() -> None:
+    """Open the upstream connection pool and load the role snapshot before the first tool call"""
+    try:
+        await start_http_client()
+        snapshot = await get_role_snapshot()
+    except Exception as e:
+        # runs during the Lambda init phase, any failure must leave startup going: the first tool call fetches the snapshot again
+        logger.warning(f"Prewarm could not load the role snapshot: {e}")
+        return
+    logger.info("Prewarm finished", extra={"snapshot_rows": len(snapshot.rows) if snapshot else 0})
+
+async def run_streamable_http_server() -> None:
+    """Run the streamable-http server with the shared HTTP client and background jobs alive for its whole lifetime"""
+    await start_http_client()
+    if config.API_CONFIG.PREWARM_ON_INIT:
+        await prewarm()
+    start_matchup_warmup()
+    start_prefetch_scheduler()
+    try:
+        await mcp.run_streamable_http_async()
+    finally:
+        await stop_prefetch_scheduler()
+        await stop_matchup_warmup()
+        await close_shared_store()
+        await close_http_client()
+
 if __name__ == "__main__":
     try:
         logger.info("Starting MCP server...")
-        mcp.run(transport="streamable-http")
+        anyio.run(run_streamable_http_server)
     except KeyboardInterrupt:
         logger.info("Server shutdown requested by user")
     except Exception as e:
@@ -1,5 +1,11 @@
 from .matchups import *
+from .matchup_store import *
+from .matchup_warmup import *
 
 __all__ = [
     "scrape_matchups",
-]
\ No newline at end of file
+    "get_matchups",
+    "get_champion_roster",
+    "start_matchup_warmup",
+    "stop_matchup_warmup",
+]
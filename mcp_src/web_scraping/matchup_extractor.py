@@ -0,0 +1,135 @@
+# single-pass matchup extractor for wildriftcounter.com champion pages
+#
+# Parses the page once with lxml (no BeautifulSoup tree), then walks the tree once to index every
+# gallery-<n> div and centered role paragraph. Role sections are resolved against that index
+# instead of searching the whole document for each gallery id.
+
+import re
+from typing import Any
+
+VALID_ROLES = {'Top':1, 'Jungler':2, 'Mid':3, 'Bot':4, 'Bottom':4, 'Support':5}
+
+MAX_GALLERY_ID = 20 # stop looking for the first gallery of a role section here
+
+_GALLERY_ID = re.compile(r'gallery-([1-9][0-9]*)')
+_CHAMPION_PATH = re.compile(r'/champions/([a-z0-9-]+)/?$')
+
+_parser = None
+
+def _parse_document(html_text:bytes):
+    # lxml is imported on the first scrape rather than at server start
+    global _parser
+    import lxml.html
+
+    if _parser is None:
+        _parser = lxml.html.HTMLParser(encoding='utf-8', remove_blank_text=False)
+
+    return lxml.html.document_fromstring(html_text, parser=_parser)
+
+def _next_element(element):
+    # lxml also returns comments / processing instructions as siblings, skip them like bs4's find_next_sibling()
+    sibling = element.getnext()
+    while sibling is not None and not isinstance(sibling.tag, str):
+        sibling = sibling.getnext()
+    return sibling
+
+def _champion_slug(href:str) -> str | None:
+    match = _CHAMPION_PATH.search(href.split('?', 1)[0].split('#', 1)[0])
+    return match.group(1) if match else None
+
+def _caption_links(gallery) -> tuple[list[str], list[str | None]]:
+    # (caption names, champion page slugs of their links), aligned
+    names, slugs = [], []
+    for figcaption in gallery.iter('figcaption'):
+        link = next(figcaption.iter('a'), None)
+        if link is not None:
+            names.append(str(link.text_content()))
+            slugs.append(_champion_slug(link.get('href', '')))
+    return names, slugs
+
+def _counter_strategy(gallery) -> str:
+    # strategy paragraphs follow the block (gallery -> column div -> columns div) that holds the galleries
+    ancestors = gallery.iterancestors('div')
+    next(ancestors, None)
+    block = next(ancestors, None)
+    if block is None:
+        return ""
+
+    info = []
+    sibling = _next_element(block)
+    while sibling is not None and sibling.tag == 'p':
+        info.append(str(sibling.text_content()))
+        sibling = _next_element(sibling)
+    if info and info[-1] in VALID_ROLES:
+        info.pop()
+
+    return " ".join(info)
+
+def extract_matchups(html_text:str | bytes) -> list[Any]:
+    if isinstance(html_text, str):
+        html_text = html_text.encode('utf-8')
+    if not html_text.strip():
+        return []
+
+    root = _parse_document(html_text)
+
+    galleries = {}
+    role_paragraphs = []
+    for element in root.iter('div', 'p'):
+        if element.tag == 'div':
+            match = _GALLERY_ID.fullmatch(element.get('id', ''))
+            if match:
+                galleries.setdefault(int(match.group(1)), element)
+        elif 'has-text-align-center' in element.get('class', '').split():
+            role = str(element.text_content())
+            if role in VALID_ROLES:
+                role_paragraphs.append(role)
+
+    result = []
+    gallery_counter = 1
+
+    for role in role_paragraphs:
+        while gallery_counter not in galleries and gallery_counter < MAX_GALLERY_ID:
+            gallery_counter += 1 # APPARENTLY GALLERY DOESN'T ALWAYS START AT 1
+
+        counters_gallery = galleries.get(gallery_counter)
+        good_matchups_gallery = galleries.get(gallery_counter + 1)
+        if gallery_counter == MAX_GALLERY_ID or counters_gallery is None or good_matchups_gallery is None:
+            result.append('there was an error scraping')
+            break
+        gallery_counter += 2
+
+        counters, counter_slugs = _caption_links(counters_gallery)
+        good_matchups, good_matchup_slugs = _caption_links(good_matchups_gallery)
+        result.append({
+            '_role_id': VALID_ROLES[role],
+            'counters': counters,
+            'good_matchups': good_matchups,
+            'counter_strategy': _counter_strategy(good_matchups_gallery),
+            'counter_slugs': counter_slugs,
+            'good_matchup_slugs': good_matchup_slugs
+        })
+
+    return result
+
+def extract_champion_slugs(html_text:str | bytes) -> list[str]:
+    # champion page slugs linked from a page (e.g. the /champions/ index), in first-seen order
+    if isinstance(html_text, str):
+        html_text = html_text.encode('utf-8')
+    if not html_text.strip():
+        return []
+
+    root = _parse_document(html_text)
+
+    slugs = {}
+    for link in root.iter('a'):
+        slug = _champion_slug(link.get('href', ''))
+        if slug:
+            slugs.setdefault(slug, None)
+
+    return list(slugs)
+
+__all__ = [
+    "extract_matchups",
+    "extract_champion_slugs",
+]
@@ -0,0 +1,150 @@
+# persistent SQLite store of parsed matchups, keyed by wildriftcounter.com champion slug
+
+import json
+import time
+import asyncio
+import logging
+import sqlite3
+import threading
+from typing import Any
+from mcp_src.mcp_configs import config
+from mcp_src.caching import record_access
+from .matchups import scrape_matchups
+
+logger = logging.getLogger(__name__)
+
+class MatchupStore:
+    """
+    Parsed scrape_matchups results with the time they were fetched.
+
+    Methods block on SQLite (and on other processes' writes to the same file), async callers run them with
+    asyncio.to_thread. The file is opened by the first of them, so never on the event loop.
+    """
+
+    def __init__(self, path:str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # called with the lock held
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS matchups ("
+                "slug TEXT PRIMARY KEY, "
+                "fetched_at REAL NOT NULL, "
+                "data TEXT NOT NULL, "
+                "seq INTEGER NOT NULL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS matchups_seq ON matchups (seq)")
+        return self._connection
+
+    def get(self, slug:str) -> tuple[list[Any], float] | None:
+        with self._lock:
+            row = self._connect().execute("SELECT data, fetched_at FROM matchups WHERE slug = ?", (slug,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def put(self, slug:str, data:list[Any], fetched_at:float | None = None) -> None:
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        with self._lock:
+            # numbered inside the write, so sequence numbers follow commit order across processes too
+            self._connect().execute(
+                "INSERT OR REPLACE INTO matchups (slug, fetched_at, data, seq) "
+                "VALUES (?, ?, ?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM matchups))",
+                (slug, fetched_at, json.dumps(data, separators=(',', ':')))
+            )
+
+    def fetched_at_of(self, slug:str) -> float | None:
+        with self._lock:
+            row = self._connect().execute("SELECT fetched_at FROM matchups WHERE slug = ?", (slug,)).fetchone()
+        return None if row is None else row[0]
+
+    def changed_since(self, seq:int | None) -> tuple[list[tuple[str, list[Any]]], int]:
+        """Pages written after write number seq (every page for None) and the newest write number seen"""
+        with self._lock:
+            if seq is None:
+                rows = self._connect().execute("SELECT slug, data, seq FROM matchups").fetchall()
+            else:
+                rows = self._connect().execute("SELECT slug, data, seq FROM matchups WHERE seq > ?", (seq,)).fetchall()
+        newest = max((row_seq for _, _, row_seq in rows), default=seq or 0)
+        return [(slug, json.loads(data)) for slug, data, _ in rows], newest
+
+    def fetched_at(self) -> dict[str, float]:
+        with self._lock:
+            rows = self._connect().execute("SELECT slug, fetched_at FROM matchups").fetchall()
+        return dict(rows)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM matchups").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+_store: MatchupStore | None = None
+_inflight: dict[str, asyncio.Task] = {}
+
+def get_matchup_store() -> MatchupStore:
+    global _store
+
+    if _store is None:
+        _store = MatchupStore(config.API_CONFIG.MATCHUP_STORE_PATH)
+
+    return _store
+
+def _is_storable(data:list[Any]) -> bool:
+    # don't persist unknown champions or partially scraped pages
+    return bool(data) and all(isinstance(role, dict) for role in data)
+
+async def _scrape_and_store(champion_name:str) -> list[Any]:
+    data = await scrape_matchups(champion_name)
+    if _is_storable(data):
+        await asyncio.to_thread(get_matchup_store().put, champion_name, data)
+    return data
+
+def refresh_matchups(champion_name:str) -> asyncio.Task:
+    # one live scrape per champion at a time, shared by every caller that needs it
+    task = _inflight.get(champion_name)
+    if task is None:
+        task = asyncio.create_task(_scrape_and_store(champion_name))
+        _inflight[champion_name] = task
+        task.add_done_callback(lambda _: _inflight.pop(champion_name, None))
+    return task
+
+def _log_refresh_failure(champion_name:str, task:asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Background matchup refresh for {champion_name} failed: {task.exception()}")
+
+async def matchups_expire_in(champion_name:str) -> float | None:
+    # seconds until stored matchups pass MATCHUP_STORE_MAX_AGE, None if the champion was never stored
+    fetched_at = await asyncio.to_thread(get_matchup_store().fetched_at_of, champion_name)
+    if fetched_at is None:
+        return None
+    return fetched_at + config.API_CONFIG.MATCHUP_STORE_MAX_AGE - time.time()
+
+async def get_matchups(champion_name:str) -> list[Any]:
+    """Serve matchups from the local store, scraping live only when the champion has never been stored"""
+    record_access("matchups", champion_name)
+    stored = await asyncio.to_thread(get_matchup_store().get, champion_name)
+
+    if stored is not None:
+        data, fetched_at = stored
+        if time.time() - fetched_at > config.API_CONFIG.MATCHUP_STORE_MAX_AGE and champion_name not in _inflight:
+            refresh_matchups(champion_name).add_done_callback(lambda t: _log_refresh_failure(champion_name, t))
+        return data
+
+    return await asyncio.shield(refresh_matchups(champion_name))
+
+__all__ = [
+    "MatchupStore",
+    "get_matchup_store",
+    "get_matchups",
+    "matchups_expire_in",
+    "refresh_matchups"
+]
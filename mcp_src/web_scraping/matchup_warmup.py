@@ -0,0 +1,111 @@
+# background crawl of the whole wildriftcounter.com roster into the matchup store
+
+import time
+import asyncio
+import logging
+from mcp_src.mcp_configs import config
+from mcp_src.caching import AsyncTTLCache
+from mcp_src.api_requests.resilience import UPSTREAM_FAILURES, CircuitOpenError, resilient_get
+from .matchup_extractor import extract_champion_slugs
+from .matchup_store import get_matchup_store, refresh_matchups
+
+logger = logging.getLogger(__name__)
+
+_warmup_task: asyncio.Task | None = None
+
+_roster_cache = AsyncTTLCache(
+    "champion_roster",
+    max_entries=1,
+    ttl=config.API_CONFIG.MATCHUP_STORE_MAX_AGE, # the roster only changes with champion releases
+    stale_ttl=config.API_CONFIG.MATCHUP_STORE_MAX_AGE,
+    negative_ttl=config.API_CONFIG.CACHE_NEGATIVE_TTL,
+    fallback_on=UPSTREAM_FAILURES
+)
+
+async def fetch_champion_roster() -> list[str]:
+    url = f'{config.API_CONFIG.MATCHUPS_BASE_URL}/champions/'
+
+    response = await resilient_get(url, timeout=config.API_CONFIG.SCRAPER_TIMEOUT, headers=config.API_CONFIG.SCRAPER_HEADERS, follow_redirects=True)
+    response.raise_for_status()
+
+    return extract_champion_slugs(response.text)
+
+async def get_champion_roster() -> list[str] | None:
+    """Every champion page slug on wildriftcounter.com, cached; None when the index page lists none"""
+    async def fetch() -> list[str] | None:
+        return await fetch_champion_roster() or None
+
+    return await _roster_cache.get_or_fetch(0, fetch)
+
+async def warm_matchup_store_once() -> int:
+    """Scrape every champion whose stored matchups are missing or older than MATCHUP_STORE_MAX_AGE, returns the number refreshed"""
+    roster = await fetch_champion_roster()
+    fetched_at = await asyncio.to_thread(get_matchup_store().fetched_at)
+    cutoff = time.time() - config.API_CONFIG.MATCHUP_STORE_MAX_AGE
+
+    # never stored first, then oldest first
+    due = sorted(
+        (slug for slug in roster if fetched_at.get(slug, 0) < cutoff),
+        key=lambda slug: fetched_at.get(slug, 0)
+    )
+
+    delay = 1 / config.API_CONFIG.MATCHUP_WARMUP_RATE
+    refreshed = 0
+    for slug in due:
+        started = time.monotonic()
+        try:
+            if await refresh_matchups(slug):
+                refreshed += 1
+        except CircuitOpenError as e:
+            # the site is down, the rest of the pass would only fail fast too
+            logger.warning(f"Matchup warmup pass stopped: {e}")
+            break
+        except Exception as e:
+            logger.warning(f"Matchup warmup failed for {slug}: {e}")
+        await asyncio.sleep(max(0, delay - (time.monotonic() - started)))
+
+    return refreshed
+
+async def _warmup_loop() -> None:
+    while True:
+        try:
+            refreshed = await warm_matchup_store_once()
+            logger.info(f"Matchup warmup pass refreshed {refreshed} champions")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Matchup warmup pass failed: {e}")
+        await asyncio.sleep(config.API_CONFIG.MATCHUP_WARMUP_INTERVAL)
+
+def start_matchup_warmup() -> asyncio.Task | None:
+    global _warmup_task
+
+    if not config.API_CONFIG.MATCHUP_WARMUP:
+        return None
+
+    if _warmup_task is None or _warmup_task.done():
+        _warmup_task = asyncio.create_task(_warmup_loop())
+        logger.info("Started matchup warmup")
+
+    return _warmup_task
+
+async def stop_matchup_warmup() -> None:
+    global _warmup_task
+
+    if _warmup_task is not None and not _warmup_task.done():
+        _warmup_task.cancel()
+        try:
+            await _warmup_task
+        except asyncio.CancelledError:
+            pass
+        logger.info("Stopped matchup warmup")
+
+    _warmup_task = None
+
+__all__ = [
+    "fetch_champion_roster",
+    "get_champion_roster",
+    "warm_matchup_store_once",
+    "start_matchup_warmup",
+    "stop_matchup_warmup"
+]
@@ -1,61 +1,58 @@
 import asyncio
-from bs4 import BeautifulSoup
-import requests
-import time
+from collections import OrderedDict
+from typing import Any
+from mcp_src.mcp_configs import config
+from mcp_src.api_requests.resilience import resilient_get
+from .matchup_extractor import extract_matchups
 
 # MAY HAVE TO UNINSTALL .venv AND REINSTALL, THEN RUN REQUESTS BELOW
 # uv pip install .
-# uv pip install requests
-# uv pip install beautifulsoup4
 # uv pip install lxml
 
-# https://www.crummy.com/software/BeautifulSoup/bs4/doc/#find-next-siblings-and-find-next-sibling
+class _ScrapedPage:
+    __slots__ = ("etag", "last_modified", "result")
 
-def scrape_website(url):
-    req = requests.get(url)
-    return req.text
+    def __init__(self, etag:str | None, last_modified:str | None, result:list[Any]):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.result = result
 
-async def scrape_matchups(champion_name):
-    url = f'https://wildriftcounter.com/champions/{champion_name}/'
+# url -> validators and parsed result of the last 200 response, used to send conditional requests
+_scraped_pages: OrderedDict[str, _ScrapedPage] = OrderedDict()
+
+def _remember_page(url:str, page:_ScrapedPage) -> None:
+    _scraped_pages[url] = page
+    _scraped_pages.move_to_end(url)
+    while len(_scraped_pages) > config.API_CONFIG.SCRAPER_CACHE_MAX_ENTRIES:
+        _scraped_pages.popitem(last=False)
 
-    html_text = await asyncio.to_thread(scrape_website, url)
-    soup = BeautifulSoup(html_text, 'lxml')
+async def scrape_matchups(champion_name):
+    url = f'{config.API_CONFIG.MATCHUPS_BASE_URL}/champions/{champion_name}/'
 
-    result = []
-    gallery_counter = 1
+    headers = dict(config.API_CONFIG.SCRAPER_HEADERS)
+    cached = _scraped_pages.get(url)
+    if cached is not None:
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
 
-    valid_roles = {'Top':1, 'Jungler':2, 'Mid':3, 'Bot':4, 'Bottom':4, 'Support':5}
-    necessary_paragraph = soup.find_all('p', class_="has-text-align-center")
-    for paragraph in necessary_paragraph:
-        if paragraph.text in valid_roles:
+    response = await resilient_get(url, timeout=config.API_CONFIG.SCRAPER_TIMEOUT, headers=headers, follow_redirects=True)
 
-            while not soup.find('div', id = f'gallery-{gallery_counter}') and gallery_counter < 20:
-                gallery_counter += 1 # APPARENTLY GALLERY DOESN'T ALWAYS START AT 1
+    if response.status_code == 304 and cached is not None:
+        _scraped_pages.move_to_end(url)
+        return cached.result
 
-            if gallery_counter == 20:
-                result.append('there was an error scraping')
-                break
+    if response.status_code == 404: # unknown champion
+        return []
 
-            counters_container = soup.find('div', id = f'gallery-{gallery_counter}')
-            gallery_counter += 1
-            counters_figcaptions = counters_container.find_all('figcaption')
-            good_matchups_container = soup.find('div', id = f'gallery-{gallery_counter}')
-            gallery_counter += 1
-            good_matchups_figcaptions = good_matchups_container.find_all('figcaption')
-            counters = list(map(lambda x: x.a.text, counters_figcaptions))
-            good_matchups = list(map(lambda x: x.a.text, good_matchups_figcaptions))
+    response.raise_for_status()
+    result = extract_matchups(response.text)
 
-            parent = good_matchups_container.find_parent('div').find_parent('div')
-            sibling = parent.find_next_sibling()
-            info = []
-            while sibling and sibling.name == 'p': # returns 'p' 
-                info.append(sibling.text)
-                sibling = sibling.find_next_sibling()
-            if info and info[-1] in valid_roles:
-                info.pop()
-                
-            data = {'_role_id':valid_roles[paragraph.text], 'counters':counters, 'good_matchups':good_matchups, 'counter_strategy':" ".join(info)}
-            result.append(data)
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if etag or last_modified:
+        _remember_page(url, _ScrapedPage(etag, last_modified, result))
 
     return result
 
@@ -0,0 +1,43 @@
+import pytest
+from mcp_src.api_requests.champion.comments import CommentIndex, InvalidCursorError, decode_cursor
+
+def _comment(text:str, comment_id:object = None, date:str = "2026-01-01") -> dict:
+    comment = {"champion": "Ahri", "date": date, "text": text}
+    if comment_id is not None:
+        comment["id"] = comment_id
+    return comment
+
+def _texts(comments:list[dict]) -> list[str]:
+    return [comment["text"] for comment in comments]
+
+def test_numeric_ids_are_ordered_as_numbers():
+    index = CommentIndex([_comment("nine", 9), _comment("ten", "10"), _comment("two", 2)])
+
+    comments, _ = index.page("AHRI", 10)
+
+    assert _texts(comments) == ["ten", "nine", "two"]
+
+def test_cursor_pages_through_every_comment_once():
+    index = CommentIndex([_comment(f"c{i}", i) for i in range(1, 6)])
+
+    first, cursor = index.page("AHRI", 2)
+    second, cursor = index.page("AHRI", 2, cursor)
+    third, cursor = index.page("AHRI", 2, cursor)
+
+    assert _texts(first + second + third) == ["c5", "c4", "c3", "c2", "c1"]
+    assert cursor is None
+
+def test_cursor_of_comments_without_ids_survives_a_reload():
+    comments = [_comment(f"c{i}", date=f"2026-01-0{i}") for i in range(1, 5)]
+    _, cursor = CommentIndex(comments).page("AHRI", 2)
+
+    # the reloaded bulk response lists the comments in another order and holds a new one
+    reloaded = CommentIndex([_comment("new", date="2026-01-09")] + comments[::-1])
+    older, _ = reloaded.page("AHRI", 2, cursor)
+
+    assert _texts(older) == ["c2", "c1"]
+
+@pytest.mark.parametrize("cursor", ["not base64 !", "WyJhIiwiYiJd"])
+def test_foreign_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
@@ -0,0 +1,71 @@
+from mcp_src.api_requests.champion.history_store import ChampionHistory, HistoryStore
+
+def _history(dates:list[str], win_rates:list[float]) -> ChampionHistory:
+    return ChampionHistory.from_rows([{
+        "label": "AHRI",
+        "role": 3,
+        "history": [{"date": date, "win_rate": win_rate, "tier": "A"} for date, win_rate in zip(dates, win_rates)]
+    }])
+
+def _win_rates(history:ChampionHistory) -> list[float]:
+    return [point["win_rate"] for point in history.entries()[0]["history"]]
+
+def test_same_date_row_with_new_values_overwrites_newest_snapshot():
+    history = _history(["2026-01-01", "2026-01-02", "2026-01-03"], [50.0, 52.0, 55.0])
+
+    assert history.apply_snapshot([{"label": "AHRI", "role": 3, "date": "2026-01-03", "win_rate": 99.0}])
+
+    assert _win_rates(history) == [50.0, 52.0, 99.0]
+    assert history.entries()[0]["history"][-1]["tier"] == "A"
+
+def test_same_date_row_with_same_values_changes_nothing():
+    history = _history(["2026-01-01", "2026-01-02"], [50.0, 52.0])
+
+    assert history.apply_snapshot([{"label": "AHRI", "role": 3, "date": "2026-01-02", "win_rate": 52.0}])
+
+    assert _win_rates(history) == [50.0, 52.0]
+
+def test_next_snapshot_is_appended_and_a_gap_forces_a_full_resync():
+    history = _history(["2026-01-01", "2026-01-02"], [50.0, 52.0])
+
+    assert history.apply_snapshot([{"label": "AHRI", "role": 3, "date": "2026-01-03", "win_rate": 53.0}])
+    assert _win_rates(history) == [50.0, 52.0, 53.0]
+
+    assert not history.apply_snapshot([{"label": "AHRI", "role": 3, "date": "2026-01-09", "win_rate": 54.0}])
+
+def test_intraday_timestamps_stay_distinct():
+    history = _history(["2026-01-01T00:00:00", "2026-01-01T06:00:00", "2026-01-01T12:00:00"], [50.0, 51.0, 52.0])
+
+    assert history.apply_snapshot([{"label": "AHRI", "role": 3, "date": "2026-01-01T18:00:00", "win_rate": 53.0}])
+
+    assert _win_rates(history) == [50.0, 51.0, 52.0, 53.0]
+
+def test_timestamped_row_falls_on_its_day_in_a_daily_history():
+    history = _history(["2026-01-01", "2026-01-02"], [50.0, 52.0])
+
+    assert history.apply_snapshot([{"label": "AHRI", "role": 3, "created_at": "2026-01-02T09:30:00Z", "win_rate": 53.0}])
+
+    assert _win_rates(history) == [50.0, 53.0]
+    assert history.entries()[0]["history"][-1]["date"] == "2026-01-02"
+
+def test_persisted_history_is_loaded_back_by_a_new_store(tmp_path):
+    path = str(tmp_path / "history.sqlite3")
+    history = _history(["2026-01-01", "2026-01-02"], [50.0, 52.0])
+    store = HistoryStore(8, path)
+    store.save("AHRI", history.entries())
+    store.close()
+
+    restarted = HistoryStore(8, path)
+    loaded = restarted.load("AHRI")
+
+    assert _win_rates(loaded) == [50.0, 52.0]
+    assert loaded.apply_snapshot([{"label": "AHRI", "role": 3, "date": "2026-01-03", "win_rate": 53.0}])
+    assert _win_rates(loaded) == [50.0, 52.0, 53.0]
+    assert restarted.load("ZED") is None
+    restarted.close()
+
+def test_store_without_a_path_keeps_histories_in_memory_only():
+    store = HistoryStore(8)
+    store.save("AHRI", _history(["2026-01-01"], [50.0]).entries())
+
+    assert store.load("AHRI") is None
@@ -0,0 +1,59 @@
+from mcp_src.analytics.matchup_graph import MatchupGraph
+from mcp_src.web_scraping.matchup_store import MatchupStore
+
+def _section(role:int, counters:list[str], good_matchups:list[str]) -> dict:
+    return {"_role_id": role, "counters": counters, "good_matchups": good_matchups}
+
+def test_matchup_in_several_role_sections_counts_once_per_page_and_role():
+    graph = MatchupGraph()
+    graph.add_page("ahri", [_section(3, ["Zed"], []), _section(4, ["Zed"], []), _section(3, ["Zed"], [])])
+
+    assert graph.beaten_by("ahri", 0) == {"zed": 1}
+    assert graph.beaten_by("ahri", 3) == {"zed": 1}
+    assert graph.beaten_by("ahri", 4) == {"zed": 1}
+
+def test_edge_backed_by_both_pages_weighs_two():
+    graph = MatchupGraph()
+    graph.add_page("ahri", [_section(3, ["Zed"], [])])
+    graph.add_page("zed", [_section(3, [], ["Ahri"])])
+
+    assert graph.beats("zed", 3) == {"ahri": 2}
+
+def test_page_stored_again_replaces_its_edges():
+    graph = MatchupGraph()
+    graph.add_page("ahri", [_section(3, ["Zed"], ["Lux"])])
+    graph.add_page("ahri", [_section(3, ["Yasuo"], [])])
+
+    assert graph.beaten_by("ahri", 3) == {"yasuo": 1}
+    assert graph.beats("ahri", 0) == {}
+    assert graph.stats()["edges"] == 1
+
+def test_stats_report_roster_coverage():
+    graph = MatchupGraph()
+    graph.add_page("ahri", [_section(3, ["Zed"], [])])
+
+    stats = graph.stats(["ahri", "zed", "lux", "yasuo"])
+
+    assert (stats["roster"], stats["roster_pages"], stats["coverage"]) == (4, 1, 0.25)
+
+def test_store_returns_only_pages_written_since_a_sequence_number(tmp_path):
+    store = MatchupStore(str(tmp_path / "matchups.sqlite3"))
+    store.put("ahri", [_section(3, ["Zed"], [])])
+    pages, seq = store.changed_since(None)
+    assert [slug for slug, _ in pages] == ["ahri"]
+
+    store.put("zed", [_section(3, [], ["Ahri"])])
+    store.put("ahri", [_section(3, ["Yasuo"], [])])
+    pages, newest = store.changed_since(seq)
+
+    assert sorted(slug for slug, _ in pages) == ["ahri", "zed"]
+    assert store.changed_since(newest) == ([], newest)
+    store.close()
+
+def test_edges_are_keyed_by_link_slugs_not_caption_text():
+    graph = MatchupGraph()
+    graph.add_page("nunu-willump", [{"_role_id": 2, "counters": ["Nunu & Willump"], "counter_slugs": ["nunu-willump"], "good_matchups": ["Wukong"], "good_matchup_slugs": ["monkey-king"]}])
+    graph.add_page("lee-sin", [{"_role_id": 2, "counters": ["Nunu"], "counter_slugs": ["nunu-willump"], "good_matchups": [], "good_matchup_slugs": []}])
+
+    assert graph.beats("nunu-willump", 2) == {"monkey-king": 1, "lee-sin": 1}
+    assert graph.name_of("monkey-king") == "Wukong"
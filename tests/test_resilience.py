@@ -0,0 +1,116 @@
+import asyncio
+import httpx
+import pytest
+from mcp_src.mcp_configs import config
+from mcp_src.api_requests import resilience
+from mcp_src.api_requests.resilience import CircuitBreaker, CircuitOpenError, LatencyTracker, resilient_get
+from mcp_src.observability.instrumentation import endpoint_template
+
+URL = "http://upstream.test/stats"
+
+@pytest.fixture(autouse=True)
+def _fresh_resilience_state(monkeypatch):
+    monkeypatch.setattr(resilience, "_trackers", {})
+    monkeypatch.setattr(resilience, "_breakers", {})
+    monkeypatch.setattr(config.API_CONFIG, "UPSTREAM_RETRIES", 0)
+    monkeypatch.setattr(config.API_CONFIG, "HEDGE_REQUESTS", False)
+    monkeypatch.setattr(config.API_CONFIG, "LATENCY_MIN_SAMPLES", 1)
+
+def _use_transport(monkeypatch, handler) -> None:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(resilience, "get_http_client", lambda: client)
+
+def _tracker() -> LatencyTracker:
+    return resilience._tracker("upstream.test", endpoint_template("/stats"))
+
+def test_breaker_opens_after_the_threshold_then_probes_and_closes(monkeypatch):
+    monkeypatch.setattr(config.API_CONFIG, "CIRCUIT_FAILURE_THRESHOLD", 3)
+    statuses = [503, 503, 503, 200]
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(statuses[len(calls) - 1])
+
+    _use_transport(monkeypatch, handler)
+
+    async def scenario():
+        for _ in range(3):
+            assert (await resilient_get(URL, timeout=5)).status_code == 503
+        breaker = resilience._breaker("upstream.test")
+        assert breaker.state == CircuitBreaker.OPEN
+
+        with pytest.raises(CircuitOpenError):
+            await resilient_get(URL, timeout=5)
+        assert len(calls) == 3
+
+        # once the reset timeout has passed a single probe goes through, and its success closes the circuit
+        breaker.opened_at -= config.API_CONFIG.CIRCUIT_RESET_TIMEOUT
+        assert (await resilient_get(URL, timeout=5)).status_code == 200
+        assert (breaker.state, breaker.failures) == (CircuitBreaker.CLOSED, 0)
+
+    asyncio.run(scenario())
+
+def test_breaker_half_open_lets_one_probe_through_and_reopens_on_failure(monkeypatch):
+    monkeypatch.setattr(config.API_CONFIG, "CIRCUIT_FAILURE_THRESHOLD", 1)
+    breaker = CircuitBreaker("upstream.test")
+    breaker.record_failure()
+
+    breaker.opened_at -= config.API_CONFIG.CIRCUIT_RESET_TIMEOUT
+    breaker.before_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+def test_hedged_request_is_cancelled_when_the_first_one_wins(monkeypatch):
+    monkeypatch.setattr(config.API_CONFIG, "HEDGE_REQUESTS", True)
+    monkeypatch.setattr(config.API_CONFIG, "HEDGE_MIN_DELAY", 0.01)
+    _tracker().observe(0.01)
+    cancelled = []
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        attempt = len(calls)
+        try:
+            await asyncio.sleep(0.05 if attempt == 1 else 5)
+        except asyncio.CancelledError:
+            cancelled.append(attempt)
+            raise
+        return httpx.Response(200, json={"attempt": attempt})
+
+    _use_transport(monkeypatch, handler)
+
+    async def scenario():
+        response = await resilient_get(URL, timeout=5)
+        await asyncio.sleep(0.01) # let the cancelled hedge unwind
+        return response
+
+    response = asyncio.run(scenario())
+
+    assert len(calls) == 2
+    assert response.json() == {"attempt": 1}
+    assert cancelled == [2]
+
+def test_adaptive_timeout_never_exceeds_the_configured_timeout(monkeypatch):
+    for _ in range(10):
+        _tracker().observe(config.API_CONFIG.DEFAULT_TIMEOUT)
+    timeouts = []
+
+    def handler(request):
+        timeouts.append(request.extensions["timeout"]["read"])
+        return httpx.Response(200)
+
+    _use_transport(monkeypatch, handler)
+    asyncio.run(resilient_get(URL, timeout=config.API_CONFIG.DEFAULT_TIMEOUT))
+
+    assert timeouts == [config.API_CONFIG.DEFAULT_TIMEOUT]
+
+def test_adaptive_timeout_has_a_floor():
+    tracker = LatencyTracker(10)
+    tracker.observe(0.001)
+
+    assert tracker.timeout(30) == config.API_CONFIG.ADAPTIVE_TIMEOUT_MIN
@@ -0,0 +1,22 @@
+from mcp_src.analytics.role_columns import RoleColumns
+from mcp_src.api_requests.champion.snapshot import RoleSnapshot
+
+def _columns() -> RoleColumns:
+    return RoleColumns(RoleSnapshot([
+        {"label": "AHRI", "role": 3, "win_rate": 52.0, "pick_rate": 10.0},
+        {"label": "ZED", "role": 3, "win_rate": 48.0, "pick_rate": 6.0, "ban_rate": 12.0},
+        {"label": "LUX", "role": 3, "win_rate": 50.0, "pick_rate": 8.0, "ban_rate": 4.0}
+    ]))
+
+def test_percentile_ranks_within_the_role():
+    result = _columns().percentile("ahri", 3)
+
+    assert result["win_rate_percentile"] == 5 / 6 * 100
+    assert result["win_rate_vs_role_mean"] == 2.0
+
+def test_missing_stat_keeps_every_key_with_none():
+    result = _columns().percentile("AHRI", 3)
+
+    assert result["ban_rate"] is None
+    assert result["ban_rate_percentile"] is None
+    assert result["ban_rate_vs_role_mean"] is None
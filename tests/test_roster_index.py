@@ -0,0 +1,70 @@
+import pytest
+from mcp_src.name_resolution import ChampionName, RosterIndex, link_site_slugs
+
+def _champions() -> list[ChampionName]:
+    return [
+        ChampionName('NUNU'),
+        ChampionName('KAISA', "Kai'Sa"),
+        ChampionName('MASTER_YI'),
+        ChampionName('VI'),
+        ChampionName('DR_MUNDO', 'Dr. Mundo'),
+        ChampionName('RENATA_GLASC', 'Renata Glasc')
+    ]
+
+def _slugs(champions:list[ChampionName]) -> dict[str, str]:
+    return {champion.label: champion.slug for champion in champions}
+
+def test_site_slugs_replace_guessed_slugs():
+    linked = link_site_slugs(_champions(), ['nunu-willump', 'kaisa', 'master-yi', 'vi', 'dr-mundo', 'renata'])
+
+    assert _slugs(linked) == {
+        'NUNU': 'nunu-willump',
+        'KAISA': 'kaisa',
+        'MASTER_YI': 'master-yi',
+        'VI': 'vi',
+        'DR_MUNDO': 'dr-mundo',
+        'RENATA_GLASC': 'renata'
+    }
+
+def test_site_champions_missing_from_statswr_can_be_resolved():
+    index = RosterIndex(link_site_slugs(_champions(), ['vi', 'viego']))
+
+    assert index.resolve('Viego').slug == 'viego'
+    assert index.resolve('vi').slug == 'vi'
+
+def test_champions_without_a_site_slug_keep_the_guessed_one():
+    assert _slugs(link_site_slugs(_champions(), ['vi']))['MASTER_YI'] == 'master-yi'
+
+def _roster() -> RosterIndex:
+    return RosterIndex([
+        ChampionName(label, display_name)
+        for label, display_name in [
+            ('AHRI', None), ('EZREAL', None), ('MISS_FORTUNE', None), ('TWISTED_FATE', None), ('MASTER_YI', None),
+            ('KAISA', "Kai'Sa"), ('KAYLE', None), ('KAYN', None), ('JINX', None), ('JAX', None), ('ZED', None), ('VEX', None)
+        ]
+    ])
+
+@pytest.mark.parametrize('name, label', [
+    ('Ahri', 'AHRI'),
+    ("kai'sa", 'KAISA'),
+    ('Miss Fortune', 'MISS_FORTUNE'),
+    ('mf', 'MISS_FORTUNE'),
+    ('tf', 'TWISTED_FATE'),
+    ('yi', 'MASTER_YI'),
+    ('ezrael', 'EZREAL'),
+    ('twisted fat', 'TWISTED_FATE'),
+    ('kayl', 'KAYLE')
+])
+def test_resolve(name, label):
+    assert _roster().resolve(name).label == label
+
+# a shared prefix, names too short to fuzzy-match and a champion outside the roster
+@pytest.mark.parametrize('name', ['kay', 'jnx', 'ze', 'morgana'])
+def test_resolve_refuses_to_guess(name):
+    assert _roster().resolve(name) is None
+
+def test_ambiguous_name_is_answered_with_suggestions():
+    roster = _roster()
+
+    assert roster.resolve('kaye') is None
+    assert {champion.label for champion in roster.suggest('kaye', 2)} == {'KAYLE', 'KAYN'}
@@ -0,0 +1,30 @@
+import pytest
+from mcp_src.response_shaping.shaping import date_of, window_history
+
+def _entry(dates:list[str]) -> dict:
+    return {"role": 3, "history": [{"date": date, "win_rate": float(i)} for i, date in enumerate(dates)]}
+
+def test_since_keeps_snapshots_from_that_day_onwards():
+    rows = window_history([_entry(["2026-01-01", "2026-01-02T08:00:00Z", "2026-01-03"])], since="2026-01-02")
+
+    assert [point["date"] for point in rows[0]["history"]] == ["2026-01-02T08:00:00Z", "2026-01-03"]
+
+def test_since_compares_dates_not_string_prefixes():
+    rows = window_history([_entry(["2026-1-5", "2026-01-10"])], since="2026-01-06")
+
+    assert [point["date"] for point in rows[0]["history"]] == ["2026-01-10"]
+
+@pytest.mark.parametrize("since", ["last week", "2026/01/02"])
+def test_since_that_is_not_an_iso_date_raises(since):
+    with pytest.raises(ValueError):
+        window_history([_entry(["2026-01-01"])], since=since)
+
+@pytest.mark.parametrize("value, expected", [
+    ("2026-01-02", "2026-01-02"),
+    ("2026-01-02T23:30:00Z", "2026-01-02"),
+    ("not a date", None),
+    (None, None)
+])
+def test_date_of(value, expected):
+    day = date_of(value)
+    assert (day.isoformat() if day else None) == expected
@@ -0,0 +1,29 @@
+import pytest
+from mcp_src.api_requests.champion.history_store import ChampionHistory
+from mcp_src.api_requests.champion.snapshot import RoleSnapshot, UnknownSchemaError, rows_of
+
+def test_snapshot_indexes_rows_under_known_field_names():
+    snapshot = RoleSnapshot([{"champion_label": "ahri", "role": "3", "winRate": "51.2%"}])
+
+    assert snapshot.for_champion("AHRI") == snapshot.for_role(3)
+    assert len(snapshot.for_role(3)) == 1
+
+def test_snapshot_without_any_known_label_field_raises():
+    with pytest.raises(UnknownSchemaError):
+        RoleSnapshot([{"hero": "AHRI", "role": 3, "win_rate": 51.2}])
+
+def test_snapshot_without_any_known_stat_field_raises():
+    with pytest.raises(UnknownSchemaError):
+        RoleSnapshot([{"label": "AHRI", "role": 3, "victories": 51.2}])
+
+def test_empty_snapshot_is_not_a_schema_error():
+    assert RoleSnapshot([]).champion_labels() == []
+
+def test_payload_without_a_list_of_rows_raises():
+    assert rows_of({"data": [{"label": "AHRI"}]}, "comments") == [{"label": "AHRI"}]
+    with pytest.raises(UnknownSchemaError):
+        rows_of({"results": {"AHRI": []}}, "comments")
+
+def test_history_without_any_known_date_field_raises():
+    with pytest.raises(UnknownSchemaError):
+        ChampionHistory.from_rows([{"label": "AHRI", "role": 3, "history": [{"day": "2026-01-01", "win_rate": 50.0}]}])